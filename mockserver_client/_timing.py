@@ -2,6 +2,8 @@ from typing import Dict, Any, Optional
 
 
 class _Timing:
+    __slots__ = ("count",)
+
     def __init__(self, count: Optional[int] = None) -> None:
         self.count = count
 
@@ -0,0 +1,592 @@
+import asyncio
+import json
+from logging import Logger
+from pathlib import Path
+from types import TracebackType
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Self,
+    Tuple,
+    Type,
+    cast,
+)
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from requests import Response
+
+from ._timing import _Timing
+from .exceptions.mock_server_call_exception import MockServerCallException
+from .expectation_index import (
+    DuplicateExpectationPolicy,
+    ExpectationIndex,
+)
+from .instrumentation import (
+    BYTES_RECEIVED,
+    BYTES_SENT,
+    CALL,
+    CALLS,
+    RETRIEVE_PARSE,
+    RETRIEVED_REQUESTS,
+    VERIFY,
+    ClientInstrumentation,
+    MockServerClientStats,
+)
+from .json_stream import JsonArrayStreamParser
+from .mock_expectation import MockExpectation
+from .mock_request import MockRequest
+from .mock_request_logger import MockRequestLogger
+from .mock_request_response import MockRequestResponse
+from .mockserver_client import (
+    MockServerFriendlyClient,
+    _expectation_to_dict,
+    _get_requests_in_request_responses,
+    _to_retrieve_body,
+)
+from .mockserver_transport import MockServerTransport
+from .path_match_strategy import PathMatchStrategy
+from .request_archive import RequestLogFormat
+from .verification_checkpoint import VerificationCheckpoint
+
+
+class AsyncMockServerClient:
+    """
+    asyncio client for the MockServer.
+
+    Has the same API as MockServerFriendlyClient but all calls to the MockServer are made
+    with aiohttp so they don't block the event loop.  Matching and verification are shared
+    with MockServerFriendlyClient and run in a worker thread.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        log_all_requests_to_folder: str | Path | None = None,
+        logger: Optional[Logger] = None,
+        ignore_timestamp_field: Optional[bool] = False,
+        ignored_field_names: Optional[List[str]] = None,
+        session: Optional[ClientSession] = None,
+        max_concurrency: int = 10,
+        timeout: float = 60,
+        verification_workers: Optional[int] = None,
+        verification_chunk_size: int = 50,
+        path_match_strategy: PathMatchStrategy = PathMatchStrategy.SUBSTRING,
+        filter_retrieved_requests_on_server: bool = False,
+        instrumentation: Optional[ClientInstrumentation] = None,
+        request_logger: Optional[MockRequestLogger] = None,
+        match_report_file: str | Path | None = None,
+        log_all_requests_format: RequestLogFormat = RequestLogFormat.FILES,
+        duplicate_expectations: DuplicateExpectationPolicy = DuplicateExpectationPolicy.ALLOW,
+    ) -> None:
+        """
+        asyncio client for the MockServer
+
+
+        :param base_url: base url to use
+        :param log_all_requests_to_folder: folder to write all the retrieved requests to
+        :param logger: logger to use
+        :param ignore_timestamp_field: if True then any fields named 'timestamp' in the request body will have their value ignored
+        :param ignored_field_names: names of the fields whose values are ignored when ignore_timestamp_field is set.
+                                    Defaults to ['timestamp']
+        :param session: aiohttp session to use.  If not passed, the client creates (and closes) its own session
+        :param max_concurrency: maximum number of calls to the MockServer in flight at the same time
+        :param timeout: timeout in seconds for each call to the MockServer
+        :param verification_workers: if set, the request bodies are compared in this many worker processes
+                                        when verifying expectations.  By default they are compared serially
+        :param verification_chunk_size: number of body comparisons sent to a worker process at a time
+        :param path_match_strategy: how the test_name passed to verify_expectations() is matched to the path
+                                    of the recorded requests
+        :param filter_retrieved_requests_on_server: if True then verify_expectations() asks the MockServer for
+                                    only the requests for the test instead of retrieving all the requests.
+                                    Ignored when log_all_requests_to_folder is set so every recorded request
+                                    is still written there, numbered by its position in all the requests
+        :param instrumentation: times the phases of the client and counts the work done (see stats).
+                                    Disabled by default
+        :param request_logger: logs each mocked request.  Defaults to logging them to logger at DEBUG level
+        :param match_report_file: if set, the expectations and requests compared by verify_expectations() are
+                                    appended to this file instead of being logged at DEBUG level
+        :param log_all_requests_format: whether log_all_requests_to_folder gets one file per request or a
+                                    single NDJSON (optionally gzip compressed) archive
+        :param duplicate_expectations: what expect() does with an expectation that duplicates an earlier one.
+                                    By default it is registered as is
+        """
+        # bookkeeping, matching and verification are done by the synchronous client
+        self._client: MockServerFriendlyClient = MockServerFriendlyClient(
+            base_url=base_url,
+            log_all_requests_to_folder=log_all_requests_to_folder,
+            logger=logger,
+            ignore_timestamp_field=ignore_timestamp_field,
+            ignored_field_names=ignored_field_names,
+            transport=_UnusedTransport(),
+            verification_workers=verification_workers,
+            verification_chunk_size=verification_chunk_size,
+            path_match_strategy=path_match_strategy,
+            filter_retrieved_requests_on_server=filter_retrieved_requests_on_server,
+            instrumentation=instrumentation,
+            request_logger=request_logger,
+            match_report_file=match_report_file,
+            log_all_requests_format=log_all_requests_format,
+            duplicate_expectations=duplicate_expectations,
+        )
+        self.max_concurrency: int = max_concurrency
+        self.timeout: float = timeout
+        self._session: Optional[ClientSession] = session
+        self._owns_session: bool = session is None
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(max_concurrency)
+
+    @property
+    def base_url(self) -> str:
+        return self._client.base_url
+
+    @property
+    def logger(self) -> Logger:
+        return self._client.logger
+
+    @property
+    def expectations(self) -> List[MockExpectation]:
+        return self._client.expectations
+
+    def get_expectation_index(self) -> ExpectationIndex:
+        """
+        Returns the expectations keyed by method, path, query string, headers and body e.g. to list the
+        duplicate or shadowed expectations
+
+
+        """
+        return self._client.get_expectation_index()
+
+    @property
+    def instrumentation(self) -> ClientInstrumentation:
+        return self._client.instrumentation
+
+    @property
+    def stats(self) -> MockServerClientStats:
+        """
+        Timings and counters collected when instrumentation is enabled
+        """
+        return self._client.stats
+
+    async def _get_session(self) -> ClientSession:
+        if self._session is None:
+            self._session = ClientSession(
+                connector=TCPConnector(limit=self.max_concurrency)
+            )
+        return self._session
+
+    async def _call(
+        self, command: str, data: Any = None, query_string: Optional[str] = None
+    ) -> str:
+        url = f"{self.base_url}/{command}"
+        if query_string:
+            url += "?" + query_string
+        session: ClientSession = await self._get_session()
+        async with self._semaphore:
+            with self.instrumentation.span(CALL, command=command) as attributes:
+                try:
+                    async with session.put(
+                        url, data=data, timeout=ClientTimeout(total=self.timeout)
+                    ) as response:
+                        text: str = await response.text()
+                except Exception as e:
+                    raise MockServerCallException(url=url, error=e) from e
+                if self.instrumentation.enabled:
+                    bytes_sent: int = len(data) if isinstance(data, (str, bytes)) else 0
+                    self.instrumentation.count(CALLS)
+                    self.instrumentation.count(BYTES_SENT, bytes_sent)
+                    self.instrumentation.count(BYTES_RECEIVED, len(text))
+                    attributes.update(
+                        status_code=response.status,
+                        bytes_sent=bytes_sent,
+                        bytes_received=len(text),
+                    )
+                return text
+
+    async def _call_and_stream_json_array(
+        self,
+        command: str,
+        data: Any = None,
+        *,
+        query_string: Optional[str],
+        chunk_size: int,
+    ) -> AsyncIterator[Any]:
+        url = f"{self.base_url}/{command}"
+        if query_string:
+            url += "?" + query_string
+        session: ClientSession = await self._get_session()
+        async with self._semaphore:
+            try:
+                async with session.put(
+                    url, data=data, timeout=ClientTimeout(total=self.timeout)
+                ) as response:
+                    parser: JsonArrayStreamParser = JsonArrayStreamParser()
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        for item in parser.feed(chunk):
+                            yield item
+                    for item in parser.close():
+                        yield item
+            except Exception as e:
+                raise MockServerCallException(url=url, error=e) from e
+
+    async def close(self) -> None:
+        """
+        Closes the aiohttp session if the client created it
+
+
+        """
+        self._client.close()
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        await self.close()
+
+    async def clear(self, path: str) -> None:
+        """
+        Clear all data related to this path
+
+
+        :param path:
+        """
+        self._client.clear_expectations()
+        await self._call("clear", json.dumps({"path": path}))
+
+    async def reset(self) -> None:
+        """
+        Clear all data in the MockServer
+
+        """
+        self._client.clear_expectations()
+        await self._call("reset")
+
+    async def stub(
+        self,
+        *,
+        request: Any,
+        response: Any,
+        timing: Any = None,
+        time_to_live: Any = None,
+    ) -> None:
+        """
+        Create an expectation in mock server
+
+
+        :param request: mock request
+        :param response: mock response
+        :param timing: how many times to expect the request
+        :param time_to_live:
+        """
+        await self._call(
+            "expectation",
+            json.dumps(
+                _expectation_to_dict(
+                    request=request,
+                    response=response,
+                    timing=timing,
+                    time_to_live=time_to_live,
+                )
+            ),
+        )
+
+    async def expect(
+        self,
+        *,
+        request: Dict[str, Any],
+        response: Dict[str, Any],
+        timing: _Timing,
+        time_to_live: Any = None,
+        file_path: Optional[str] = None,
+    ) -> None:
+        """
+        Expect this mock request and reply with the provided mock response
+
+
+        :param request: mock request
+        :param response: mock response
+        :param timing: how many times to expect the request
+        :param time_to_live:
+        :param file_path: file path
+        """
+        payload: Optional[Dict[str, Any]] = self._client.prepare_expectation(
+            request=request,
+            response=response,
+            timing=timing,
+            time_to_live=time_to_live,
+            file_path=file_path,
+        )
+        if payload is not None:
+            await self._call("expectation", json.dumps(payload))
+
+    async def expect_many(
+        self,
+        *,
+        expectations: Iterable[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+    ) -> None:
+        """
+        Expect many mock requests, sending them to the mock server in batches.
+        Batches are sent one after the other so the MockServer sees the expectations in order.
+
+
+        :param expectations: keyword arguments for expect() for each expectation
+        :param batch_size: number of expectations to send in one call
+        """
+        batch_size = batch_size or MockServerFriendlyClient.DEFAULT_BATCH_SIZE
+        pending: List[Dict[str, Any]] = []
+        for expectation in expectations:
+            payload: Optional[Dict[str, Any]] = self._client.prepare_expectation(
+                **expectation, pending_expectations=pending
+            )
+            if payload is not None:
+                pending.append(payload)
+            if len(pending) >= batch_size:
+                await self._call("expectation", json.dumps(pending))
+                pending = []
+        if pending:
+            await self._call("expectation", json.dumps(pending))
+
+    async def retrieve_requests(
+        self, *, request_filter: Optional[Dict[str, Any]] = None
+    ) -> List[MockRequest]:
+        """
+        Retrieve requests made to mock server
+
+
+        :param request_filter: if set, only the requests matching this request matcher are retrieved
+        :return: list of requests made to mock server
+        """
+        text: str = await self._call("retrieve", _to_retrieve_body(request_filter))
+        with self.instrumentation.span(RETRIEVE_PARSE, type="requests"):
+            raw_requests: List[Dict[str, Any]] = cast(
+                List[Dict[str, Any]], json.loads(text)
+            )
+            self.instrumentation.count(RETRIEVED_REQUESTS, len(raw_requests))
+            return [
+                MockRequest(request=r, index=index, file_path=None)
+                for index, r in enumerate(raw_requests)
+            ]
+
+    async def retrieve_request_responses(
+        self, *, request_filter: Optional[Dict[str, Any]] = None
+    ) -> List[MockRequestResponse]:
+        """
+        Retrieve requests and the responses sent for them by the mock server
+
+
+        :param request_filter: if set, only the requests matching this request matcher are retrieved
+        :return: list of requests and responses made to mock server
+        """
+        text: str = await self._call(
+            "retrieve",
+            _to_retrieve_body(request_filter),
+            query_string="type=request_responses",
+        )
+        with self.instrumentation.span(RETRIEVE_PARSE, type="request_responses"):
+            raw_requests: List[Dict[str, Any]] = cast(
+                List[Dict[str, Any]], json.loads(text)
+            )
+            self.instrumentation.count(RETRIEVED_REQUESTS, len(raw_requests))
+            return [
+                MockRequestResponse(
+                    request=r.get("httpRequest"),
+                    response=r.get("httpResponse"),
+                    index=index,
+                )
+                for index, r in enumerate(raw_requests)
+            ]
+
+    async def retrieve_requests_and_request_responses(
+        self, *, request_filter: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[MockRequest], List[MockRequestResponse]]:
+        """
+        Retrieve requests made to mock server and the responses sent for them with a single call.
+        The requests are taken from the request/responses.  If the mock server does not return
+        request/response pairs then the requests are retrieved separately.
+
+
+        :param request_filter: if set, only the requests matching this request matcher are retrieved
+        :return: list of requests made to mock server and list of requests and responses
+        """
+        recorded_request_responses: Optional[List[MockRequestResponse]]
+        try:
+            recorded_request_responses = await self.retrieve_request_responses(
+                request_filter=request_filter
+            )
+        except (ValueError, TypeError, AttributeError) as e:
+            self.logger.debug(f"Could not retrieve request/responses: {e}")
+            recorded_request_responses = None
+        recorded_requests: Optional[List[MockRequest]] = (
+            _get_requests_in_request_responses(
+                recorded_request_responses=recorded_request_responses,
+                logger=self.logger,
+            )
+        )
+        if recorded_requests is None:
+            recorded_requests = await self.retrieve_requests(
+                request_filter=request_filter
+            )
+        return recorded_requests, recorded_request_responses or []
+
+    async def iter_retrieved_requests(
+        self,
+        *,
+        chunk_size: int = MockServerFriendlyClient.DEFAULT_STREAM_CHUNK_SIZE,
+        request_filter: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[MockRequest]:
+        """
+        Retrieve requests made to mock server one at a time while the response is being downloaded
+
+
+        :param chunk_size: number of bytes to read from the response at a time
+        :param request_filter: if set, only the requests matching this request matcher are retrieved
+        :return: iterator over the requests made to mock server
+        """
+        index: int = 0
+        async for r in self._call_and_stream_json_array(
+            "retrieve",
+            _to_retrieve_body(request_filter),
+            query_string=None,
+            chunk_size=chunk_size,
+        ):
+            yield MockRequest(request=r, index=index, file_path=None)
+            index += 1
+
+    async def iter_retrieved_request_responses(
+        self,
+        *,
+        chunk_size: int = MockServerFriendlyClient.DEFAULT_STREAM_CHUNK_SIZE,
+        request_filter: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[MockRequestResponse]:
+        """
+        Retrieve requests made to mock server, and the responses sent for them, one at a time while the
+        response is being downloaded
+
+
+        :param chunk_size: number of bytes to read from the response at a time
+        :param request_filter: if set, only the requests matching this request matcher are retrieved
+        :return: iterator over the requests and responses made to mock server
+        """
+        index: int = 0
+        async for r in self._call_and_stream_json_array(
+            "retrieve",
+            _to_retrieve_body(request_filter),
+            query_string="type=request_responses",
+            chunk_size=chunk_size,
+        ):
+            yield MockRequestResponse(
+                request=r.get("httpRequest"),
+                response=r.get("httpResponse"),
+                index=index,
+            )
+            index += 1
+
+    async def verify_expectations(
+        self,
+        *,
+        test_name: Optional[str] = None,
+        files: Optional[List[str]] = None,
+        method: Optional[str] = None,
+    ) -> None:
+        """
+        Verify that the requests made match the expectations.  Raises exceptions if there are mismatches.
+        The matching runs in a worker thread.
+
+
+        :param test_name: Name of test
+        :param files: files to create expectations
+        :param method: if set, only the requests with this method are verified
+        """
+        with self.instrumentation.span(VERIFY, test_name=test_name):
+            recorded_requests: List[MockRequest]
+            recorded_request_responses: List[MockRequestResponse]
+            (
+                recorded_requests,
+                recorded_request_responses,
+            ) = await self.retrieve_requests_and_request_responses(
+                request_filter=self._client.get_retrieve_request_filter(
+                    test_name=test_name, method=method
+                )
+            )
+            await asyncio.to_thread(
+                self._client.verify_recorded_requests,
+                recorded_requests=recorded_requests,
+                recorded_request_responses=recorded_request_responses,
+                test_name=test_name,
+                files=files,
+                method=method,
+            )
+
+    async def verify_expectations_since_checkpoint(
+        self,
+        *,
+        checkpoint: VerificationCheckpoint,
+        files: Optional[List[str]] = None,
+        verify_all_expectations: bool = False,
+    ) -> None:
+        """
+        Verify only the requests made since the previous verification with this checkpoint
+        (see MockServerFriendlyClient.verify_expectations_since_checkpoint).  The matching runs in a worker thread.
+
+
+        :param checkpoint: remembers the requests and expectations already verified
+        :param files: files to create expectations
+        :param verify_all_expectations: if True then expectations that have still not been matched are
+                                        reported as missing.  Set on the last verification of a test
+        """
+        with self.instrumentation.span(
+            VERIFY, test_name=checkpoint.test_name, checkpoint=True
+        ):
+            recorded_requests: List[MockRequest]
+            recorded_request_responses: List[MockRequestResponse]
+            (
+                recorded_requests,
+                recorded_request_responses,
+            ) = await self.retrieve_requests_and_request_responses(
+                request_filter=self._client.get_retrieve_request_filter(
+                    test_name=checkpoint.test_name, method=checkpoint.method
+                )
+            )
+            await asyncio.to_thread(
+                self._client.verify_recorded_requests_since_checkpoint,
+                checkpoint=checkpoint,
+                recorded_requests=recorded_requests,
+                recorded_request_responses=recorded_request_responses,
+                files=files,
+                verify_all_expectations=verify_all_expectations,
+            )
+
+
+class _UnusedTransport(MockServerTransport):
+    """
+    Transport for the synchronous client wrapped by AsyncMockServerClient.  All the calls to the MockServer
+    are made with aiohttp so this transport never opens a connection
+    """
+
+    def __init__(self) -> None:
+        # no pooled session is created
+        pass
+
+    def put(
+        self,
+        url: str,
+        *,
+        data: Any = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        raise NotImplementedError(f"AsyncMockServerClient calls {url} with aiohttp")
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,9 @@
+class MockServerCallException(Exception):
+    """
+    Exception when a call to the MockServer fails
+    """
+
+    def __init__(self, *, url: str, error: Exception) -> None:
+        self.url: str = url
+        self.error: Exception = error
+        super().__init__(f"Error calling {url}: {error}")
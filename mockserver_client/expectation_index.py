@@ -0,0 +1,137 @@
+from enum import Enum
+from typing import Any, Dict, Hashable, List, Optional
+
+from .mock_expectation import MockExpectation
+from .mock_request import MockRequest, _freeze
+from .mock_request_index import MockRequestIndex
+
+
+class DuplicateExpectationPolicy(str, Enum):
+    """
+    What expect() does with an expectation that has the same method, path, query string, headers and body
+    as an earlier one
+    """
+
+    # registered as is.  Duplicates are only found when the expectation index is asked for them
+    ALLOW = "allow"
+    # registered and logged as a warning
+    WARN = "warn"
+    # merged into the earlier expectation by adding their times when both have the same response and a
+    # limited number of times.  Otherwise registered and logged as a warning
+    MERGE = "merge"
+
+
+class IndexedExpectation:
+    """
+    An expectation in the ExpectationIndex and what is needed to merge a later duplicate into it
+    """
+
+    __slots__ = ("expectation", "payload", "pending_expectations", "time_to_live")
+
+    def __init__(
+        self,
+        *,
+        expectation: MockExpectation,
+        time_to_live: Any = None,
+        payload: Optional[Dict[str, Any]] = None,
+        pending_expectations: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        An expectation in the ExpectationIndex
+
+
+        :param expectation: expectation
+        :param time_to_live: time to live the expectation was registered with
+        :param payload: expectation waiting to be sent to the mock server inside batch_expectations()
+        :param pending_expectations: the list of waiting expectations the payload is in.  The payload is only
+                                        still waiting while this is the client's current list
+        """
+        self.expectation: MockExpectation = expectation
+        self.time_to_live: Any = time_to_live
+        self.payload: Optional[Dict[str, Any]] = payload
+        self.pending_expectations: Optional[List[Dict[str, Any]]] = pending_expectations
+
+
+class ExpectationIndex:
+    """
+    Expectations keyed by method, path, normalized query string, headers and body fingerprint so duplicate
+    expectations are found when they are registered instead of as confusing mismatches when verifying.
+
+    The MockServer answers a request with the first active expectation that matches it, so a duplicate of
+    an expectation with unlimited times is never used: it is shadowed.
+    """
+
+    def __init__(self) -> None:
+        # expectations with the same key, in the order they were added
+        self._by_key: Dict[Hashable, List[IndexedExpectation]] = {}
+        self._count: int = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @staticmethod
+    def get_key(request: MockRequest) -> Hashable:
+        """
+        Returns a hashable key that is equal for expectations that match the same requests
+
+
+        :param request: request of the expectation
+        """
+        body_key: Hashable = None
+        if request.json_list is not None:
+            body_key = request.get_json_fingerprint()
+        if body_key is None:
+            body_key = _freeze(request.request.get("body"))
+        return (
+            MockRequestIndex.get_url_key(request),
+            _freeze(request.headers),
+            body_key,
+        )
+
+    def find(self, key: Hashable) -> Optional[IndexedExpectation]:
+        """
+        Returns the first expectation with this key
+
+
+        :param key: key from get_key()
+        """
+        expectations: Optional[List[IndexedExpectation]] = self._by_key.get(key)
+        return expectations[0] if expectations else None
+
+    def add(
+        self, indexed_expectation: IndexedExpectation, *, key: Optional[Hashable] = None
+    ) -> None:
+        """
+        Adds an expectation
+
+
+        :param indexed_expectation: expectation to add
+        :param key: key of the expectation if already calculated
+        """
+        if key is None:
+            key = self.get_key(indexed_expectation.expectation.request)
+        self._by_key.setdefault(key, []).append(indexed_expectation)
+        self._count += 1
+
+    def get_duplicate_expectations(self) -> List[List[MockExpectation]]:
+        """
+        Returns each group of expectations that have the same key, in the order they were added
+        """
+        return [
+            [e.expectation for e in expectations]
+            for expectations in self._by_key.values()
+            if len(expectations) > 1
+        ]
+
+    def get_shadowed_expectations(self) -> List[MockExpectation]:
+        """
+        Returns the expectations the mock server never uses because an earlier expectation with the
+        same key has unlimited times
+        """
+        shadowed: List[MockExpectation] = []
+        for expectations in self._by_key.values():
+            for position, indexed_expectation in enumerate(expectations):
+                if not indexed_expectation.expectation.timing.count:
+                    shadowed.extend(e.expectation for e in expectations[position + 1 :])
+                    break
+        return sorted(shadowed, key=lambda e: e.request.index)
@@ -0,0 +1,308 @@
+import hashlib
+import json
+import os
+import tempfile
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from requests import Response
+
+from ._timing import _Timing
+from .mockserver_client import MockServerFriendlyClient
+
+# loads a fixture folder into the client, e.g.
+# lambda client: load_mock_source_api_json_responses(folder=folder, mock_client=client, url_prefix="api")
+ExpectationLoader = Callable[[MockServerFriendlyClient], List[str]]
+
+
+class ExpectationSnapshot:
+    """
+    The expectations created from a fixture folder, compiled into a single file of ready to send
+    expectation payloads.
+
+    The snapshot stores a hash of the contents of the folder so a stale snapshot is detected and compiled again.
+    """
+
+    VERSION = 1
+
+    def __init__(
+        self,
+        *,
+        key: str,
+        content_hash: str,
+        options: Dict[str, Any],
+        files: List[str],
+        expectations: List[Dict[str, Any]],
+        file_paths: List[Optional[str]],
+    ) -> None:
+        """
+        The expectations created from a fixture folder
+
+
+        :param key: identifies the loader and its arguments
+        :param content_hash: hash of the contents of the fixture folder
+        :param options: client options that change the expectations (e.g. ignore_timestamp_field)
+        :param files: files returned by the loader, relative to the fixture folder
+        :param expectations: expectations as created by _expectation_to_dict()
+        :param file_paths: file path of each expectation, relative to the fixture folder
+        """
+        self.key: str = key
+        self.content_hash: str = content_hash
+        self.options: Dict[str, Any] = options
+        self.files: List[str] = files
+        self.expectations: List[Dict[str, Any]] = expectations
+        self.file_paths: List[Optional[str]] = file_paths
+
+    def is_current(
+        self, *, key: str, content_hash: str, options: Dict[str, Any]
+    ) -> bool:
+        """
+        Returns whether the snapshot was compiled from the same folder contents with the same loader and options
+        """
+        return (
+            self.key == key
+            and self.content_hash == content_hash
+            and self.options == options
+        )
+
+    def register(
+        self, *, mock_client: MockServerFriendlyClient, folder: Path
+    ) -> List[str]:
+        """
+        Sends all the expectations in the snapshot to the mock server with a single call
+
+
+        :param mock_client: client to mock server
+        :param folder: fixture folder the snapshot was compiled from
+        :return: files returned by the loader when the snapshot was compiled
+        """
+        mock_client.expect_compiled(
+            expectations=self.expectations,
+            file_paths=[
+                _from_relative_path(folder, file_path) for file_path in self.file_paths
+            ],
+        )
+        return [str(_from_relative_path(folder, file)) for file in self.files]
+
+    def write(self, snapshot_path: Path) -> None:
+        """
+        Writes the snapshot to a file
+
+
+        :param snapshot_path: path of the snapshot file
+        """
+        if len(self.expectations) != len(self.file_paths):
+            raise ValueError(
+                f"Expectation snapshot has {len(self.expectations)} expectations"
+                f" but {len(self.file_paths)} file paths"
+            )
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first so parallel test workers never read a partial snapshot
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=snapshot_path.parent, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_descriptor, "w") as file:
+                json.dump(
+                    {
+                        "version": self.VERSION,
+                        "key": self.key,
+                        "content_hash": self.content_hash,
+                        "options": self.options,
+                        "files": self.files,
+                        "file_paths": self.file_paths,
+                        "expectations": self.expectations,
+                    },
+                    file,
+                    separators=(",", ":"),
+                )
+            os.replace(temporary_path, snapshot_path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.unlink(temporary_path)
+
+    @classmethod
+    def read(cls, snapshot_path: Path) -> Optional["ExpectationSnapshot"]:
+        """
+        Reads a snapshot file
+
+
+        :param snapshot_path: path of the snapshot file
+        :return: snapshot or None if the file does not exist or was written by another version
+        """
+        try:
+            with open(snapshot_path, "r") as file:
+                contents: Dict[str, Any] = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if (
+            not isinstance(contents, dict)
+            or contents.get("version") != cls.VERSION
+            or len(contents["expectations"]) != len(contents["file_paths"])
+        ):
+            return None
+        return cls(
+            key=contents["key"],
+            content_hash=contents["content_hash"],
+            options=contents["options"],
+            files=contents["files"],
+            expectations=contents["expectations"],
+            file_paths=contents["file_paths"],
+        )
+
+
+class _RecordingMockServerClient(MockServerFriendlyClient):
+    """
+    Client that records the expectations created by a loader instead of sending them to the mock server
+    """
+
+    def __init__(self, *, mock_client: MockServerFriendlyClient) -> None:
+        super().__init__(
+            base_url=mock_client.base_url,
+            logger=mock_client.logger,
+            ignore_timestamp_field=mock_client.ignore_timestamp_field,
+            ignored_field_names=list(mock_client.ignored_field_names),
+        )
+        # each expectation with the file it was created from
+        self.recorded_expectations: List[Tuple[Dict[str, Any], Optional[str]]] = []
+        # file paths of the expectations added but not registered yet
+        self._added_file_paths: Deque[Optional[str]] = deque()
+
+    def _call(
+        self,
+        command: str,
+        data: Any = None,
+        query_string: Optional[str] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        raise RuntimeError(
+            f"A loader compiled into an expectation snapshot called the mock server: {command}"
+        )
+
+    def _add_expectation(
+        self,
+        *,
+        request: Dict[str, Any],
+        response: Dict[str, Any],
+        timing: _Timing,
+        file_path: Optional[str],
+    ) -> None:
+        self._added_file_paths.append(file_path)
+
+    def _register_expectation(self, payload: Dict[str, Any]) -> None:
+        # the catch all expectation of expect_default() is registered without being added
+        self.recorded_expectations.append(
+            (
+                payload,
+                self._added_file_paths.popleft() if self._added_file_paths else None,
+            )
+        )
+
+
+def get_folder_content_hash(folder: Path) -> str:
+    """
+    Returns a hash of the names and contents of all the files in the folder and its sub-folders
+
+
+    :param folder: folder to hash
+    :return: hash
+    """
+    content_hash = hashlib.blake2b(digest_size=16)
+    for file_path in sorted(p for p in folder.rglob("*") if p.is_file()):
+        content_hash.update(file_path.relative_to(folder).as_posix().encode("utf-8"))
+        content_hash.update(b"\0")
+        content_hash.update(str(file_path.stat().st_size).encode("utf-8"))
+        content_hash.update(b"\0")
+        content_hash.update(file_path.read_bytes())
+    return content_hash.hexdigest()
+
+
+def compile_expectation_snapshot(
+    *,
+    folder: Path,
+    load: ExpectationLoader,
+    key: str,
+    mock_client: MockServerFriendlyClient,
+    content_hash: Optional[str] = None,
+) -> ExpectationSnapshot:
+    """
+    Runs the loader without calling the mock server and compiles the expectations it creates into a snapshot
+
+
+    :param folder: fixture folder
+    :param load: loads the fixture folder into the client passed to it
+    :param key: identifies the loader and its arguments
+    :param mock_client: client whose options (e.g. ignore_timestamp_field) are used to create the expectations
+    :param content_hash: hash of the fixture folder if already calculated
+    :return: snapshot
+    """
+    recording_client = _RecordingMockServerClient(mock_client=mock_client)
+    files: List[str] = load(recording_client)
+    recording_client.close()
+    return ExpectationSnapshot(
+        key=key,
+        content_hash=content_hash or get_folder_content_hash(folder),
+        options=_get_snapshot_options(mock_client),
+        files=[_to_relative_path(folder, file) for file in files],
+        expectations=[
+            expectation for expectation, _ in recording_client.recorded_expectations
+        ],
+        file_paths=[
+            _to_relative_path(folder, file_path) if file_path else None
+            for _, file_path in recording_client.recorded_expectations
+        ],
+    )
+
+
+def load_expectations_with_snapshot(
+    *,
+    folder: Path,
+    mock_client: MockServerFriendlyClient,
+    load: ExpectationLoader,
+    key: str,
+    snapshot_path: Path,
+) -> List[str]:
+    """
+    Registers the expectations for a fixture folder from its snapshot with a single call to the mock server.
+    If the snapshot is missing or the folder has changed, the snapshot is compiled (and written) first.
+
+
+    :param folder: fixture folder
+    :param mock_client: client to mock server
+    :param load: loads the fixture folder into the client passed to it
+    :param key: identifies the loader and its arguments so a snapshot is not reused for a different loader
+    :param snapshot_path: path of the snapshot file
+    :return: files read by the loader
+    """
+    content_hash: str = get_folder_content_hash(folder)
+    snapshot: Optional[ExpectationSnapshot] = ExpectationSnapshot.read(snapshot_path)
+    if snapshot is None or not snapshot.is_current(
+        key=key, content_hash=content_hash, options=_get_snapshot_options(mock_client)
+    ):
+        mock_client.logger.debug(f"Compiling expectation snapshot {snapshot_path}")
+        snapshot = compile_expectation_snapshot(
+            folder=folder,
+            load=load,
+            key=key,
+            mock_client=mock_client,
+            content_hash=content_hash,
+        )
+        snapshot.write(snapshot_path)
+    return snapshot.register(mock_client=mock_client, folder=folder)
+
+
+def _get_snapshot_options(mock_client: MockServerFriendlyClient) -> Dict[str, Any]:
+    return {
+        "ignore_timestamp_field": bool(mock_client.ignore_timestamp_field),
+        "ignored_field_names": list(mock_client.ignored_field_names),
+    }
+
+
+def _to_relative_path(folder: Path, file_path: str) -> str:
+    return Path(os.path.relpath(file_path, folder)).as_posix()
+
+
+def _from_relative_path(folder: Path, file_path: Optional[str]) -> Optional[str]:
+    return os.path.join(str(folder), file_path) if file_path is not None else None
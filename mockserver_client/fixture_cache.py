@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# key of a parsed file: (parser name, absolute path, modification time in ns, size in bytes)
+FixtureKey = Tuple[str, str, int, int]
+
+
+class FixtureCache:
+    """
+    Loads fixture files (e.g. the .json files used by mock_requests_loader) in a thread pool.
+
+    Files parsed with a parser other than json.loads (e.g. the Elasticsearch bulk bodies) are cached keyed
+    by path, modification time and size.  Files parsed with json.loads are not cached since reading the
+    cached JSON text back costs as much as parsing the file again.
+
+    Cached contents are kept in memory for the life of the process.  If a cache folder is set (or the
+    environment variable MOCKSERVER_CLIENT_FIXTURE_CACHE_FOLDER is) they are also written to that folder
+    so later test sessions don't run the parser on unchanged files.
+
+    The cache stores the parsed contents as JSON text so every load returns new objects that the caller can
+    change, and so the cache folder, which may be shared, only ever holds data and never code.  Parsed
+    contents that can't be written as JSON are not cached.
+    """
+
+    CACHE_FOLDER_ENVIRONMENT_VARIABLE = "MOCKSERVER_CLIENT_FIXTURE_CACHE_FOLDER"
+    DEFAULT_MAX_ENTRIES = 10000  # Number of parsed files kept in memory
+
+    def __init__(
+        self,
+        *,
+        cache_folder: str | Path | None = None,
+        max_workers: Optional[int] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        """
+        Loads fixture files in a thread pool and caches the contents parsed by parsers other than json.loads
+
+
+        :param cache_folder: folder to keep the parsed files in across test sessions.
+                                Defaults to MOCKSERVER_CLIENT_FIXTURE_CACHE_FOLDER.  If neither is set, parsed
+                                files are only cached in memory
+        :param max_workers: number of threads used to read and parse files.  Defaults to the ThreadPoolExecutor default
+        :param max_entries: maximum number of parsed files kept in memory
+        """
+        cache_folder = cache_folder or os.environ.get(
+            self.CACHE_FOLDER_ENVIRONMENT_VARIABLE
+        )
+        self.cache_folder: Optional[Path] = Path(cache_folder) if cache_folder else None
+        self.max_workers: Optional[int] = max_workers
+        self.max_entries: int = max_entries
+        # parsed contents as JSON text by key.  dicts keep insertion order so the oldest entries are dropped first
+        self._entries: Dict[FixtureKey, str] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def load_files(
+        self,
+        files: List[str],
+        *,
+        parse: Callable[[str], Any] = json.loads,
+        parser_name: str = "json",
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Reads and parses the files in a thread pool
+
+
+        :param files: paths of the files to load
+        :param parse: parses the text of a file
+        :param parser_name: name of the parser.  Part of the cache key so the same file can be cached
+                            for different parsers
+        :return: iterator over the path and parsed contents of each file, in the order of files
+        """
+        if len(files) < 2:
+            for file_path in files:
+                yield (
+                    file_path,
+                    self.load_file(file_path, parse=parse, parser_name=parser_name),
+                )
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            yield from zip(
+                files,
+                executor.map(
+                    lambda f: self.load_file(f, parse=parse, parser_name=parser_name),
+                    files,
+                ),
+            )
+
+    def read_files(self, files: List[str]) -> Iterator[Tuple[str, str]]:
+        """
+        Reads the text of the files in a thread pool.  Nothing is cached since there is nothing to parse
+
+
+        :param files: paths of the files to read
+        :return: iterator over the path and text of each file, in the order of files
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            yield from zip(files, executor.map(_read_text, files))
+
+    def load_file(
+        self,
+        file_path: str,
+        *,
+        parse: Callable[[str], Any] = json.loads,
+        parser_name: str = "json",
+    ) -> Any:
+        """
+        Returns the parsed contents of the file.  Unless parse is json.loads, the contents are taken from
+        the cache if the file has not changed
+
+
+        :param file_path: path of the file
+        :param parse: parses the text of the file
+        :param parser_name: name of the parser
+        :return: parsed contents
+        """
+        if parse is json.loads:
+            return json.loads(_read_text(file_path))
+        absolute_path: str = os.path.abspath(file_path)
+        stat: os.stat_result = os.stat(absolute_path)
+        key: FixtureKey = (parser_name, absolute_path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            data: Optional[str] = self._entries.get(key)
+        if data is None:
+            data = self._read_from_cache_folder(key)
+            if data is None:
+                value: Any = parse(_read_text(absolute_path))
+                try:
+                    data = json.dumps(value, separators=(",", ":"))
+                except (TypeError, ValueError):
+                    return value
+                self._write_to_cache_folder(key, data)
+            self._add_entry(key, data)
+        return json.loads(data)
+
+    def clear(self) -> None:
+        """
+        Clears the parsed files kept in memory.  The cache folder is left as is
+
+
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _add_entry(self, key: FixtureKey, data: str) -> None:
+        with self._lock:
+            self._entries[key] = data
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+
+    def _get_cache_file_path(self, key: FixtureKey) -> Optional[Path]:
+        if self.cache_folder is None:
+            return None
+        parser_name, absolute_path, _, _ = key
+        name: str = hashlib.blake2b(
+            f"{parser_name}:{absolute_path}".encode(), digest_size=16
+        ).hexdigest()
+        return self.cache_folder.joinpath(f"{name}.json")
+
+    def _read_from_cache_folder(self, key: FixtureKey) -> Optional[str]:
+        cache_file_path: Optional[Path] = self._get_cache_file_path(key)
+        if cache_file_path is None:
+            return None
+        # the first line is the key, the rest is the parsed contents as JSON text
+        try:
+            with open(cache_file_path, "r", encoding="utf-8") as file:
+                cached_key: Any = json.loads(file.readline())
+                data: str = file.read()
+        except (OSError, ValueError):
+            return None
+        # the file has changed since it was cached
+        if not isinstance(cached_key, list) or tuple(cached_key) != key:
+            return None
+        return data
+
+    def _write_to_cache_folder(self, key: FixtureKey, data: str) -> None:
+        cache_file_path: Optional[Path] = self._get_cache_file_path(key)
+        if cache_file_path is None:
+            return
+        temporary_path: Optional[str] = None
+        try:
+            cache_file_path.parent.mkdir(parents=True, exist_ok=True)
+            # write to a temporary file first so parallel test workers never read a partial file
+            file_descriptor, temporary_path = tempfile.mkstemp(
+                dir=cache_file_path.parent, suffix=".tmp"
+            )
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+                file.write(json.dumps(list(key)))
+                file.write("\n")
+                file.write(data)
+            os.replace(temporary_path, cache_file_path)
+        except OSError:
+            # the cache is only an optimization
+            if temporary_path is not None and os.path.exists(temporary_path):
+                os.unlink(temporary_path)
+
+
+def _read_text(file_path: str) -> str:
+    with open(file_path, "r") as file:
+        return file.read()
+
+
+_default_fixture_cache: Optional[FixtureCache] = None
+
+
+def get_default_fixture_cache() -> FixtureCache:
+    """
+    Returns the fixture cache shared by the loaders in mock_requests_loader
+
+
+    :return: fixture cache
+    """
+    global _default_fixture_cache
+    if _default_fixture_cache is None:
+        _default_fixture_cache = FixtureCache()
+    return _default_fixture_cache
@@ -0,0 +1,213 @@
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional
+
+# counters
+CALLS = "calls"
+BYTES_SENT = "bytes_sent"
+BYTES_RECEIVED = "bytes_received"
+EXPECTATIONS = "expectations"
+RETRIEVED_REQUESTS = "retrieved_requests"
+BODY_COMPARISONS = "body_comparisons"
+DEEP_DIFF_INVOCATIONS = "deep_diff_invocations"
+PARALLEL_COMPARISONS = "parallel_comparisons"
+# bodies found equal from their fingerprints without comparing them
+FINGERPRINT_HITS = "fingerprint_hits"
+# bodies whose differences were already computed in the process pool
+PRECOMPUTED_DIFFERENCE_HITS = "precomputed_difference_hits"
+
+# phases
+CALL = "call"
+RETRIEVE_PARSE = "retrieve_parse"
+VERIFY = "verify"
+MATCH = "match"
+COMPARE_IN_PARALLEL = "compare_in_parallel"
+COMPARE_DICTS = "compare_dicts"
+WRITE_REQUESTS = "write_requests"
+
+# called with the name of the phase, its duration in seconds and its attributes when a phase ends
+InstrumentationHook = Callable[[str, float, Dict[str, Any]], None]
+
+
+class PhaseTiming:
+    """
+    Number of times a phase ran and the time it took
+    """
+
+    __slots__ = ("count", "max_seconds", "total_seconds")
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total_seconds: float = 0.0
+        self.max_seconds: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_seconds": self.total_seconds,
+            "max_seconds": self.max_seconds,
+        }
+
+
+class MockServerClientStats:
+    """
+    Counters and per phase timings collected by ClientInstrumentation
+    """
+
+    def __init__(self) -> None:
+        self.counters: Dict[str, int] = {}
+        self.timings: Dict[str, PhaseTiming] = {}
+        # phases can end on several threads e.g. in AsyncMockServerClient
+        self._lock: threading.Lock = threading.Lock()
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_timing(self, name: str, seconds: float) -> None:
+        with self._lock:
+            timing: Optional[PhaseTiming] = self.timings.get(name)
+            if timing is None:
+                timing = self.timings[name] = PhaseTiming()
+            timing.add(seconds)
+
+    def get_counter(self, name: str) -> int:
+        return self.counters.get(name, 0)
+
+    def get_total_seconds(self, name: str) -> float:
+        timing: Optional[PhaseTiming] = self.timings.get(name)
+        return timing.total_seconds if timing else 0.0
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters = {}
+            self.timings = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "timings": {
+                    name: timing.to_dict() for name, timing in self.timings.items()
+                },
+            }
+
+    def __str__(self) -> str:
+        lines: List[str] = [
+            f"{name}: {timing.count} in {timing.total_seconds * 1000:.2f} ms"
+            f" (max {timing.max_seconds * 1000:.2f} ms)"
+            for name, timing in sorted(self.timings.items())
+        ]
+        lines.extend(
+            f"{name}: {value}" for name, value in sorted(self.counters.items())
+        )
+        return "\n".join(lines)
+
+
+class ClientInstrumentation:
+    """
+    Times the phases of the client (calls to the MockServer, parsing, matching, body comparisons) and
+    counts the work done.  Results are kept in stats and are optionally passed to hooks and
+    emitted as spans on an OpenTelemetry style tracer.
+
+    When disabled, span() returns a shared no-op context manager and count() returns immediately.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = False,
+        hooks: Optional[List[InstrumentationHook]] = None,
+        tracer: Any = None,
+    ) -> None:
+        """
+        Times the phases of the client and counts the work done
+
+
+        :param enabled: whether to collect anything
+        :param hooks: called with the name, duration in seconds and attributes of each phase when it ends
+        :param tracer: if set, each phase is also emitted as a span using tracer.start_as_current_span(name, attributes=...)
+                        e.g. an OpenTelemetry tracer
+        """
+        self.enabled: bool = enabled
+        self.hooks: List[InstrumentationHook] = hooks or []
+        self.tracer: Any = tracer
+        self.stats: MockServerClientStats = MockServerClientStats()
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Adds to a counter
+
+
+        :param name: name of the counter
+        :param value: amount to add
+        """
+        if self.enabled:
+            self.stats.increment(name, value)
+
+    def span(self, name: str, **attributes: Any) -> ContextManager[Dict[str, Any]]:
+        """
+        Times a phase.  The context manager returns the attributes of the phase so more can be added
+        before the phase ends
+
+
+        :param name: name of the phase
+        :param attributes: attributes of the phase
+        """
+        if not self.enabled:
+            return _DISABLED_SPAN
+        return self._span(name, attributes)
+
+    @contextmanager
+    def _span(self, name: str, attributes: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        start: float = time.perf_counter()
+        try:
+            if self.tracer is not None:
+                with self.tracer.start_as_current_span(name, attributes=attributes):
+                    yield attributes
+            else:
+                yield attributes
+        finally:
+            seconds: float = time.perf_counter() - start
+            self.stats.add_timing(name, seconds)
+            for hook in self.hooks:
+                hook(name, seconds, attributes)
+
+    @contextmanager
+    def activate(self) -> Iterator[None]:
+        """
+        Makes this the instrumentation used by the static comparison methods of MockServerFriendlyClient
+        (see get_active_instrumentation)
+
+
+        """
+        if not self.enabled:
+            yield
+            return
+        token = _active_instrumentation.set(self)
+        try:
+            yield
+        finally:
+            _active_instrumentation.reset(token)
+
+
+# attributes passed to the no-op span are discarded
+_DISABLED_SPAN: ContextManager[Dict[str, Any]] = nullcontext({})
+
+_active_instrumentation: ContextVar[Optional[ClientInstrumentation]] = ContextVar(
+    "_active_instrumentation", default=None
+)
+
+
+def get_active_instrumentation() -> Optional[ClientInstrumentation]:
+    """
+    Returns the instrumentation of the client that is matching requests in this context, if enabled
+    """
+    return _active_instrumentation.get()
@@ -0,0 +1,259 @@
+import hashlib
+import json
+from collections import defaultdict, deque
+from typing import Any, Collection, Deque, Dict, List, Optional, Set, Tuple
+
+# fields whose values are ignored by default when ignore_timestamp_field is set
+DEFAULT_IGNORED_FIELD_NAMES: Tuple[str, ...] = ("timestamp",)
+
+# order in which DeepDiff reports the different types of differences
+_REPORT_TYPES: Tuple[str, ...] = (
+    "type_changes",
+    "dictionary_item_added",
+    "dictionary_item_removed",
+    "values_changed",
+    "iterable_item_added",
+    "iterable_item_removed",
+)
+
+
+def diff_json_ignoring_fields(
+    t1: Any,
+    t2: Any,
+    *,
+    ignored_field_names: Optional[Collection[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Compares two json values in a single walk of both trees, ignoring the order of list items and the values
+    of fields with the given names.  The ignored fields still have to be present in both values: a missing
+    ignored field is reported as dictionary_item_added/dictionary_item_removed.
+
+    Returns a dictionary in the same format as DeepDiff (so it can be passed to
+    MockServerFriendlyClient._deep_diff_diff_dict_to_string_list).  Differences in the values are reported
+    before differences that are only in the presence of ignored fields.
+
+
+    :param t1: first value (usually the expected json)
+    :param t2: second value (usually the actual json)
+    :param ignored_field_names: names of the fields whose value is ignored.  Defaults to `timestamp`
+    :return: dictionary of differences.  Empty if the values match
+    """
+    return _JsonDiff(
+        ignored_field_names=(
+            ignored_field_names
+            if ignored_field_names is not None
+            else DEFAULT_IGNORED_FIELD_NAMES
+        )
+    ).diff(t1, t2)
+
+
+class _JsonDiff:
+    def __init__(self, *, ignored_field_names: Collection[str]) -> None:
+        self.ignored_field_names: Set[str] = set(ignored_field_names)
+        # report type -> path -> value (None for dictionary items)
+        self.results: Dict[str, Dict[str, Any]] = defaultdict(dict)
+        # report types that have at least one difference in a value (vs only in the presence of ignored fields)
+        self.value_report_types: Set[str] = set()
+        # hash of each container visited, keyed by id() so every node is only hashed once
+        self.hashes: Dict[int, str] = {}
+
+    def diff(self, t1: Any, t2: Any) -> Dict[str, Any]:
+        self.walk(t1, t2, path="root", structure_only=False)
+        report_types: List[str] = [
+            r for r in _REPORT_TYPES if r in self.value_report_types
+        ] + [
+            r
+            for r in _REPORT_TYPES
+            if r in self.results and r not in self.value_report_types
+        ]
+        return {
+            r: (
+                list(self.results[r])
+                if r.startswith("dictionary_item")
+                else self.results[r]
+            )
+            for r in report_types
+        }
+
+    def report(
+        self, report_type: str, path: str, value: Any, *, is_value_change: bool
+    ) -> None:
+        self.results[report_type][path] = value
+        if is_value_change:
+            self.value_report_types.add(report_type)
+
+    def walk(self, t1: Any, t2: Any, *, path: str, structure_only: bool) -> None:
+        """
+        Compares t1 and t2.  If structure_only is set then only added and removed keys and items are reported
+        and list items are compared by position.
+        """
+        if isinstance(t1, dict) and isinstance(t2, dict):
+            self.walk_dicts(t1, t2, path=path, structure_only=structure_only)
+        elif isinstance(t1, list) and isinstance(t2, list):
+            if structure_only:
+                self.walk_lists_in_order(t1, t2, path=path)
+            else:
+                self.walk_lists_ignoring_order(t1, t2, path=path)
+        elif structure_only:
+            return
+        elif type(t1) is not type(t2):
+            self.report(
+                "type_changes",
+                path,
+                {
+                    "old_type": type(t1),
+                    "new_type": type(t2),
+                    "old_value": t1,
+                    "new_value": t2,
+                },
+                is_value_change=True,
+            )
+        elif t1 != t2:
+            self.report(
+                "values_changed",
+                path,
+                {"new_value": t2, "old_value": t1},
+                is_value_change=True,
+            )
+
+    def walk_dicts(
+        self,
+        t1: Dict[str, Any],
+        t2: Dict[str, Any],
+        *,
+        path: str,
+        structure_only: bool,
+    ) -> None:
+        for key in t2:
+            if key not in t1:
+                self.report(
+                    "dictionary_item_added",
+                    f"{path}[{key!r}]",
+                    None,
+                    is_value_change=not structure_only
+                    and key not in self.ignored_field_names,
+                )
+        for key in t1:
+            if key not in t2:
+                self.report(
+                    "dictionary_item_removed",
+                    f"{path}[{key!r}]",
+                    None,
+                    is_value_change=not structure_only
+                    and key not in self.ignored_field_names,
+                )
+        for key, value in t1.items():
+            # only the presence of ignored fields is checked, not their value
+            if key in t2 and key not in self.ignored_field_names:
+                self.walk(
+                    value,
+                    t2[key],
+                    path=f"{path}[{key!r}]",
+                    structure_only=structure_only,
+                )
+
+    def walk_lists_in_order(self, t1: List[Any], t2: List[Any], *, path: str) -> None:
+        for index, (item1, item2) in enumerate(zip(t1, t2)):
+            self.walk(item1, item2, path=f"{path}[{index}]", structure_only=True)
+        for index in range(len(t1), len(t2)):
+            self.report(
+                "iterable_item_added",
+                f"{path}[{index}]",
+                t2[index],
+                is_value_change=False,
+            )
+        for index in range(len(t2), len(t1)):
+            self.report(
+                "iterable_item_removed",
+                f"{path}[{index}]",
+                t1[index],
+                is_value_change=False,
+            )
+
+    def walk_lists_ignoring_order(
+        self, t1: List[Any], t2: List[Any], *, path: str
+    ) -> None:
+        t1_hashes: List[str] = [self.get_hash(item) for item in t1]
+        t2_hashes: List[str] = [self.get_hash(item) for item in t2]
+        t2_indexes_by_hash: Dict[str, Deque[int]] = defaultdict(deque)
+        for index2, item_hash in enumerate(t2_hashes):
+            t2_indexes_by_hash[item_hash].append(index2)
+        # pair up the items that are equal once ignored fields are excluded
+        unpaired1: List[int] = []
+        for index1, item_hash in enumerate(t1_hashes):
+            t2_indexes: Optional[Deque[int]] = t2_indexes_by_hash.get(item_hash)
+            if t2_indexes:
+                index2 = t2_indexes.popleft()
+                # equal items can still differ in which ignored fields are present
+                self.walk(
+                    t1[index1],
+                    t2[index2],
+                    path=f"{path}[{index1}]",
+                    structure_only=True,
+                )
+            else:
+                unpaired1.append(index1)
+        unpaired2: List[int] = sorted(
+            index2 for indexes in t2_indexes_by_hash.values() for index2 in indexes
+        )
+        # an item that is in both lists, just more times in one of them, is only a structural difference
+        t1_hash_set: Set[str] = set(t1_hashes)
+        t2_hash_set: Set[str] = set(t2_hashes)
+        removed: List[int] = [i for i in unpaired1 if t1_hashes[i] not in t2_hash_set]
+        added: List[int] = [i for i in unpaired2 if t2_hashes[i] not in t1_hash_set]
+        # the remaining items are compared with each other in the order they appear
+        compared: List[Tuple[int, int]] = list(zip(removed, added))
+        for index1, index2 in compared:
+            self.walk(
+                t1[index1], t2[index2], path=f"{path}[{index1}]", structure_only=False
+            )
+        compared1: Set[int] = {index1 for index1, _ in compared}
+        compared2: Set[int] = {index2 for _, index2 in compared}
+        for index2 in unpaired2:
+            if index2 not in compared2:
+                self.report(
+                    "iterable_item_added",
+                    f"{path}[{index2}]",
+                    t2[index2],
+                    is_value_change=t2_hashes[index2] not in t1_hash_set,
+                )
+        for index1 in unpaired1:
+            if index1 not in compared1:
+                self.report(
+                    "iterable_item_removed",
+                    f"{path}[{index1}]",
+                    t1[index1],
+                    is_value_change=t1_hashes[index1] not in t2_hash_set,
+                )
+
+    def get_hash(self, value: Any) -> str:
+        """
+        Returns a hash of the value that ignores list order, repeated list items and fields with ignored names
+        """
+        if isinstance(value, dict):
+            key: int = id(value)
+            if key not in self.hashes:
+                self.hashes[key] = _hash(
+                    "{"
+                    + ",".join(
+                        sorted(
+                            json.dumps(k) + ":" + self.get_hash(v)
+                            for k, v in value.items()
+                            if k not in self.ignored_field_names
+                        )
+                    )
+                    + "}"
+                )
+            return self.hashes[key]
+        if isinstance(value, list):
+            key = id(value)
+            if key not in self.hashes:
+                self.hashes[key] = _hash(
+                    "[" + ",".join(sorted({self.get_hash(v) for v in value})) + "]"
+                )
+            return self.hashes[key]
+        return json.dumps(value)
+
+
+def _hash(canonical: str) -> str:
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
@@ -0,0 +1,79 @@
+import hashlib
+import json
+from typing import Any, Collection, FrozenSet, Optional
+
+from mockserver_client.json_diff import DEFAULT_IGNORED_FIELD_NAMES
+
+
+def get_json_fingerprint(
+    value: Any,
+    *,
+    ignore_timestamp_field: Optional[bool] = False,
+    ignored_field_names: Optional[Collection[str]] = None,
+) -> Optional[str]:
+    """
+    Returns a hash of the json value that is the same for any two values that compare_dicts() finds no
+    differences in, so equal bodies can be confirmed without running a full comparison.
+
+    Dictionaries are hashed independent of key order and lists independent of item order.
+    If ignore_timestamp_field is set then the value of any scalar field in ignored_field_names (default `timestamp`)
+    is ignored but the field must still be present.  In that mode list order is kept since compare_dicts() compares
+    list items that only differ in ignored fields in the order they appear.
+
+    Returns None if the value cannot be fingerprinted (e.g. it contains NaN) and has to be compared in full.
+
+
+    :param value: json value (usually the json_list of a MockRequest)
+    :param ignore_timestamp_field: whether to ignore the value of fields named `timestamp`
+    :param ignored_field_names: names of the fields ignored by ignore_timestamp_field.  Defaults to `timestamp`
+    :return: fingerprint
+    """
+    try:
+        canonical: str = _canonicalize(
+            value,
+            ignored_field_names=(
+                frozenset(ignored_field_names or DEFAULT_IGNORED_FIELD_NAMES)
+                if ignore_timestamp_field
+                else frozenset()
+            ),
+            ignore_value=False,
+        )
+    except (TypeError, ValueError):
+        return None
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _canonicalize(
+    value: Any, *, ignored_field_names: FrozenSet[str], ignore_value: bool
+) -> str:
+    if isinstance(value, dict):
+        items = sorted(
+            (json.dumps(k), k in ignored_field_names, v) for k, v in value.items()
+        )
+        return (
+            "{"
+            + ",".join(
+                key
+                + ":"
+                + _canonicalize(
+                    v,
+                    ignored_field_names=ignored_field_names,
+                    ignore_value=ignored,
+                )
+                for key, ignored, v in items
+            )
+            + "}"
+        )
+    if isinstance(value, list):
+        canonical_items = [
+            _canonicalize(
+                v, ignored_field_names=ignored_field_names, ignore_value=False
+            )
+            for v in value
+        ]
+        if not ignored_field_names:
+            canonical_items.sort()
+        return "[" + ",".join(canonical_items) + "]"
+    if ignore_value:
+        return "?"
+    return json.dumps(value, allow_nan=False)
@@ -0,0 +1,124 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator, List
+
+_WHITESPACE: str = " \t\n\r"
+_DELIMITERS: str = _WHITESPACE + ",]"
+
+
+class JsonArrayStreamParser:
+    """
+    Incremental parser for a json array that arrives in chunks (e.g. the response of MockServer /retrieve).
+
+    Each call to feed() returns the items of the array that are complete so far so the whole text and
+    all the parsed items never have to be held in memory together.
+    """
+
+    def __init__(self) -> None:
+        self._decoder: json.JSONDecoder = json.JSONDecoder()
+        self._text_decoder: codecs.IncrementalDecoder = codecs.getincrementaldecoder(
+            "utf-8"
+        )()
+        self._buffer: str = ""
+        # text received since the last parse.  Joined only when there may be a complete item
+        self._pending: List[str] = []
+        self._pending_size: int = 0
+        self._started: bool = False
+        self._finished: bool = False
+        # amount of unparsed text needed before trying to parse an incomplete item again.
+        # Doubling it keeps parsing of large items that arrive in many chunks linear.
+        self._retry_size: int = 0
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Adds a chunk of the utf-8 encoded array
+
+
+        :param chunk: next chunk
+        :return: items completed by this chunk
+        """
+        text: str = self._text_decoder.decode(chunk)
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if len(self._buffer) + self._pending_size < self._retry_size:
+            return []
+        return self._parse(end_of_input=False)
+
+    def close(self) -> List[Any]:
+        """
+        Signals the end of the input.  Raises ValueError if the array is incomplete or invalid
+
+
+        :return: remaining items
+        """
+        self._pending.append(self._text_decoder.decode(b"", final=True))
+        items: List[Any] = self._parse(end_of_input=True)
+        if not self._finished:
+            raise ValueError("Incomplete json array")
+        return items
+
+    def _parse(self, *, end_of_input: bool) -> List[Any]:
+        items: List[Any] = []
+        buffer: str = self._buffer + "".join(self._pending)
+        self._pending = []
+        self._pending_size = 0
+        position: int = 0
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position >= len(buffer):
+                break
+            character: str = buffer[position]
+            if not self._started:
+                if character != "[":
+                    raise ValueError(f"Expected a json array but got {buffer[:100]!r}")
+                self._started = True
+                position += 1
+                continue
+            if self._finished:
+                raise ValueError(
+                    f"Unexpected content after json array: {buffer[position : position + 100]!r}"
+                )
+            if character == "]":
+                self._finished = True
+                position += 1
+                continue
+            if character == ",":
+                position += 1
+                continue
+            try:
+                item, end = self._decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if end_of_input:
+                    raise
+                # the item is not complete yet
+                self._retry_size = 2 * (len(buffer) - position)
+                break
+            if (
+                not end_of_input
+                and character not in '{["'
+                and (end >= len(buffer) or buffer[end] not in _DELIMITERS)
+            ):
+                # a number or literal that is not followed by a delimiter may continue in the next chunk
+                self._retry_size = len(buffer) - position + 1
+                break
+            self._retry_size = 0
+            items.append(item)
+            position = end
+        # drop the parsed text so memory stays bounded by the size of the chunks and the largest item
+        self._buffer = buffer[position:]
+        return items
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Parses a json array that arrives in chunks (e.g. from Response.iter_content()) and yields its items one at a time
+
+
+    :param chunks: utf-8 encoded chunks of the json array
+    :return: iterator over the items of the array
+    """
+    parser: JsonArrayStreamParser = JsonArrayStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
@@ -0,0 +1,1053 @@
+import base64
+import bisect
+import heapq
+import itertools
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging import Logger
+from types import TracebackType
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Self,
+    Set,
+    Tuple,
+    Type,
+)
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+# names of the MockServer control calls.  The MockServer accepts them with and without the /mockserver prefix
+CONTROL_COMMANDS = {"expectation", "clear", "reset", "retrieve", "status"}
+
+# seconds in each time unit used by the MockServer for delays and timeToLive
+_SECONDS_PER_TIME_UNIT: Dict[str, float] = {
+    "NANOSECONDS": 1e-9,
+    "MICROSECONDS": 1e-6,
+    "MILLISECONDS": 1e-3,
+    "SECONDS": 1,
+    "MINUTES": 60,
+    "HOURS": 60 * 60,
+    "DAYS": 24 * 60 * 60,
+}
+
+# returned by _parse_json() for bodies that are not json
+_NOT_JSON = object()
+
+_JSON_UNIT_PREFIX = "${json-unit."
+
+
+class LocalMockServer:
+    """
+    In-process stand-in for the MockServer so MockServerFriendlyClient can be used in tests and
+    benchmarks without starting the MockServer container.
+
+    Supports the part of the MockServer API the client uses:
+    - PUT /expectation to create one expectation or a list of them
+    - PUT /clear and PUT /reset
+    - PUT /retrieve with type=requests, type=request_responses or type=active_expectations, optionally
+        filtered by a request matcher in the body
+    - PUT /status
+
+    Every other request is answered from the expectations.  Requests are matched on method, path, query string,
+    headers and body (JSON with matchType STRICT or ONLY_MATCHING_FIELDS, STRING, REGEX and PARAMETERS) and
+    expectations honor priority, times and timeToLive.  Requests that match no expectation get a 404 like
+    in the MockServer.  Anything else (e.g. forwards, callbacks, XML bodies) needs the real MockServer.
+
+    Usage:
+        with LocalMockServer() as mock_server:
+            mock_client = MockServerFriendlyClient(base_url=mock_server.base_url)
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        logger: Optional[Logger] = None,
+    ) -> None:
+        """
+        In-process stand-in for the MockServer
+
+
+        :param host: host to listen on
+        :param port: port to listen on.  Defaults to a free port (see base_url)
+        :param logger: logger to log the requests to
+        """
+        self.logger: Logger = logger or logging.getLogger("LocalMockServer")
+        self._expectations: _ExpectationIndex = _ExpectationIndex()
+        self._logged_requests: List[_LoggedRequest] = []
+        self._lock: threading.Lock = threading.Lock()
+        self._server: ThreadingHTTPServer = ThreadingHTTPServer(
+            (host, port), _create_request_handler(self)
+        )
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """
+        Url to pass as base_url to MockServerFriendlyClient and to send the requests to
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    @property
+    def port(self) -> int:
+        """
+        Port the server listens on
+        """
+        return int(self._server.server_address[1])
+
+    def start(self) -> None:
+        """
+        Starts answering requests in a background thread
+
+
+        """
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name=f"LocalMockServer-{self.port}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops answering requests and closes the listening socket
+
+
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.stop()
+
+    @property
+    def active_expectations(self) -> List[Dict[str, Any]]:
+        """
+        Expectations that can still be matched, in the order they are matched in
+        """
+        now: float = time.monotonic()
+        with self._lock:
+            return [
+                e.to_dict() for e in self._expectations.expectations if e.is_active(now)
+            ]
+
+    @property
+    def recorded_requests(self) -> List[Dict[str, Any]]:
+        """
+        Requests received so far (excluding the control calls) in the format returned by /retrieve
+        """
+        with self._lock:
+            return [r.request for r in self._logged_requests]
+
+    def handle_control(
+        self, *, command: str, query_string: str, body: bytes
+    ) -> Tuple[int, Any]:
+        """
+        Handles a call to the MockServer control API
+
+
+        :param command: name of the call e.g. expectation
+        :param query_string: query string of the call
+        :param body: body of the call
+        :return: status code and json to return
+        """
+        parameters: Dict[str, str] = dict(parse_qsl(query_string))
+        try:
+            contents: Any = json.loads(body) if body.strip() else None
+        except ValueError as e:
+            return 400, {"error": f"incorrect json format: {e}"}
+        try:
+            if command == "expectation":
+                return 201, self.add_expectations(contents)
+            if command == "clear":
+                self.clear(
+                    request_matcher=_get_request_matcher(contents),
+                    clear_type=parameters.get("type", "all"),
+                )
+                return 200, None
+            if command == "reset":
+                self.reset()
+                return 200, None
+            if command == "retrieve":
+                return 200, self.retrieve(
+                    request_matcher=_get_request_matcher(contents),
+                    retrieve_type=parameters.get("type", "requests"),
+                    retrieve_format=parameters.get("format", "json"),
+                )
+            return 200, {"ports": [self.port]}
+        except (ValueError, TypeError) as e:
+            return 400, {"error": str(e)}
+
+    def add_expectations(self, expectations: Any) -> List[Dict[str, Any]]:
+        """
+        Creates expectations.  An expectation with the id of an existing one replaces it
+
+
+        :param expectations: expectation or list of expectations as sent to /expectation
+        :return: the created expectations
+        """
+        if not isinstance(expectations, list):
+            expectations = [expectations]
+        created: List[_LocalExpectation] = [
+            _LocalExpectation(expectation) for expectation in expectations
+        ]
+        now: float = time.monotonic()
+        with self._lock:
+            for expectation in created:
+                # ids generated here are unique so only ids sent by the caller can replace an expectation
+                if "id" in expectation.expectation:
+                    for replaced in [
+                        e
+                        for e in self._expectations.expectations
+                        if e.id == expectation.id
+                    ]:
+                        self._expectations.remove(replaced)
+                expectation.start(now)
+                self._expectations.add(expectation)
+        return [e.to_dict() for e in created]
+
+    def clear(
+        self,
+        *,
+        request_matcher: Optional[Dict[str, Any]] = None,
+        clear_type: str = "all",
+    ) -> None:
+        """
+        Removes the expectations and the recorded requests that match the request matcher
+
+
+        :param request_matcher: request matcher.  If not set everything is removed
+        :param clear_type: all, expectations or log
+        """
+        if clear_type not in ("all", "expectations", "log"):
+            raise ValueError(f"type {clear_type} is not supported")
+        with self._lock:
+            if clear_type in ("all", "expectations"):
+                self._expectations.replace(
+                    [
+                        e
+                        for e in self._expectations.expectations
+                        if request_matcher is not None
+                        and not _matches_expectation_request(
+                            request_matcher, e.http_request
+                        )
+                    ]
+                )
+            if clear_type in ("all", "log"):
+                self._logged_requests = [
+                    r
+                    for r in self._logged_requests
+                    if request_matcher is not None
+                    and not _matches_request(request_matcher, r.request, r.body)
+                ]
+
+    def reset(self) -> None:
+        """
+        Removes all the expectations and recorded requests
+
+
+        """
+        with self._lock:
+            self._expectations.replace([])
+            self._logged_requests = []
+
+    def retrieve(
+        self,
+        *,
+        request_matcher: Optional[Dict[str, Any]] = None,
+        retrieve_type: str = "requests",
+        retrieve_format: str = "json",
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the recorded requests or the active expectations
+
+
+        :param request_matcher: if set, only the requests (or expectations) matching this request matcher are returned
+        :param retrieve_type: requests, request_responses or active_expectations
+        :param retrieve_format: only json is supported
+        :return: list as returned by /retrieve
+        """
+        if retrieve_format.lower() != "json":
+            raise ValueError(f"format {retrieve_format} is not supported")
+        retrieve_type = retrieve_type.lower()
+        if retrieve_type == "active_expectations":
+            return [
+                e
+                for e in self.active_expectations
+                if request_matcher is None
+                or _matches_expectation_request(
+                    request_matcher, e.get("httpRequest") or {}
+                )
+            ]
+        if retrieve_type not in ("requests", "request_responses"):
+            raise ValueError(f"type {retrieve_type} is not supported")
+        with self._lock:
+            logged_requests: List[_LoggedRequest] = [
+                r
+                for r in self._logged_requests
+                if request_matcher is None
+                or _matches_request(request_matcher, r.request, r.body)
+            ]
+        if retrieve_type == "requests":
+            return [r.request for r in logged_requests]
+        return [
+            {"httpRequest": r.request, "httpResponse": r.response}
+            for r in logged_requests
+        ]
+
+    def handle_request(
+        self,
+        *,
+        method: str,
+        path: str,
+        query_string: str,
+        headers: List[Tuple[str, str]],
+        body: bytes,
+    ) -> "_LocalResponse":
+        """
+        Answers a request from the expectations and records it
+
+
+        :param method: method of the request
+        :param path: path of the request
+        :param query_string: query string of the request
+        :param headers: headers of the request
+        :param body: body of the request
+        :return: response of the first matching expectation or a 404
+        """
+        request: Dict[str, Any] = _to_recorded_request(
+            method=method,
+            path=path,
+            query_string=query_string,
+            headers=headers,
+            body=body,
+        )
+        text: Optional[str] = _decode(body)
+        now: float = time.monotonic()
+        with self._lock:
+            expectation: Optional[_LocalExpectation] = next(
+                (
+                    e
+                    for e in self._expectations.get_candidates(path)
+                    if e.is_active(now)
+                    and _matches_request(e.http_request, request, text)
+                ),
+                None,
+            )
+            if expectation is not None:
+                expectation.use()
+                if not expectation.is_active(now):
+                    self._expectations.remove(expectation)
+            http_response: Dict[str, Any] = (
+                expectation.http_response
+                if expectation is not None
+                else {"statusCode": 404, "reasonPhrase": "Not Found"}
+            )
+            self._logged_requests.append(
+                _LoggedRequest(request=request, body=text, response=http_response)
+            )
+        self.logger.debug(
+            f"{method} {path} {'matched ' + expectation.id if expectation else 'did not match any expectation'}"
+        )
+        return _LocalResponse(http_response)
+
+
+class _LocalExpectation:
+    """
+    Expectation created on the LocalMockServer
+    """
+
+    __slots__ = (
+        "expectation",
+        "expires_at",
+        "http_request",
+        "http_response",
+        "id",
+        "order",
+        "priority",
+        "remaining_times",
+        "time_to_live",
+    )
+
+    def __init__(self, expectation: Any) -> None:
+        if not isinstance(expectation, dict):
+            raise TypeError(f"expectation must be an object: {expectation!r}")
+        http_response: Any = expectation.get("httpResponse")
+        if not isinstance(http_response, dict):
+            raise TypeError(
+                f"only expectations with an httpResponse are supported: {json.dumps(expectation)}"
+            )
+        http_request: Any = expectation.get("httpRequest") or {}
+        if not isinstance(http_request, dict):
+            raise TypeError(f"httpRequest must be an object: {http_request!r}")
+        _validate_body(http_request.get("body"))
+        self.expectation: Dict[str, Any] = expectation
+        self.id: str = str(expectation.get("id") or uuid.uuid4())
+        self.priority: int = int(expectation.get("priority") or 0)
+        self.http_request: Dict[str, Any] = http_request
+        self.http_response: Dict[str, Any] = http_response
+        times: Dict[str, Any] = expectation.get("times") or {}
+        # None is unlimited
+        self.remaining_times: Optional[int] = (
+            None
+            if times.get("unlimited", "remainingTimes" not in times)
+            else int(times["remainingTimes"])
+        )
+        time_to_live: Dict[str, Any] = expectation.get("timeToLive") or {}
+        # seconds, None is unlimited
+        self.time_to_live: Optional[float] = (
+            None
+            if time_to_live.get("unlimited", "timeToLive" not in time_to_live)
+            else _to_seconds(
+                time_to_live["timeToLive"], time_to_live.get("timeUnit", "SECONDS")
+            )
+        )
+        self.expires_at: Optional[float] = None
+        # (-priority, sequence) set when the expectation is added
+        self.order: Tuple[int, int] = (-self.priority, 0)
+
+    def start(self, now: float) -> None:
+        self.expires_at = (
+            now + self.time_to_live if self.time_to_live is not None else None
+        )
+
+    def is_active(self, now: float) -> bool:
+        return (self.remaining_times is None or self.remaining_times > 0) and (
+            self.expires_at is None or now < self.expires_at
+        )
+
+    def use(self) -> None:
+        if self.remaining_times is not None:
+            self.remaining_times -= 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **self.expectation,
+            "id": self.id,
+            "priority": self.priority,
+            "times": (
+                {"unlimited": True}
+                if self.remaining_times is None
+                else {"remainingTimes": self.remaining_times}
+            ),
+        }
+
+
+class _ExpectationIndex:
+    """
+    Expectations in the order they are matched in (highest priority first, then oldest first).
+    Expectations for a literal path are also kept by path so a request is only compared to the
+    expectations for its path and the ones whose path is a regular expression
+    """
+
+    def __init__(self) -> None:
+        self.expectations: List[_LocalExpectation] = []
+        self._by_path: Dict[str, List[_LocalExpectation]] = {}
+        # expectations without a path or whose path is a regular expression
+        self._other: List[_LocalExpectation] = []
+        self._sequence: Iterator[int] = itertools.count()
+
+    def add(self, expectation: _LocalExpectation) -> None:
+        expectation.order = (-expectation.priority, next(self._sequence))
+        bisect.insort(self.expectations, expectation, key=_get_order)
+        bisect.insort(self._get_bucket(expectation), expectation, key=_get_order)
+
+    def remove(self, expectation: _LocalExpectation) -> None:
+        self.expectations.remove(expectation)
+        self._get_bucket(expectation).remove(expectation)
+
+    def replace(self, expectations: List[_LocalExpectation]) -> None:
+        self.expectations = []
+        self._by_path = {}
+        self._other = []
+        for expectation in expectations:
+            self.expectations.append(expectation)
+            self._get_bucket(expectation).append(expectation)
+
+    def get_candidates(self, path: str) -> Iterator[_LocalExpectation]:
+        return heapq.merge(self._by_path.get(path, []), self._other, key=_get_order)
+
+    def _get_bucket(self, expectation: _LocalExpectation) -> List[_LocalExpectation]:
+        path: Any = expectation.http_request.get("path")
+        if isinstance(path, str) and _is_literal_path(path):
+            return self._by_path.setdefault(path, [])
+        return self._other
+
+
+def _get_order(expectation: _LocalExpectation) -> Tuple[int, int]:
+    return expectation.order
+
+
+@lru_cache(maxsize=4096)
+def _is_literal_path(path: str) -> bool:
+    """
+    Whether the path only matches itself when used as a regular expression.  A $ followed by more characters
+    (e.g. /Patient/1/$merge) never matches so it does not make the path a regular expression
+    """
+    special_characters: Set[str] = set(path) & set(".^$*+?{}[]\\|()")
+    if not special_characters:
+        return True
+    return special_characters == {"$"} and all(
+        path[i + 1 : i + 2] not in ("", "\n") for i, c in enumerate(path) if c == "$"
+    )
+
+
+class _LoggedRequest:
+    """
+    Request received by the LocalMockServer and the response sent for it
+    """
+
+    __slots__ = ("body", "request", "response")
+
+    def __init__(
+        self, *, request: Dict[str, Any], body: Optional[str], response: Dict[str, Any]
+    ) -> None:
+        self.request: Dict[str, Any] = request
+        # body as text for matching STRING, REGEX and PARAMETERS bodies
+        self.body: Optional[str] = body
+        self.response: Dict[str, Any] = response
+
+
+class _LocalResponse:
+    """
+    Response to send for an httpResponse of an expectation
+    """
+
+    __slots__ = ("body", "chunk_size", "delay", "headers", "reason", "status_code")
+
+    def __init__(self, http_response: Dict[str, Any]) -> None:
+        self.status_code: int = int(http_response.get("statusCode") or 200)
+        self.reason: Optional[str] = http_response.get("reasonPhrase")
+        self.headers: List[Tuple[str, str]] = [
+            (name, value)
+            for name, values in _to_multi_values(http_response.get("headers")).items()
+            for value in values
+        ]
+        body: Any = http_response.get("body")
+        content_type: Optional[str] = None
+        if body is None:
+            self.body: bytes = b""
+        elif isinstance(body, str):
+            self.body = body.encode("utf-8")
+        elif isinstance(body, dict) and _get_body_type(body) == "STRING":
+            self.body = str(body.get("string", "")).encode("utf-8")
+            content_type = body.get("contentType")
+        elif isinstance(body, dict) and _get_body_type(body) == "BINARY":
+            self.body = base64.b64decode(body.get("base64Bytes", ""))
+            content_type = body.get("contentType")
+        elif isinstance(body, dict) and "json" in body:
+            json_body: Any = body["json"]
+            self.body = (
+                json_body if isinstance(json_body, str) else json.dumps(json_body)
+            ).encode("utf-8")
+            content_type = body.get("contentType") or "application/json"
+        else:
+            self.body = json.dumps(body).encode("utf-8")
+            content_type = "application/json"
+        if content_type and not any(
+            name.lower() == "content-type" for name, _ in self.headers
+        ):
+            self.headers.append(("Content-Type", content_type))
+        connection_options: Dict[str, Any] = (
+            http_response.get("connectionOptions") or {}
+        )
+        self.chunk_size: Optional[int] = connection_options.get("chunkSize")
+        delay: Dict[str, Any] = http_response.get("delay") or {}
+        self.delay: float = (
+            _to_seconds(delay.get("value", 0), delay.get("timeUnit", "MILLISECONDS"))
+            if delay
+            else 0
+        )
+
+    @property
+    def is_chunked(self) -> bool:
+        return any(
+            name.lower() == "transfer-encoding" and value.lower() == "chunked"
+            for name, value in self.headers
+        )
+
+
+def _create_request_handler(
+    mock_server: LocalMockServer,
+) -> Type[BaseHTTPRequestHandler]:
+    class LocalMockServerRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # the headers and the body are written separately so Nagle's algorithm would delay every response
+        disable_nagle_algorithm = True
+        raw_requestline: bytes
+
+        def handle_any_method(self) -> None:
+            url = urlsplit(self.path)
+            body: bytes = self.read_body()
+            command: Optional[str] = _get_control_command(url.path)
+            if self.command == "PUT" and command is not None:
+                status_code, contents = mock_server.handle_control(
+                    command=command, query_string=url.query, body=body
+                )
+                self.send_json(status_code, contents)
+                return
+            response: _LocalResponse = mock_server.handle_request(
+                method=self.command,
+                path=unquote(url.path),
+                query_string=url.query,
+                headers=list(self.headers.items()),
+                body=body,
+            )
+            if response.delay:
+                time.sleep(response.delay)
+            self.send_local_response(response)
+
+        def parse_request(self) -> bool:
+            # aiohttp sends the terminating chunk of an empty chunked body (e.g. a GET with chunked=True)
+            # without a Transfer-Encoding header so it is read as the start of the next request
+            if self.raw_requestline.strip() == b"0":
+                self.rfile.readline()
+                self.raw_requestline = self.rfile.readline(65537)
+                if not self.raw_requestline:
+                    self.close_connection = True
+                    return False
+            return super().parse_request()
+
+        def read_body(self) -> bytes:
+            if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                chunks: List[bytes] = []
+                while True:
+                    size: int = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                    if size == 0:
+                        # skip the trailers
+                        while self.rfile.readline().strip():
+                            pass
+                        return b"".join(chunks)
+                    chunks.append(self.rfile.read(size))
+                    self.rfile.readline()
+            length: int = int(self.headers.get("Content-Length") or 0)
+            return self.rfile.read(length) if length else b""
+
+        def send_json(self, status_code: int, contents: Any) -> None:
+            data: bytes = (
+                json.dumps(contents).encode("utf-8") if contents is not None else b""
+            )
+            self.send_response(status_code)
+            if data:
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def send_local_response(self, response: _LocalResponse) -> None:
+            self.send_response(response.status_code, response.reason)
+            for name, value in response.headers:
+                if name.lower() != "content-length":
+                    self.send_header(name, value)
+            if not response.is_chunked:
+                self.send_header("Content-Length", str(len(response.body)))
+            self.end_headers()
+            if self.command == "HEAD":
+                return
+            if not response.is_chunked:
+                self.wfile.write(response.body)
+                return
+            chunk_size: int = response.chunk_size or len(response.body) or 1
+            for start in range(0, len(response.body), chunk_size):
+                chunk: bytes = response.body[start : start + chunk_size]
+                self.wfile.write(
+                    f"{len(chunk):x}\r\n".encode("ascii") + chunk + b"\r\n"
+                )
+            self.wfile.write(b"0\r\n\r\n")
+
+        def log_message(self, format: str, *args: Any) -> None:
+            mock_server.logger.debug(format, *args)
+
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = (
+            handle_any_method
+        )
+
+    return LocalMockServerRequestHandler
+
+
+def _get_control_command(path: str) -> Optional[str]:
+    command: str = path.strip("/").removeprefix("mockserver/")
+    return command if command in CONTROL_COMMANDS else None
+
+
+def _get_request_matcher(contents: Any) -> Optional[Dict[str, Any]]:
+    if contents is None:
+        return None
+    if not isinstance(contents, dict):
+        raise TypeError(f"request matcher must be an object: {contents!r}")
+    matcher: Any = contents.get("httpRequest", contents)
+    return matcher if isinstance(matcher, dict) and matcher else None
+
+
+def _to_recorded_request(
+    *,
+    method: str,
+    path: str,
+    query_string: str,
+    headers: List[Tuple[str, str]],
+    body: bytes,
+) -> Dict[str, Any]:
+    """
+    Converts a request to the format the MockServer returns from /retrieve
+    """
+    request: Dict[str, Any] = {"method": method, "path": path}
+    query_string_parameters: Dict[str, List[str]] = {}
+    for name, value in parse_qsl(query_string, keep_blank_values=True):
+        query_string_parameters.setdefault(name, []).append(value)
+    if query_string_parameters:
+        request["queryStringParameters"] = query_string_parameters
+    headers_dict: Dict[str, List[str]] = {}
+    for name, value in headers:
+        headers_dict.setdefault(name, []).append(value)
+    if headers_dict:
+        request["headers"] = headers_dict
+    request["keepAlive"] = True
+    request["secure"] = False
+    if body:
+        content_type: Optional[str] = next(
+            (value for name, value in headers if name.lower() == "content-type"), None
+        )
+        text: Optional[str] = _decode(body)
+        json_body: Any = (
+            _parse_json(text)
+            if text is not None and content_type and "json" in content_type.lower()
+            else _NOT_JSON
+        )
+        recorded_body: Dict[str, Any]
+        if json_body is not _NOT_JSON:
+            recorded_body = {"type": "JSON", "json": json_body}
+        elif text is not None:
+            recorded_body = {"type": "STRING", "string": text}
+        else:
+            recorded_body = {
+                "type": "BINARY",
+                "base64Bytes": base64.b64encode(body).decode("ascii"),
+            }
+        if content_type:
+            recorded_body["contentType"] = content_type
+        request["body"] = recorded_body
+    return request
+
+
+def _matches_request(
+    matcher: Dict[str, Any], request: Dict[str, Any], body: Optional[str]
+) -> bool:
+    """
+    Whether a request (in the format returned by /retrieve) matches a request matcher of an expectation
+    """
+    if "method" in matcher and not _matches_string(
+        matcher["method"], request.get("method")
+    ):
+        return False
+    if "path" in matcher and not _matches_string(matcher["path"], request.get("path")):
+        return False
+    if "queryStringParameters" in matcher and not _matches_multi_values(
+        matcher["queryStringParameters"],
+        request.get("queryStringParameters"),
+        ignore_case=False,
+    ):
+        return False
+    if "headers" in matcher and not _matches_multi_values(
+        matcher["headers"], request.get("headers"), ignore_case=True
+    ):
+        return False
+    return matcher.get("body") is None or _matches_body(
+        matcher["body"], request.get("body"), body
+    )
+
+
+def _matches_expectation_request(
+    matcher: Dict[str, Any], http_request: Dict[str, Any]
+) -> bool:
+    """
+    Whether the request matcher of an expectation is selected by the request matcher passed to /clear or /retrieve.
+    Only the method and the path are compared
+    """
+    for field in ("method", "path"):
+        if field in matcher and not _matches_string(
+            matcher[field], http_request.get(field)
+        ):
+            return False
+    return True
+
+
+def _matches_string(expected: Any, actual: Any) -> bool:
+    if actual is None:
+        return False
+    if expected == actual:
+        return True
+    pattern: Optional[Pattern[str]] = _compile(str(expected))
+    return pattern is not None and pattern.fullmatch(str(actual)) is not None
+
+
+@lru_cache(maxsize=4096)
+def _compile(pattern: str) -> Optional[Pattern[str]]:
+    # the MockServer matches strings either exactly or as a regular expression
+    try:
+        return re.compile(pattern)
+    except re.error:
+        return None
+
+
+def _to_multi_values(values: Any) -> Dict[str, List[str]]:
+    """
+    Converts headers or parameters in either of the formats used by the MockServer to a dict of lists
+    - [{"name": "a", "values": ["1"]}]
+    - {"a": ["1"]} or {"a": "1"}
+    """
+    if not values:
+        return {}
+    if isinstance(values, list):
+        return {
+            str(value["name"]): [str(v) for v in value.get("values", [])]
+            for value in values
+        }
+    return {
+        str(name): [str(v) for v in value] if isinstance(value, list) else [str(value)]
+        for name, value in values.items()
+    }
+
+
+def _matches_multi_values(expected: Any, actual: Any, *, ignore_case: bool) -> bool:
+    """
+    Every expected name has to be present with every expected value.  Other names and values are allowed
+    """
+    actual_values: Dict[str, List[str]] = {}
+    for name, values in _to_multi_values(actual).items():
+        actual_values.setdefault(name.lower() if ignore_case else name, []).extend(
+            values
+        )
+    for name, values in _to_multi_values(expected).items():
+        candidates: Optional[List[str]] = actual_values.get(
+            name.lower() if ignore_case else name
+        )
+        if candidates is None:
+            return False
+        if not all(any(_matches_string(v, c) for c in candidates) for v in values):
+            return False
+    return True
+
+
+def _get_body_type(body: Dict[str, Any]) -> Optional[str]:
+    # the MockServer infers the type from the fields when it is not set
+    if body.get("type"):
+        return str(body["type"]).upper()
+    for field, body_type in (
+        ("json", "JSON"),
+        ("string", "STRING"),
+        ("regex", "REGEX"),
+        ("parameters", "PARAMETERS"),
+        ("base64Bytes", "BINARY"),
+    ):
+        if field in body:
+            return body_type
+    return None
+
+
+def _validate_body(body: Any) -> None:
+    if isinstance(body, dict):
+        body_type: Optional[str] = _get_body_type(body)
+        if body_type not in (None, "JSON", "STRING", "REGEX", "PARAMETERS", "BINARY"):
+            raise ValueError(f"body type {body_type} is not supported")
+
+
+def _matches_body(expected: Any, recorded_body: Any, text: Optional[str]) -> bool:
+    if isinstance(expected, str):
+        return text == expected
+    if not isinstance(expected, dict):
+        return _matches_json(expected, _get_request_json(recorded_body, text))
+    body_type: Optional[str] = _get_body_type(expected)
+    matches: bool
+    if body_type == "JSON":
+        expected_json: Any = expected["json"]
+        if isinstance(expected_json, str):
+            expected_json = json.loads(expected_json)
+        matches = _matches_json(
+            expected_json,
+            _get_request_json(recorded_body, text),
+            strict=expected.get("matchType") == "STRICT",
+        )
+    elif body_type == "STRING":
+        expected_string: str = str(expected.get("string", ""))
+        matches = text is not None and (
+            expected_string in text
+            if expected.get("subString")
+            else text == expected_string
+        )
+    elif body_type == "REGEX":
+        pattern: Optional[Pattern[str]] = _compile(str(expected.get("regex", "")))
+        matches = (
+            text is not None
+            and pattern is not None
+            and pattern.fullmatch(text) is not None
+        )
+    elif body_type == "PARAMETERS":
+        parameters: Dict[str, List[str]] = {}
+        for name, value in parse_qsl(text or "", keep_blank_values=True):
+            parameters.setdefault(name, []).append(value)
+        matches = _matches_multi_values(
+            expected.get("parameters"), parameters, ignore_case=False
+        )
+    elif body_type == "BINARY":
+        matches = base64.b64decode(
+            expected.get("base64Bytes", "")
+        ) == _get_request_bytes(recorded_body, text)
+    else:
+        matches = _matches_json(expected, _get_request_json(recorded_body, text))
+    return matches != bool(expected.get("not"))
+
+
+def _get_request_json(recorded_body: Any, text: Optional[str]) -> Any:
+    if isinstance(recorded_body, dict) and "json" in recorded_body:
+        return recorded_body["json"]
+    if text is None:
+        return _NOT_JSON
+    if isinstance(recorded_body, dict) and "application/x-www-form-urlencoded" in str(
+        recorded_body.get("contentType", "")
+    ):
+        # like the MockServer, a form is compared to json as an object of its fields with
+        # values that look like json (e.g. numbers) converted
+        return {
+            name: value if (parsed := _parse_json(value)) is _NOT_JSON else parsed
+            for name, value in parse_qsl(text, keep_blank_values=True)
+        }
+    return _parse_json(text)
+
+
+def _get_request_bytes(recorded_body: Any, text: Optional[str]) -> bytes:
+    if isinstance(recorded_body, dict) and "base64Bytes" in recorded_body:
+        return base64.b64decode(recorded_body["base64Bytes"])
+    return text.encode("utf-8") if text is not None else b""
+
+
+def _matches_json(expected: Any, actual: Any, *, strict: bool = False) -> bool:
+    """
+    Compares json like the MockServer does.  STRICT needs the same fields and array order.
+    ONLY_MATCHING_FIELDS allows extra fields and arrays in any order.  Arrays always need the same length
+    """
+    if isinstance(expected, dict):
+        if not isinstance(actual, dict):
+            return False
+        if strict and expected.keys() != actual.keys():
+            return False
+        return all(
+            key in actual and _matches_json(value, actual[key], strict=strict)
+            for key, value in expected.items()
+        )
+    if isinstance(expected, list):
+        if not isinstance(actual, list) or len(expected) != len(actual):
+            return False
+        if strict:
+            return all(
+                _matches_json(e, a, strict=True) for e, a in zip(expected, actual)
+            )
+        return _matches_json_array_in_any_order(expected, actual)
+    if isinstance(expected, str) and expected.startswith(_JSON_UNIT_PREFIX):
+        return _matches_json_unit_placeholder(expected, actual)
+    if isinstance(expected, bool) or isinstance(actual, bool):
+        return expected is actual
+    return bool(expected == actual)
+
+
+def _matches_json_unit_placeholder(expected: str, actual: Any) -> bool:
+    """
+    Supports the json-unit placeholders the MockServer accepts in json bodies
+    e.g. ${json-unit.ignore} which replace_timestamp_with_ignore() uses
+    """
+    if expected in ("${json-unit.ignore}", "${json-unit.ignore-element}"):
+        return True
+    if expected == "${json-unit.any-string}":
+        return isinstance(actual, str)
+    if expected == "${json-unit.any-number}":
+        return isinstance(actual, (int, float)) and not isinstance(actual, bool)
+    if expected == "${json-unit.any-boolean}":
+        return isinstance(actual, bool)
+    if expected.startswith("${json-unit.regex}"):
+        pattern: Optional[Pattern[str]] = _compile(
+            expected[len("${json-unit.regex}") :]
+        )
+        return (
+            isinstance(actual, str)
+            and pattern is not None
+            and pattern.fullmatch(actual) is not None
+        )
+    return bool(expected == actual)
+
+
+def _matches_json_array_in_any_order(expected: List[Any], actual: List[Any]) -> bool:
+    """
+    Whether each expected item matches a different actual item (a bipartite matching)
+    """
+    # fast path when the items are in the same order
+    if all(_matches_json(e, a) for e, a in zip(expected, actual)):
+        return True
+    comparisons: Dict[Tuple[int, int], bool] = {}
+    # expected index matched to each actual index
+    matched: Dict[int, int] = {}
+
+    def item_matches(expected_index: int, actual_index: int) -> bool:
+        key = (expected_index, actual_index)
+        if key not in comparisons:
+            comparisons[key] = _matches_json(
+                expected[expected_index], actual[actual_index]
+            )
+        return comparisons[key]
+
+    def assign(expected_index: int, visited: Set[int]) -> bool:
+        for actual_index in range(len(actual)):
+            if actual_index in visited or not item_matches(
+                expected_index, actual_index
+            ):
+                continue
+            visited.add(actual_index)
+            if actual_index not in matched or assign(matched[actual_index], visited):
+                matched[actual_index] = expected_index
+                return True
+        return False
+
+    return all(assign(i, set()) for i in range(len(expected)))
+
+
+def _parse_json(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError:
+        return _NOT_JSON
+
+
+def _decode(body: bytes) -> Optional[str]:
+    try:
+        return body.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+def _to_seconds(value: Any, time_unit: str) -> float:
+    return float(value) * _SECONDS_PER_TIME_UNIT.get(str(time_unit).upper(), 1)
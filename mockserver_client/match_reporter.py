@@ -0,0 +1,70 @@
+import logging
+from logging import Logger
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+
+class MatchReporter:
+    """
+    Writes the expectations and requests compared by verify_expectations() for debugging.
+
+    Nothing is formatted unless the dumps will be written: either the level is enabled on the logger or
+    a report file is set.  Each expectation or request is written on its own so a dump is never built
+    as one string.  If a report file is set, the dumps are appended to it instead of being logged.
+    """
+
+    # bytes buffered before the report file is written to
+    DEFAULT_BUFFER_SIZE = 256 * 1024
+
+    def __init__(
+        self,
+        *,
+        logger: Logger,
+        level: int = logging.DEBUG,
+        report_file: str | Path | None = None,
+    ) -> None:
+        """
+        Writes the expectations and requests compared by verify_expectations() for debugging
+
+
+        :param logger: logger to write the dumps to
+        :param level: level the dumps are logged at
+        :param report_file: if set, the dumps are appended to this file instead of being logged
+        """
+        self.logger: Logger = logger
+        self.level: int = level
+        self.report_file: Optional[Path] = (
+            Path(report_file) if report_file is not None else None
+        )
+
+    @property
+    def is_enabled(self) -> bool:
+        """
+        Whether the dumps are written anywhere
+        """
+        return self.report_file is not None or self.logger.isEnabledFor(self.level)
+
+    def dump(self, *, title: str, items: Iterable[Any]) -> None:
+        """
+        Writes each item (e.g. an expectation or request) between a header and footer with the title
+
+
+        :param title: title of the dump e.g. EXPECTATIONS
+        :param items: items to write.  Only converted to strings if the dump is written
+        """
+        if self.report_file is not None:
+            self.report_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(
+                self.report_file,
+                "a",
+                buffering=self.DEFAULT_BUFFER_SIZE,
+                encoding="utf-8",
+            ) as file:
+                file.write(f"-------- {title} --------\n")
+                file.writelines(f"{item}\n" for item in items)
+                file.write(f"-------- END {title} --------\n")
+        elif self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, "-------- %s --------", title)
+            for item in items:
+                self.logger.log(self.level, "%s", item)
+            self.logger.log(self.level, "-------- END %s --------", title)
@@ -9,3 +9,5 @@ from mockserver_client.mock_request import MockRequest
 class MatchRequestResult:
     exceptions: List[MockServerException]
     found_expectations: List[MockRequest]
+    # requests of the expectations that a recorded request was matched to
+    matched_expectations: List[MockRequest] = dataclasses.field(default_factory=list)
@@ -5,6 +5,8 @@ from mockserver_client.mock_request import MockRequest
 
 
 class MockExpectation:
+    __slots__ = ("occurrences", "request", "response", "timing")
+
     def __init__(
         self,
         request: Dict[str, Any],
@@ -25,6 +27,8 @@ class MockExpectation:
         )
         self.response: Dict[str, Any] = response
         self.timing: _Timing = timing
+        # number of identical expectations merged into this one.  Each is matched to its own recorded request
+        self.occurrences: int = 1
 
     def __str__(self) -> str:
         return str(self.request)
@@ -1,11 +1,45 @@
 import json
-from typing import Dict, Any, Optional, List, Union, cast
+from typing import (
+    Dict,
+    Any,
+    Optional,
+    List,
+    Union,
+    cast,
+    Collection,
+    FrozenSet,
+    Hashable,
+    Tuple,
+)
 from urllib.parse import parse_qs
 
+from mockserver_client.json_diff import DEFAULT_IGNORED_FIELD_NAMES
+from mockserver_client.json_fingerprint import get_json_fingerprint
 from mockserver_client.mock_request_logger import MockRequestLogger
 
+# query string as (name, values) pairs sorted by name with the values converted to tuples
+QueryStringKey = Tuple[Tuple[str, Hashable], ...]
+
 
 class MockRequest:
+    # slots keep the memory used per request low when holding many recorded requests
+    __slots__ = (
+        "_body_list",
+        "_is_body_parsed",
+        "_json_fingerprints",
+        "_json_list",
+        "description",
+        "file_path",
+        "headers",
+        "index",
+        "method",
+        "path",
+        "querystring_key",
+        "querystring_params",
+        "request",
+        "sequence",
+    )
+
     def __init__(
         self, request: Dict[str, Any], index: int, file_path: Optional[str]
     ) -> None:
@@ -36,42 +70,131 @@ class MockRequest:
             or isinstance(self.querystring_params, dict)
             or isinstance(self.querystring_params, list)
         ), type(self.querystring_params)
+        # normalized once here since requests are compared many times when matching
+        self.querystring_key: Optional[QueryStringKey] = (
+            MockRequest.get_querystring_key(self.querystring_params)
+        )
 
         self.headers: Optional[Dict[str, Any]] = self.request.get("headers")
 
+        # body_list and json_list are parsed on first access so requests that are filtered out
+        # or matched without their body never parse it
+        self._is_body_parsed: bool = False
+        self._body_list: Optional[List[Dict[str, Any]]] = None
+        self._json_list: Optional[List[Dict[str, Any]]] = None
+
+        # fingerprints of json_list, keyed by the names of the fields whose values are ignored.
+        # Only created when a fingerprint is first needed
+        self._json_fingerprints: Optional[Dict[FrozenSet[str], Optional[str]]] = None
+
+    @property
+    def body_list(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Body of the request parsed into a list
+        """
+        if not self._is_body_parsed:
+            self._parse_body()
+        return self._body_list
+
+    @property
+    def json_list(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Json content of the body of the request as a list
+        """
+        if not self._is_body_parsed:
+            self._parse_body()
+        return self._json_list
+
+    def _parse_body(self) -> None:
         raw_body: str | bytes | Dict[str, Any] | List[Dict[str, Any]] = cast(
             str | bytes | Dict[str, Any] | List[Dict[str, Any]],
             self.request.get("body"),
         )
 
-        self.body_list: Optional[List[Dict[str, Any]]] = MockRequest.parse_body(
+        body_list: Optional[List[Dict[str, Any]]] = MockRequest.parse_body(
             body=raw_body, headers=self.headers
         )
 
-        assert self.body_list is None or isinstance(self.body_list, list), (
-            f"{type(self.body_list)}: {json.dumps(self.body_list)}"
+        assert body_list is None or isinstance(body_list, list), (
+            f"{type(body_list)}: {json.dumps(body_list)}"
         )
 
         raw_json_content: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]] = (
-            self.body_list[0].get("json")
-            if self.body_list is not None
-            and len(self.body_list) > 0
-            and "json" in self.body_list[0]
-            else (
-                self.body_list
-                if self.body_list is not None and len(self.body_list) > 0
-                else None
-            )
+            body_list[0].get("json")
+            if body_list is not None and len(body_list) > 0 and "json" in body_list[0]
+            else (body_list if body_list is not None and len(body_list) > 0 else None)
         )
 
-        self.json_list: Optional[List[Dict[str, Any]]] = (
+        json_list: Optional[List[Dict[str, Any]]] = (
             MockRequest.parse_body(body=raw_json_content, headers=self.headers)
             if raw_json_content
             else None
         )
 
-        assert self.json_list is None or isinstance(self.json_list, list), (
-            f"{type(self.json_list)}: {json.dumps(self.json_list)}"
+        assert json_list is None or isinstance(json_list, list), (
+            f"{type(json_list)}: {json.dumps(json_list)}"
+        )
+
+        self._body_list = body_list
+        self._json_list = json_list
+        self._is_body_parsed = True
+
+    def get_json_fingerprint(
+        self,
+        *,
+        ignore_timestamp_field: Optional[bool] = False,
+        ignored_field_names: Optional[Collection[str]] = None,
+    ) -> Optional[str]:
+        """
+        Returns a cached fingerprint of json_list.  Two requests with the same fingerprint have
+        json bodies that compare as equal (see json_fingerprint.get_json_fingerprint)
+
+
+        :param ignore_timestamp_field: whether to ignore the value of fields named `timestamp`
+        :param ignored_field_names: names of the fields ignored by ignore_timestamp_field.  Defaults to `timestamp`
+        :return: fingerprint or None if there is no json body or it cannot be fingerprinted
+        """
+        key: FrozenSet[str] = (
+            frozenset(ignored_field_names or DEFAULT_IGNORED_FIELD_NAMES)
+            if ignore_timestamp_field
+            else frozenset()
+        )
+        if self._json_fingerprints is None:
+            self._json_fingerprints = {}
+        if key not in self._json_fingerprints:
+            self._json_fingerprints[key] = (
+                get_json_fingerprint(
+                    self.json_list,
+                    ignore_timestamp_field=bool(key),
+                    ignored_field_names=key,
+                )
+                if self.json_list is not None
+                else None
+            )
+        return self._json_fingerprints[key]
+
+    def has_same_json_fingerprint(
+        self,
+        other: "MockRequest",
+        *,
+        ignore_timestamp_field: Optional[bool] = False,
+        ignored_field_names: Optional[Collection[str]] = None,
+    ) -> bool:
+        """
+        Whether the json bodies of both requests are known to be equal without comparing them in full
+
+
+        :param other: other request
+        :param ignore_timestamp_field: whether to ignore the value of fields named `timestamp`
+        :param ignored_field_names: names of the fields ignored by ignore_timestamp_field.  Defaults to `timestamp`
+        """
+        fingerprint: Optional[str] = self.get_json_fingerprint(
+            ignore_timestamp_field=ignore_timestamp_field,
+            ignored_field_names=ignored_field_names,
+        )
+        return fingerprint is not None and fingerprint == other.get_json_fingerprint(
+            ignore_timestamp_field=ignore_timestamp_field,
+            ignored_field_names=ignored_field_names,
         )
 
     @staticmethod
@@ -152,6 +275,32 @@ class MockRequest:
             + (f" | File: ({self.file_path})" if self.file_path else "")
         )
 
+    @staticmethod
+    def get_querystring_key(
+        querystring_params: Dict[str, Any] | List[Dict[str, Any]] | None,
+    ) -> Optional[QueryStringKey]:
+        """
+        Returns a hashable key that is equal for query strings that are equal once normalized, whether they
+        are a dict or a list of name/values and whatever the order of the names
+
+
+        :param querystring_params: query string as a dict or as a list of name/values
+        :return: key or None if there is no query string
+        """
+        if querystring_params is None:
+            return None
+        normalized_params: Dict[str, Any] = (
+            querystring_params
+            if isinstance(querystring_params, dict)
+            else {p["name"]: p["values"] for p in querystring_params}
+        )
+        return tuple(
+            sorted(
+                ((name, _freeze(values)) for name, values in normalized_params.items()),
+                key=lambda item: item[0],
+            )
+        )
+
     @staticmethod
     def convert_query_parameters_to_dict(query: str) -> Dict[str, str]:
         params: Dict[str, List[str]] = parse_qs(query)
@@ -161,5 +310,16 @@ class MockRequest:
         return (
             self.method == other.method
             and self.path == other.path
-            and self.querystring_params == other.querystring_params
+            and self.querystring_key == other.querystring_key
         )
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    Converts lists and dicts into tuples so the value can be used as a dictionary key
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value  # type: ignore[no-any-return]
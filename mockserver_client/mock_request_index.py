@@ -0,0 +1,176 @@
+from collections import defaultdict
+from heapq import merge
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from mockserver_client.mock_request import MockRequest, _freeze
+
+# id key used for requests whose json body is an empty list
+_EMPTY_JSON_LIST: Tuple[str] = ("(empty)",)
+
+
+class MockRequestIndex:
+    """
+    Ordered collection of MockRequests bucketed by method, path and query string and by the
+    ids and resourceTypes in the json body.
+
+    Used when matching expectations to recorded requests so only requests that can possibly
+    match are compared instead of scanning every request.  Candidates are always returned in the
+    order the requests were added so matching picks the same request as a linear scan would.
+    """
+
+    def __init__(self, requests: Iterable[MockRequest]) -> None:
+        """
+        Ordered collection of MockRequests bucketed by method, path, query string and resource ids
+
+
+        :param requests: requests to index
+        """
+        # position of each request in the order it was added. None once it is removed
+        self._requests: List[Optional[MockRequest]] = []
+        self._positions: Dict[int, int] = {}
+        # url key -> id key -> positions
+        self._by_url: Dict[Hashable, Dict[Hashable, List[int]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        # id key -> positions (only requests that have a json body)
+        self._by_id: Dict[Hashable, List[int]] = defaultdict(list)
+        self._count: int = 0
+        for request in requests:
+            self.add(request)
+
+    def add(self, request: MockRequest) -> None:
+        """
+        Adds a request at the end of the index
+
+
+        :param request: request to add
+        """
+        position: int = len(self._requests)
+        self._requests.append(request)
+        self._positions[id(request)] = position
+        id_key: Optional[Hashable] = self.get_id_key(request)
+        self._by_url[self.get_url_key(request)][id_key].append(position)
+        if id_key is not None:
+            self._by_id[id_key].append(position)
+        self._count += 1
+
+    def remove(self, request: MockRequest) -> None:
+        """
+        Removes the request from the index
+
+
+        :param request: request to remove
+        """
+        position: Optional[int] = self._positions.pop(id(request), None)
+        assert position is not None, f"{request} is not in the index"
+        self._requests[position] = None
+        self._count -= 1
+
+    def __contains__(self, request: MockRequest) -> bool:
+        return id(request) in self._positions
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[MockRequest]:
+        return (r for r in self._requests if r is not None)
+
+    def candidates_matching_url(self, request: MockRequest) -> Iterator[MockRequest]:
+        """
+        Returns, in order, the requests that have the same method, path and query string as the
+        given request and whose ids do not rule out a match
+
+
+        :param request: request to find candidates for
+        """
+        return self._get_requests(self._get_url_positions(request))
+
+    def candidates_matching_url_or_ids(
+        self, request: MockRequest
+    ) -> Iterator[MockRequest]:
+        """
+        Returns, in order, the requests that either match the given request on url (see candidates_matching_url)
+        or have the same ids and resourceTypes in their json body
+
+
+        :param request: request to find candidates for
+        """
+        id_key: Optional[Hashable] = self.get_id_key(request)
+        id_positions: List[int] = (
+            self._by_id.get(id_key, []) if id_key is not None else []
+        )
+        positions: Iterator[int] = merge(self._get_url_positions(request), id_positions)
+        return self._get_requests(_unique(positions))
+
+    def _get_url_positions(self, request: MockRequest) -> Iterator[int]:
+        by_id: Optional[Dict[Hashable, List[int]]] = self._by_url.get(
+            self.get_url_key(request)
+        )
+        if not by_id:
+            return iter([])
+        id_key: Optional[Hashable] = self.get_id_key(request)
+        if id_key is None:
+            # ids are only compared when both requests have a json body
+            return merge(*by_id.values())
+        return merge(by_id.get(None, []), by_id.get(id_key, []))
+
+    def _get_requests(self, positions: Iterable[int]) -> Iterator[MockRequest]:
+        for position in positions:
+            request: Optional[MockRequest] = self._requests[position]
+            if request is not None:
+                yield request
+
+    @staticmethod
+    def get_url_key(request: MockRequest) -> Hashable:
+        """
+        Returns a hashable key that is equal for requests with the same method, path and query string
+
+
+        :param request: request
+        """
+        return (
+            request.method,
+            request.path,
+            request.querystring_key,
+        )
+
+    @staticmethod
+    def get_querystring_key(
+        querystring_params: Dict[str, Any] | List[Dict[str, Any]] | None,
+    ) -> Hashable:
+        """
+        Returns a hashable key that is equal for query strings that are equal once normalized
+
+
+        :param querystring_params: query string as a dict or as a list of name/values
+        """
+        return MockRequest.get_querystring_key(querystring_params)
+
+    @staticmethod
+    def get_id_key(request: MockRequest) -> Optional[Hashable]:
+        """
+        Returns a hashable key of the ids and resourceTypes in the json body or None if there is no json body
+
+
+        :param request: request
+        """
+        json_list: Optional[List[Dict[str, Any]]] = request.json_list
+        if json_list is None:
+            return None
+        if not json_list:
+            return _EMPTY_JSON_LIST
+        return (
+            _freeze([j["id"] for j in json_list if "id" in j]),
+            _freeze([j["resourceType"] for j in json_list if "resourceType" in j]),
+        )
+
+
+def _unique(positions: Iterable[int]) -> Iterator[int]:
+    """
+    Removes duplicates from a sorted sequence
+    """
+    last: Optional[int] = None
+    for position in positions:
+        if position != last:
+            yield position
+            last = position
@@ -1,7 +1,102 @@
-from typing import Dict, Any, Optional, List
+import logging
+import queue
+import threading
+from logging import Logger
+from pathlib import Path
+from typing import Dict, Any, Optional, List, TextIO
 
 
 class MockRequestLogger:
+    """
+    Logs the requests mocked by MockServerFriendlyClient.
+
+    Messages are only formatted when they will be written: either the level is enabled on the logger or a
+    sink is set.  Bodies and responses are truncated to max_body_length.  If a sink is set, messages are
+    written to it in batches by a background thread instead of being passed to the logger.
+    """
+
+    # characters of each body and response that are logged
+    DEFAULT_MAX_BODY_LENGTH = 1000
+    # bytes buffered before the sink file is written to
+    DEFAULT_BUFFER_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        *,
+        logger: Optional[Logger] = None,
+        level: int = logging.DEBUG,
+        max_body_length: Optional[int] = DEFAULT_MAX_BODY_LENGTH,
+        sink: str | Path | TextIO | None = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        """
+        Logs the requests mocked by MockServerFriendlyClient
+
+
+        :param logger: logger to use.  Defaults to the MockServerClient logger
+        :param level: level the mocked requests are logged at
+        :param max_body_length: maximum number of characters of each body and response to log.
+                                    If None, they are logged in full
+        :param sink: file path or text stream to write the mocked requests to from a background thread.
+                        If set, every mocked request is written to it and nothing is passed to the logger
+        :param buffer_size: size of the write buffer when sink is a file path
+        """
+        self.logger: Logger = logger or logging.getLogger("MockServerClient")
+        self.level: int = level
+        self.max_body_length: Optional[int] = max_body_length
+        self._sink: Optional[_BufferedSink] = (
+            _BufferedSink(sink=sink, buffer_size=buffer_size)
+            if sink is not None
+            else None
+        )
+
+    @property
+    def is_enabled(self) -> bool:
+        """
+        Whether mocked requests are written anywhere
+        """
+        return self._sink is not None or self.logger.isEnabledFor(self.level)
+
+    def log_request(
+        self,
+        *,
+        file_path: Optional[str],
+        base_url: str,
+        request: Dict[str, Any],
+        response: Dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Logs the mock request if enabled
+
+        :param base_url: base url
+        :param file_path: file name
+        :param request: mock request
+        :param response: mock response
+        """
+        if not self.is_enabled:
+            return
+        message: str = MockRequestLogger.format_request(
+            file_path=file_path,
+            base_url=base_url,
+            request=request,
+            response=response,
+            max_body_length=self.max_body_length,
+        )
+        if self._sink is not None:
+            self._sink.write(message)
+        else:
+            self.logger.log(self.level, message)
+
+    def close(self) -> None:
+        """
+        Writes the remaining messages to the sink and stops its background thread
+
+
+        """
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
     @staticmethod
     def log(
         *,
@@ -18,6 +113,34 @@ class MockRequestLogger:
         :param request: mock request
         :param response: mock response
         """
+        print(
+            MockRequestLogger.format_request(
+                file_path=file_path,
+                base_url=base_url,
+                request=request,
+                response=response,
+                max_body_length=None,
+            )
+        )
+
+    @staticmethod
+    def format_request(
+        *,
+        file_path: Optional[str],
+        base_url: str,
+        request: Dict[str, Any],
+        response: Dict[str, Any] | None = None,
+        max_body_length: Optional[int] = None,
+    ) -> str:
+        """
+        Returns a one line description of the mock request
+
+        :param base_url: base url
+        :param file_path: file name
+        :param request: mock request
+        :param response: mock response
+        :param max_body_length: maximum number of characters of the body and response.  If None, they are not truncated
+        """
         method: str = request.get("method", "GET")
         path: Optional[str] = request.get("path")
         query_string_parameters: Optional[Dict[str, Any]] = request.get(
@@ -28,7 +151,7 @@ class MockRequestLogger:
             response.get("body") if response else None
         )
 
-        print(
+        return (
             f"Mocking: {method} {base_url}{path}"
             + (
                 f"{MockRequestLogger.convert_query_parameters_to_str(query_string_parameters)}"
@@ -36,10 +159,28 @@ class MockRequestLogger:
                 else ""
             )
             + (f", from: ({file_path})" if file_path else "")
-            + (f", body: {body}" if body else "")
-            + (f", response: {response_body}" if response_body else "")
+            + (
+                f", body: {MockRequestLogger.truncate(body, max_body_length)}"
+                if body
+                else ""
+            )
+            + (
+                f", response: {MockRequestLogger.truncate(response_body, max_body_length)}"
+                if response_body
+                else ""
+            )
         )
 
+    @staticmethod
+    def truncate(value: Any, max_length: Optional[int]) -> str:
+        """
+        Returns the value as a string of at most max_length characters (plus a note of how much was cut)
+        """
+        text: str = str(value)
+        if max_length is None or len(text) <= max_length:
+            return text
+        return f"{text[:max_length]}... ({len(text) - max_length} more characters)"
+
     @staticmethod
     def convert_query_parameters_to_str(
         query_parameters: Dict[str, Any] | List[Dict[str, Any]] | None,
@@ -67,3 +208,48 @@ class MockRequestLogger:
             assert isinstance(values, list)
             return ",".join([str(v) for v in values])
         return ""
+
+
+class _BufferedSink:
+    """
+    Writes messages to a file or stream from a background thread so the caller never waits on I/O
+    """
+
+    def __init__(self, *, sink: str | Path | TextIO, buffer_size: int) -> None:
+        self._owns_file: bool = isinstance(sink, (str, Path))
+        self._file: TextIO = (
+            open(sink, "a", buffering=buffer_size, encoding="utf-8")
+            if isinstance(sink, (str, Path))
+            else sink
+        )
+        # None tells the background thread to stop
+        self._queue: queue.SimpleQueue[Optional[str]] = queue.SimpleQueue()
+        self._thread: threading.Thread = threading.Thread(
+            target=self._write_messages, name="MockRequestLogger", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, message: str) -> None:
+        self._queue.put(message)
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        if self._owns_file:
+            self._file.close()
+
+    def _write_messages(self) -> None:
+        stopped: bool = False
+        while not stopped:
+            messages: List[Optional[str]] = [self._queue.get()]
+            # write whatever else has been queued in one call
+            while True:
+                try:
+                    messages.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in messages:
+                stopped = True
+                messages = messages[: messages.index(None)]
+            self._file.write("".join(f"{message}\n" for message in messages))
+        self._file.flush()
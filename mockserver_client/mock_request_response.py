@@ -5,6 +5,8 @@ from mockserver_client.mock_response import MockResponse
 
 
 class MockRequestResponse:
+    __slots__ = ("file_path", "raw_request", "raw_response", "request", "response")
+
     def __init__(
         self,
         *,
@@ -13,6 +15,7 @@ class MockRequestResponse:
         index: int,
         file_path: str | None = None,
     ):
+        # the raw dicts are the same objects the parsed request and response wrap, not copies
         self.raw_request: Dict[str, Any] | None = request
         self.request: MockRequest | None = (
             MockRequest(request=request, index=index, file_path=file_path)
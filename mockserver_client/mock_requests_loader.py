@@ -1,10 +1,13 @@
+import io
 import json
 import os
 from glob import glob
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
 from mockserver_client.error_messages import common_error_messages
+from mockserver_client.fixture_cache import FixtureCache, get_default_fixture_cache
+from mockserver_client.request_archive import is_request_archive, read_request_archive
 from mockserver_client.mockserver_client import (
     mock_request,
     mock_response,
@@ -23,6 +26,7 @@ def bulk_load_mock_fhir_requests_from_folder(
     url_prefix: Optional[str] = None,
     response_body: Optional[str] = None,
     resource_type: str = "Person",
+    fixture_cache: Optional[FixtureCache] = None,
 ) -> List[str]:
     """
     Loads all .json files from the folder and its sub-folders
@@ -35,14 +39,15 @@ def bulk_load_mock_fhir_requests_from_folder(
     :param query_string:
     :param url_prefix:
     :param response_body:
+    :param fixture_cache: cache to load the files with.  Defaults to the shared cache
     """
     file_path: str
     files: List[str] = sorted(
         glob(str(folder.joinpath("**/*.json")), recursive=True), reverse=True
     )
-    for file_path in files:
-        with open(file_path, "r") as file:
-            data = json.loads(file.read())
+    fixture_cache = fixture_cache or get_default_fixture_cache()
+    with mock_client.batch_expectations():
+        for file_path, data in fixture_cache.load_files(files):
             if isinstance(data, list):
                 if method == "POST":
                     # noinspection PyPep8Naming
@@ -72,6 +77,7 @@ def load_mock_fhir_requests_from_folder(
     query_string: Optional[Dict[str, Any]] = None,
     url_prefix: Optional[str] = None,
     response_body: Optional[str] = None,
+    fixture_cache: Optional[FixtureCache] = None,
 ) -> List[str]:
     """
     Loads all .json files from the folder and its sub-folders
@@ -85,15 +91,15 @@ def load_mock_fhir_requests_from_folder(
     :param query_string:
     :param url_prefix:
     :param response_body:
+    :param fixture_cache: cache to load the files with.  Defaults to the shared cache
     """
     file_path: str
     files: List[str] = sorted(
         glob(str(folder.joinpath("**/*.json")), recursive=True), reverse=True
     )
-    for file_path in files:
-        # load file as json
-        with open(file_path, "r") as file:
-            contents = json.loads(file.read())
+    fixture_cache = fixture_cache or get_default_fixture_cache()
+    with mock_client.batch_expectations():
+        for file_path, contents in fixture_cache.load_files(files):
             if isinstance(contents, list) and not relative_path:
                 for fhir_request in contents:
                     mock_single_request(
@@ -142,6 +148,7 @@ def load_mock_fhir_requests_for_single_file(
     query_string: Optional[Dict[str, Any]] = None,
     url_prefix: Optional[str] = None,
     response_body: Optional[str] = None,
+    fixture_cache: Optional[FixtureCache] = None,
 ) -> List[str]:
     """
     Loads a single .json file from the given folder
@@ -156,17 +163,16 @@ def load_mock_fhir_requests_for_single_file(
     :param query_string:
     :param url_prefix:
     :param response_body:
+    :param fixture_cache: cache to load the files with.  Defaults to the shared cache
     """
 
     file_path: str
     files: List[str] = sorted(
         glob(str(folder.joinpath(f"**/{single_file_name}")), recursive=True)
     )
-    for file_path in files:
-        # load file as json
-        with open(file_path, "r") as file:
-            contents = json.loads(file.read())
-
+    fixture_cache = fixture_cache or get_default_fixture_cache()
+    with mock_client.batch_expectations():
+        for file_path, contents in fixture_cache.load_files(files):
             mock_single_request(
                 fhir_request=contents,
                 method=method,
@@ -354,6 +360,7 @@ def load_mock_fhir_everything_requests_from_folder(
     mock_client: MockServerFriendlyClient,
     resourceType: str,
     url_prefix: Optional[str] = None,
+    fixture_cache: Optional[FixtureCache] = None,
 ) -> List[str]:
     """
     Loads all .json files from the folder and its sub-folders
@@ -364,13 +371,14 @@ def load_mock_fhir_everything_requests_from_folder(
     :param mock_client:
     :param resourceType:
     :param url_prefix:
+    :param fixture_cache: cache to load the files with.  Defaults to the shared cache
     """
     file_path: str
     files: List[str] = glob(str(folder.joinpath("**/*.json")), recursive=True)
-    for file_path in files:
-        # load file as json
-        with open(file_path, "r") as file:
-            fhir_request: Dict[str, Any] = json.loads(file.read())
+    fixture_cache = fixture_cache or get_default_fixture_cache()
+    with mock_client.batch_expectations():
+        fhir_request: Dict[str, Any]
+        for file_path, fhir_request in fixture_cache.load_files(files):
             # find id and resourceType
             id_: str = fhir_request["id"]
             path = f"{('/' + url_prefix) if url_prefix else ''}/4_0_0/{resourceType}/{id_}/$everything"
@@ -393,6 +401,7 @@ def load_mock_fhir_everything_batch_requests_from_folder(
     resourceType: str,
     ids: List[str],
     url_prefix: Optional[str] = None,
+    fixture_cache: Optional[FixtureCache] = None,
 ) -> List[str]:
     """
     Loads all .json files from the folder and its sub-folders
@@ -404,6 +413,7 @@ def load_mock_fhir_everything_batch_requests_from_folder(
     :param resourceType:
     :param url_prefix:
     :param ids: id of resources for this batch to load
+    :param fixture_cache: cache to load the files with.  Defaults to the shared cache
     """
     file_path: str
     files: List[str] = glob(str(folder.joinpath("**/*.json")), recursive=True)
@@ -413,10 +423,10 @@ def load_mock_fhir_everything_batch_requests_from_folder(
         "type": "collection",
         "entry": [],
     }
+    fixture_cache = fixture_cache or get_default_fixture_cache()
     print(f"mock fhir batch request for {ids}")
-    for file_path in files:
-        with open(file_path, "r") as file:
-            fhir_bundle: Dict[str, Any] = json.loads(file.read())
+    fhir_bundle: Dict[str, Any]
+    for file_path, fhir_bundle in fixture_cache.load_files(files):
         if "entry" not in fhir_bundle:
             print(f"{file_path} has no entry property!")
             continue
@@ -440,7 +450,10 @@ def load_mock_fhir_everything_batch_requests_from_folder(
 
 
 def load_mock_elasticsearch_requests_from_folder(
-    folder: Path, mock_client: MockServerFriendlyClient, index: str
+    folder: Path,
+    mock_client: MockServerFriendlyClient,
+    index: str,
+    fixture_cache: Optional[FixtureCache] = None,
 ) -> List[str]:
     """
     Loads all .json files from the folder and its sub-folders
@@ -450,19 +463,16 @@ def load_mock_elasticsearch_requests_from_folder(
     :param folder: where to look for .json files (recursively)
     :param mock_client:
     :param index:
+    :param fixture_cache: cache to load the files with.  Defaults to the shared cache
     """
     file_path: str
     files: List[str] = glob(str(folder.joinpath("**/*.json")), recursive=True)
-    for file_path in files:
-        # load file as json
-        with open(file_path, "r") as file:
-            lines: List[str] = file.readlines()
-            http_request: str = "\n".join(
-                [
-                    (json.dumps(json.loads(line))) if line != "\n" else ""
-                    for line in lines
-                ]
-            )
+    fixture_cache = fixture_cache or get_default_fixture_cache()
+    with mock_client.batch_expectations():
+        http_request: str
+        for file_path, http_request in fixture_cache.load_files(
+            files, parse=_to_elasticsearch_bulk_body, parser_name="elasticsearch_bulk"
+        ):
             # noinspection PyPep8Naming
             path = f"/{index}/_bulk"
             # noinspection SpellCheckingInspection
@@ -511,6 +521,7 @@ def load_mock_source_api_responses_from_folder(
     mock_client: MockServerFriendlyClient,
     url_prefix: Optional[str],
     times_: int = 1,
+    fixture_cache: Optional[FixtureCache] = None,
 ) -> List[str]:
     """
     Mock responses for all files from the folder and its sub-folders
@@ -521,12 +532,14 @@ def load_mock_source_api_responses_from_folder(
     :param mock_client: client to mock server
     :param url_prefix: http://{mock_server_url}/{url_prefix}...
     :param times_: number of times to mock the response
+    :param fixture_cache: cache to load the files with.  Defaults to the shared cache
     """
     file_path: str
     files: List[str] = sorted(glob(str(folder.joinpath("**/*")), recursive=True))
-    for file_path in files:
-        with open(file_path, "r") as file:
-            content = file.read()
+    fixture_cache = fixture_cache or get_default_fixture_cache()
+    with mock_client.batch_expectations():
+        content: str
+        for file_path, content in fixture_cache.read_files(files):
             path = f"{('/' + url_prefix) if url_prefix else ''}/{os.path.basename(file_path)}"
             mock_client.expect(
                 request=mock_request(
@@ -547,23 +560,38 @@ def load_mock_source_api_json_responses(
     add_file_name: Optional[bool] = False,
     url_suffix: Optional[str] = None,
     times_: int = 1,
+    fixture_cache: Optional[FixtureCache] = None,
 ) -> List[str]:
     """
-    Mock responses for all files from the folder and its sub-folders
+    Mock responses for all files from the folder and its sub-folders, or for all the requests in an
+    archive written by MockServerFriendlyClient.write_all_requests_to_folder()
 
-    :param folder: where to look for files (recursively)
+    :param folder: where to look for files (recursively) or path of a requests.ndjson(.gz) archive.
+                    The file path of each request in an archive is the archive path joined with its file name
     :param mock_client:
     :param url_prefix: http://{mock_server_url}/{url_prefix}...
     :param add_file_name: http://{mock_server_url}/{url_prefix}/{add_file_name}...
     :param url_suffix: http://{mock_server_url}/{url_prefix}/{add_file_name}/{url_suffix}?
     :param times_: number of times to mock the response
+    :param fixture_cache: cache to load the files with.  Defaults to the shared cache
     """
     file_path: str
-    files: List[str] = sorted(glob(str(folder.joinpath("**/*.json")), recursive=True))
-    for file_path in files:
-        file_name = os.path.basename(file_path)
-        with open(file_path, "r") as file:
-            content = json.loads(file.read())
+    files: List[str]
+    contents: Iterable[Tuple[str, Any]]
+    if is_request_archive(folder):
+        archive_entries: List[Tuple[str, Any]] = [
+            (os.path.join(str(folder), file_name), content)
+            for file_name, content in read_request_archive(folder)
+        ]
+        files = [file_path for file_path, _ in archive_entries]
+        contents = archive_entries
+    else:
+        files = sorted(glob(str(folder.joinpath("**/*.json")), recursive=True))
+        fixture_cache = fixture_cache or get_default_fixture_cache()
+        contents = fixture_cache.load_files(files)
+    with mock_client.batch_expectations():
+        for file_path, content in contents:
+            file_name = os.path.basename(file_path)
 
             try:
                 request_parameters = content["request_parameters"]
@@ -645,3 +673,13 @@ def load_mock_source_api_json_responses(
                 )
 
     return files
+
+
+def _to_elasticsearch_bulk_body(text: str) -> str:
+    # normalize each json line of an elasticsearch bulk request
+    return "\n".join(
+        [
+            (json.dumps(json.loads(line))) if line != "\n" else ""
+            for line in io.StringIO(text).readlines()
+        ]
+    )
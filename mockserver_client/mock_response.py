@@ -1,26 +1,60 @@
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+
+# raw body and body parsed as json
+ParsedBody = Tuple[Optional[str], Dict[str, Any] | List[Dict[str, Any]] | None]
 
 
 class MockResponse:
+    # the body is parsed on first access so recorded responses that are never read don't hold
+    # the parsed json next to the raw body
+    __slots__ = ("_parsed_body", "file_path", "index", "response", "status_code")
+
     def __init__(
         self, *, response: Dict[str, Any], index: int, file_path: Optional[str]
     ) -> None:
         assert index is not None
         assert response is not None
         assert isinstance(response, dict)
-        raw_body = response.get("body")
-        if isinstance(raw_body, dict):
-            raw_body = json.dumps(raw_body)
-        self.raw_body: Optional[str] = raw_body
-        self.json_body: Dict[str, Any] | List[Dict[str, Any]] | None
-        if not self.raw_body:
-            self.json_body = None
-        try:
-            self.json_body = json.loads(self.raw_body) if self.raw_body else None
-        except json.decoder.JSONDecodeError:
-            self.json_body = None
-
+        self.response: Dict[str, Any] = response
         self.status_code: int | None = response.get("statusCode")
         self.index: int = index
         self.file_path: Optional[str] = file_path
+        # None until the body is parsed
+        self._parsed_body: Optional[ParsedBody] = None
+
+    @property
+    def raw_body(self) -> Optional[str]:
+        """
+        Body of the response as a string
+        """
+        return self._get_parsed_body()[0]
+
+    @raw_body.setter
+    def raw_body(self, value: Optional[str]) -> None:
+        self._parsed_body = (value, self._get_parsed_body()[1])
+
+    @property
+    def json_body(self) -> Dict[str, Any] | List[Dict[str, Any]] | None:
+        """
+        Body of the response parsed as json or None if it is not json
+        """
+        return self._get_parsed_body()[1]
+
+    @json_body.setter
+    def json_body(self, value: Dict[str, Any] | List[Dict[str, Any]] | None) -> None:
+        self._parsed_body = (self._get_parsed_body()[0], value)
+
+    def _get_parsed_body(self) -> ParsedBody:
+        if self._parsed_body is None:
+            raw_body = self.response.get("body")
+            if isinstance(raw_body, dict):
+                raw_body = json.dumps(raw_body)
+            json_body: Dict[str, Any] | List[Dict[str, Any]] | None = None
+            if raw_body:
+                try:
+                    json_body = json.loads(raw_body)
+                except json.decoder.JSONDecodeError:
+                    json_body = None
+            self._parsed_body = (raw_body, json_body)
+        return self._parsed_body
@@ -4,13 +4,30 @@ import json
 import logging
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 from logging import Logger
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union, cast
+from types import TracebackType
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
-from deepdiff.delta import Delta
 from deepdiff.diff import DeepDiff
-from requests import put, Response
+from requests import Response
 
 from mockserver_client.exceptions.mock_server_exception import (
     MockServerException,
@@ -26,14 +43,57 @@ from mockserver_client.exceptions.mock_server_request_not_found_exception import
 )
 from ._time import _Time
 from ._timing import _Timing
+from .expectation_index import (
+    DuplicateExpectationPolicy,
+    ExpectationIndex,
+    IndexedExpectation,
+)
+from .instrumentation import (
+    BODY_COMPARISONS,
+    BYTES_RECEIVED,
+    BYTES_SENT,
+    CALL,
+    CALLS,
+    COMPARE_DICTS,
+    COMPARE_IN_PARALLEL,
+    DEEP_DIFF_INVOCATIONS,
+    EXPECTATIONS,
+    FINGERPRINT_HITS,
+    MATCH,
+    PARALLEL_COMPARISONS,
+    PRECOMPUTED_DIFFERENCE_HITS,
+    RETRIEVE_PARSE,
+    RETRIEVED_REQUESTS,
+    VERIFY,
+    WRITE_REQUESTS,
+    ClientInstrumentation,
+    MockServerClientStats,
+    get_active_instrumentation,
+)
+from .json_diff import DEFAULT_IGNORED_FIELD_NAMES, diff_json_ignoring_fields
+from .json_stream import iter_json_array
+from .match_reporter import MatchReporter
 from .match_request_result import MatchRequestResult
 from .mock_expectation import MockExpectation
 from .mock_request import MockRequest
+from .mock_request_index import MockRequestIndex
 from .mock_request_logger import MockRequestLogger
 from .mock_request_response import MockRequestResponse
 from .mock_response import MockResponse
+from .mockserver_transport import MockServerTransport
+from .path_match_strategy import PathMatchStrategy, get_retrieve_request_filter
+from .request_archive import (
+    RequestArchiveEntry,
+    RequestLogFormat,
+    write_request_archive,
+)
+from .verification_checkpoint import VerificationCheckpoint
 from .mockserver_verify_exception import MockServerVerifyException
 
+# differences between the json bodies of two requests keyed by the id() of both requests and
+# whether timestamp fields were ignored
+JsonDifferences = Dict[Tuple[int, int, bool], Dict[str, Any]]
+
 
 class MockServerFriendlyClient(object):
     """
@@ -42,6 +102,10 @@ class MockServerFriendlyClient(object):
     """
 
     MAX_FILENAME_LENGTH = 255  # Maximum length for most Linux systems
+    DEFAULT_BATCH_SIZE = 500  # Number of expectations sent in one call when batching
+    DEFAULT_STREAM_CHUNK_SIZE = (
+        64 * 1024
+    )  # Number of bytes read at a time when streaming /retrieve
 
     def __init__(
         self,
@@ -49,6 +113,20 @@ class MockServerFriendlyClient(object):
         log_all_requests_to_folder: str | Path | None = None,
         logger: Optional[Logger] = None,
         ignore_timestamp_field: Optional[bool] = False,
+        ignored_field_names: Optional[List[str]] = None,
+        transport: Optional[MockServerTransport] = None,
+        pool_size: int = 10,
+        retries: int = 3,
+        timeout: float = 60,
+        verification_workers: Optional[int] = None,
+        verification_chunk_size: int = 50,
+        path_match_strategy: PathMatchStrategy = PathMatchStrategy.SUBSTRING,
+        filter_retrieved_requests_on_server: bool = False,
+        instrumentation: Optional[ClientInstrumentation] = None,
+        request_logger: Optional[MockRequestLogger] = None,
+        match_report_file: str | Path | None = None,
+        log_all_requests_format: RequestLogFormat = RequestLogFormat.FILES,
+        duplicate_expectations: DuplicateExpectationPolicy = DuplicateExpectationPolicy.ALLOW,
     ) -> None:
         """
         Client for the MockServer
@@ -56,6 +134,31 @@ class MockServerFriendlyClient(object):
 
         :param base_url: base url to use
         :param ignore_timestamp_field: if True then any fields named 'timestamp' in the request body will have their value ignored. the diff will still check to ensure the element exists
+        :param ignored_field_names: names of the fields whose values are ignored when ignore_timestamp_field is set.
+                                    Defaults to ['timestamp']
+        :param transport: transport to use for calls to the MockServer.  If not passed, the client creates
+                            (and closes) its own pooled transport using pool_size, retries and timeout
+        :param pool_size: maximum number of keep-alive connections to the MockServer
+        :param retries: number of times to retry a call that could not connect
+        :param timeout: default timeout in seconds for each call to the MockServer
+        :param verification_workers: if set, the request bodies are compared in this many worker processes
+                                        when verifying expectations.  By default they are compared serially
+        :param verification_chunk_size: number of body comparisons sent to a worker process at a time
+        :param path_match_strategy: how the test_name passed to verify_expectations() is matched to the path
+                                    of the recorded requests
+        :param filter_retrieved_requests_on_server: if True then verify_expectations() asks the MockServer for
+                                    only the requests for the test instead of retrieving all the requests.
+                                    Ignored when log_all_requests_to_folder is set so every recorded request
+                                    is still written there, numbered by its position in all the requests
+        :param instrumentation: times the phases of the client and counts the work done (see stats).
+                                    Disabled by default
+        :param request_logger: logs each mocked request.  Defaults to logging them to logger at DEBUG level
+        :param match_report_file: if set, the expectations and requests compared by verify_expectations() are
+                                    appended to this file instead of being logged at DEBUG level
+        :param log_all_requests_format: whether log_all_requests_to_folder gets one file per request or a
+                                    single NDJSON (optionally gzip compressed) archive
+        :param duplicate_expectations: what expect() does with an expectation that duplicates an earlier one.
+                                    By default it is registered as is
         """
         self.base_url: str = base_url
         self.expectations: List[MockExpectation] = []
@@ -63,18 +166,117 @@ class MockServerFriendlyClient(object):
         if not logger:
             self.logger.setLevel(os.environ.get("LOGLEVEL") or logging.INFO)
         self.log_all_requests_to_folder: str | Path | None = log_all_requests_to_folder
+        self.log_all_requests_format: RequestLogFormat = log_all_requests_format
         self.ignore_timestamp_field: Optional[bool] = ignore_timestamp_field
+        self.ignored_field_names: List[str] = ignored_field_names or list(
+            DEFAULT_IGNORED_FIELD_NAMES
+        )
+        # only close the transport on close() if we created it
+        self._owns_transport: bool = transport is None
+        self.transport: MockServerTransport = transport or MockServerTransport(
+            pool_size=pool_size, retries=retries, timeout=timeout
+        )
+        # expectations waiting to be sent while inside batch_expectations()
+        self._pending_expectations: List[Dict[str, Any]] = []
+        self._batch_depth: int = 0
+        self._batch_size: int = self.DEFAULT_BATCH_SIZE
+        self.verification_workers: Optional[int] = verification_workers
+        self.verification_chunk_size: int = verification_chunk_size
+        # differences between request bodies compared in parallel, only set while matching
+        self._json_differences: JsonDifferences = {}
+        self.path_match_strategy: PathMatchStrategy = path_match_strategy
+        self.filter_retrieved_requests_on_server: bool = (
+            filter_retrieved_requests_on_server
+        )
+        self.instrumentation: ClientInstrumentation = (
+            instrumentation or ClientInstrumentation()
+        )
+        self.request_logger: MockRequestLogger = request_logger or MockRequestLogger(
+            logger=self.logger
+        )
+        self.match_reporter: MatchReporter = MatchReporter(
+            logger=self.logger, report_file=match_report_file
+        )
+        self.duplicate_expectations: DuplicateExpectationPolicy = duplicate_expectations
+        # expectations by key, only kept up to date when needed (see get_expectation_index)
+        self._expectation_index: ExpectationIndex = ExpectationIndex()
+
+    @property
+    def stats(self) -> MockServerClientStats:
+        """
+        Timings and counters collected when instrumentation is enabled
+        """
+        return self.instrumentation.stats
 
     def _call(
-        self, command: str, data: Any = None, query_string: Optional[str] = None
+        self,
+        command: str,
+        data: Any = None,
+        query_string: Optional[str] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
     ) -> Response:
         url = "{}/{}".format(self.base_url, command)
         if query_string:
             url += "?" + query_string
-        try:
-            return put(url, data=data, timeout=60)
-        except Exception as e:
-            raise Exception(f"Error calling {url}: {e}")
+        with self.instrumentation.span(CALL, command=command) as attributes:
+            try:
+                response: Response = (
+                    self.transport.put(url, data=data, timeout=timeout, stream=True)
+                    if stream
+                    else self.transport.put(url, data=data, timeout=timeout)
+                )
+            except Exception as e:
+                raise Exception(f"Error calling {url}: {e}")
+            if self.instrumentation.enabled:
+                self._count_call(
+                    attributes=attributes, data=data, response=response, stream=stream
+                )
+            return response
+
+    def _count_call(
+        self,
+        *,
+        attributes: Dict[str, Any],
+        data: Any,
+        response: Response,
+        stream: bool,
+    ) -> None:
+        bytes_sent: int = len(data) if isinstance(data, (str, bytes)) else 0
+        # a streamed response has not been read yet so only its announced length is known
+        bytes_received: int = (
+            int(response.headers.get("Content-Length") or 0)
+            if stream
+            else len(response.content)
+        )
+        self.instrumentation.count(CALLS)
+        self.instrumentation.count(BYTES_SENT, bytes_sent)
+        self.instrumentation.count(BYTES_RECEIVED, bytes_received)
+        attributes.update(
+            status_code=response.status_code,
+            bytes_sent=bytes_sent,
+            bytes_received=bytes_received,
+        )
+
+    def close(self) -> None:
+        """
+        Releases the pooled connections to the MockServer
+
+
+        """
+        if self._owns_transport:
+            self.transport.close()
+
+    def __enter__(self) -> "MockServerFriendlyClient":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
 
     def clear(self, path: str) -> None:
         """
@@ -83,7 +285,7 @@ class MockServerFriendlyClient(object):
 
         :param path:
         """
-        self.expectations = []
+        self.clear_expectations()
         self._call("clear", json.dumps({"path": path}))
 
     def reset(self) -> None:
@@ -91,9 +293,20 @@ class MockServerFriendlyClient(object):
         Clear all data in the MockServer
 
         """
-        self.expectations = []
+        self.clear_expectations()
         self._call("reset")
 
+    def clear_expectations(self) -> None:
+        """
+        Forgets the expectations created so far, e.g. when the mock server is cleared.  Expectations still
+        waiting to be sent by batch_expectations() are dropped
+
+
+        """
+        self.expectations = []
+        self._pending_expectations = []
+        self._expectation_index = ExpectationIndex()
+
     def stub(
         self,
         *,
@@ -114,25 +327,76 @@ class MockServerFriendlyClient(object):
         self._call(
             "expectation",
             json.dumps(
-                _non_null_options_to_dict(
-                    _Option("httpRequest", request),
-                    _Option("httpResponse", response),
-                    _Option("times", (timing or _Timing()).for_expectation()),
-                    _Option("timeToLive", time_to_live, formatter=_to_time_to_live),
+                _expectation_to_dict(
+                    request=request,
+                    response=response,
+                    timing=timing,
+                    time_to_live=time_to_live,
                 )
             ),
         )
 
+    def stub_many(self, *, expectations: List[Dict[str, Any]]) -> None:
+        """
+        Create multiple expectations in mock server with a single call
+
+
+        :param expectations: list of expectations as created by _expectation_to_dict()
+        """
+        if not expectations:
+            return
+        self._call("expectation", json.dumps(expectations))
+
+    @contextmanager
+    def batch_expectations(self, batch_size: Optional[int] = None) -> Iterator[None]:
+        """
+        Context manager that batches all calls to expect() made inside it.  Expectations are
+        sent to the mock server in chunks of batch_size and any remainder is sent on exit.
+        Batches can be nested; only the outermost one flushes on exit.
+        If the block raises, the expectations still waiting are dropped instead of sent.
+
+
+        :param batch_size: number of expectations to send in one call
+        """
+        if self._batch_depth == 0:
+            self._batch_size = batch_size or self.DEFAULT_BATCH_SIZE
+        self._batch_depth += 1
+        try:
+            yield
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending_expectations:
+                # don't send a partial batch, or hide the error with one from sending it
+                self.logger.warning(
+                    f"Dropped {len(self._pending_expectations)} batched expectations that were not sent"
+                    " because of an error"
+                )
+                self._pending_expectations = []
+            raise
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self.flush_expectations()
+
+    def flush_expectations(self) -> None:
+        """
+        Sends any expectations batched by batch_expectations() to the mock server
+
+
+        """
+        pending: List[Dict[str, Any]] = self._pending_expectations
+        self._pending_expectations = []
+        self.stub_many(expectations=pending)
+
     def replace_timestamp_with_ignore(
         self, json_data: Union[Dict[str, Any], List[Any]]
     ) -> Union[Dict[str, Any], List[Any]]:
         """
-        replace the value of a field named `timestamp` with `${json-unit.ignore}` so that mockserver will
-        ignore the value when doing a match
+        replace the value of a field named `timestamp` (or any of ignored_field_names) with `${json-unit.ignore}`
+        so that mockserver will ignore the value when doing a match
         """
         if isinstance(json_data, dict):
             for key, value in json_data.items():
-                if key == "timestamp" and isinstance(value, str):
+                if key in self.ignored_field_names and isinstance(value, str):
                     json_data[key] = "${json-unit.ignore}"
                 elif isinstance(value, (dict, list)):
                     self.replace_timestamp_with_ignore(value)
@@ -160,16 +424,248 @@ class MockServerFriendlyClient(object):
         :param time_to_live:
         :param file_path: file path
         """
+        payload: Optional[Dict[str, Any]] = self.prepare_expectation(
+            request=request,
+            response=response,
+            timing=timing,
+            time_to_live=time_to_live,
+            file_path=file_path,
+            pending_expectations=(
+                self._pending_expectations if self._batch_depth > 0 else None
+            ),
+        )
+        if payload is not None:
+            self._register_expectation(payload)
+
+    def prepare_expectation(
+        self,
+        *,
+        request: Dict[str, Any],
+        response: Dict[str, Any],
+        timing: _Timing,
+        time_to_live: Any = None,
+        file_path: Optional[str] = None,
+        pending_expectations: Optional[List[Dict[str, Any]]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Adds the expectation to expectations, applying ignore_timestamp_field and duplicate_expectations, and
+        returns the payload to send to the mock server.  Shared by expect() and AsyncMockServerClient.
+
+
+        :param request: mock request
+        :param response: mock response
+        :param timing: how many times to expect the request
+        :param time_to_live:
+        :param file_path: file path
+        :param pending_expectations: payloads waiting to be sent that the caller appends the payload to, if the
+                                    expectation is not sent right away
+        :return: payload to send or None if the expectation was merged into one still in pending_expectations
+        """
         # if timestamp values are being ignored then replace the timestamp value with the json-unit ignore string
         if self.ignore_timestamp_field:
             request = self.replace_timestamp_with_ignore(request)  # type: ignore[assignment]
+        return self._prepare_expectation_payload(
+            payload=_expectation_to_dict(
+                request=request,
+                response=response,
+                timing=timing,
+                time_to_live=time_to_live,
+            ),
+            request=request,
+            response=response,
+            timing=timing,
+            time_to_live=time_to_live,
+            file_path=file_path,
+            pending_expectations=pending_expectations,
+        )
 
-        self.stub(
+    def _prepare_expectation_payload(
+        self,
+        *,
+        payload: Dict[str, Any],
+        request: Dict[str, Any],
+        response: Dict[str, Any],
+        timing: _Timing,
+        time_to_live: Any,
+        file_path: Optional[str],
+        pending_expectations: Optional[List[Dict[str, Any]]],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Adds the expectation unless it is a duplicate merged into an earlier one (see prepare_expectation)
+        """
+        if self.duplicate_expectations is DuplicateExpectationPolicy.ALLOW:
+            self._add_expectation(
+                request=request, response=response, timing=timing, file_path=file_path
+            )
+            return payload
+        key: Hashable
+        earlier: Optional[IndexedExpectation]
+        key, earlier = self._find_duplicate_expectation(
+            request=request, file_path=file_path
+        )
+        if earlier is not None and self._merge_duplicate_expectation(
+            earlier=earlier,
             request=request,
             response=response,
             timing=timing,
             time_to_live=time_to_live,
+            file_path=file_path,
+        ):
+            if pending_expectations is not None and self._update_pending_times(
+                earlier=earlier, pending_expectations=pending_expectations
+            ):
+                return None
+            # the earlier expectation was already sent so the mock server gets the duplicate on its own
+            return payload
+        self._add_expectation(
+            request=request, response=response, timing=timing, file_path=file_path
+        )
+        self._index_expectation(
+            key=key,
+            time_to_live=time_to_live,
+            payload=payload if pending_expectations is not None else None,
+            pending_expectations=pending_expectations,
+        )
+        return payload
+
+    def _find_duplicate_expectation(
+        self, *, request: Dict[str, Any], file_path: Optional[str]
+    ) -> Tuple[Hashable, Optional[IndexedExpectation]]:
+        """
+        Returns the key of the expectation in the expectation index and the earlier expectation with the same key
+        """
+        key: Hashable = ExpectationIndex.get_key(
+            MockRequest(
+                request=request, index=len(self.expectations), file_path=file_path
+            )
+        )
+        return key, self.get_expectation_index().find(key)
+
+    def _index_expectation(
+        self,
+        *,
+        key: Hashable,
+        time_to_live: Any,
+        payload: Optional[Dict[str, Any]] = None,
+        pending_expectations: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Adds the expectation that was just added to expectations to the expectation index
+        """
+        self._expectation_index.add(
+            IndexedExpectation(
+                expectation=self.expectations[-1],
+                time_to_live=time_to_live,
+                payload=payload,
+                pending_expectations=pending_expectations,
+            ),
+            key=key,
         )
+
+    def _merge_duplicate_expectation(
+        self,
+        *,
+        earlier: IndexedExpectation,
+        request: Dict[str, Any],
+        response: Dict[str, Any],
+        timing: _Timing,
+        time_to_live: Any,
+        file_path: Optional[str],
+    ) -> bool:
+        """
+        Merges a duplicate into the earlier expectation by adding their times if duplicate_expectations is MERGE.
+        Only expectations with the same response, a limited number of times and no time to live are merged.
+        A duplicate that is not merged is logged as a warning.  The caller still has to send a merged
+        duplicate to the mock server unless the earlier expectation has not been sent yet (see
+        _update_pending_times)
+
+
+        :return: whether the duplicate was merged
+        """
+        expectation: MockExpectation = earlier.expectation
+        if (
+            self.duplicate_expectations is not DuplicateExpectationPolicy.MERGE
+            or not timing.count
+            or not expectation.timing.count
+            or time_to_live is not None
+            or earlier.time_to_live is not None
+            or response != expectation.response
+        ):
+            self.logger.warning(
+                f"Expectation from {file_path} duplicates expectation {expectation.request.index}"
+                f" from {expectation.request.file_path}: {expectation.request}"
+            )
+            return False
+        expectation.timing = _Timing(expectation.timing.count + timing.count)
+        expectation.occurrences += 1
+        self.logger.debug(
+            f"Merged expectation from {file_path} into expectation {expectation.request.index}"
+        )
+        self.request_logger.log_request(
+            file_path=file_path,
+            base_url=self.base_url,
+            request=request,
+            response=response,
+        )
+        return True
+
+    @staticmethod
+    def _update_pending_times(
+        *,
+        earlier: IndexedExpectation,
+        pending_expectations: List[Dict[str, Any]],
+    ) -> bool:
+        """
+        Updates the times of the earlier expectation if it is still waiting to be sent in pending_expectations
+
+
+        :return: whether the earlier expectation was still waiting
+        """
+        if (
+            earlier.payload is None
+            or earlier.pending_expectations is not pending_expectations
+        ):
+            return False
+        earlier.payload["times"] = earlier.expectation.timing.for_expectation()
+        return True
+
+    def get_expectation_index(self) -> ExpectationIndex:
+        """
+        Returns the expectations keyed by method, path, query string, headers and body e.g. to list the
+        duplicate or shadowed expectations
+
+
+        """
+        # expectations registered without looking for duplicates are indexed when first needed
+        for expectation in self.expectations[len(self._expectation_index) :]:
+            self._expectation_index.add(IndexedExpectation(expectation=expectation))
+        return self._expectation_index
+
+    def get_expectations_to_match(self) -> List[MockExpectation]:
+        """
+        Returns the expectations to match to the recorded requests.  A merged expectation is repeated once
+        for each of the expectations merged into it since each is made by its own request
+
+
+        """
+        return [
+            expectation
+            for expectation in self.expectations
+            for _ in range(expectation.occurrences)
+        ]
+
+    def _add_expectation(
+        self,
+        *,
+        request: Dict[str, Any],
+        response: Dict[str, Any],
+        timing: _Timing,
+        file_path: Optional[str],
+    ) -> None:
+        """
+        Records an expectation that was sent to the mock server so it can be verified later
+        """
+        self.instrumentation.count(EXPECTATIONS)
         self.expectations.append(
             MockExpectation(
                 request=request,
@@ -179,13 +675,76 @@ class MockServerFriendlyClient(object):
                 file_path=file_path,
             )
         )
-        MockRequestLogger.log(
+        self.request_logger.log_request(
             file_path=file_path,
             base_url=self.base_url,
             request=request,
             response=response,
         )
 
+    def _register_expectation(self, payload: Dict[str, Any]) -> None:
+        """
+        Sends the expectation to the mock server or queues it if we are inside batch_expectations()
+        """
+        if self._batch_depth > 0:
+            self._pending_expectations.append(payload)
+            if len(self._pending_expectations) >= self._batch_size:
+                self.flush_expectations()
+        else:
+            self._call("expectation", json.dumps(payload))
+
+    def expect_many(
+        self,
+        *,
+        expectations: Iterable[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+    ) -> None:
+        """
+        Expect many mock requests, sending them to the mock server in batches
+
+
+        :param expectations: keyword arguments for expect() for each expectation,
+                                e.g. {"request": ..., "response": ..., "timing": ..., "file_path": ...}
+        :param batch_size: number of expectations to send in one call
+        """
+        with self.batch_expectations(batch_size=batch_size):
+            for expectation in expectations:
+                self.expect(**expectation)
+
+    def expect_compiled(
+        self,
+        *,
+        expectations: List[Dict[str, Any]],
+        file_paths: List[Optional[str]],
+    ) -> None:
+        """
+        Expect already compiled expectations (e.g. from an ExpectationSnapshot), sending them all
+        to the mock server with a single call.  Duplicates are handled as in expect() (see duplicate_expectations)
+
+
+        :param expectations: list of expectations as created by _expectation_to_dict()
+        :param file_paths: file path of each expectation
+        """
+        assert len(expectations) == len(file_paths)
+        # keep the expectations in order with any that are waiting in batch_expectations()
+        if self._pending_expectations:
+            self.flush_expectations()
+        payloads: List[Dict[str, Any]] = []
+        for expectation, file_path in zip(expectations, file_paths):
+            payload: Optional[Dict[str, Any]] = self._prepare_expectation_payload(
+                # merging a duplicate changes the times of the payload so the snapshot is not changed
+                payload=dict(expectation),
+                request=expectation["httpRequest"],
+                response=expectation.get("httpResponse") or {},
+                timing=_Timing(expectation.get("times", {}).get("remainingTimes")),
+                time_to_live=expectation.get("timeToLive"),
+                file_path=file_path,
+                pending_expectations=payloads,
+            )
+            if payload is not None:
+                payloads.append(payload)
+        self.stub_many(expectations=payloads)
+
     def expect_files_as_requests(
         self,
         folder: Path,
@@ -207,43 +766,43 @@ class MockServerFriendlyClient(object):
         files: List[str] = sorted(
             glob.glob(str(folder.joinpath("**/*.json")), recursive=True)
         )
-        for file_path in files:
-            file_name = os.path.basename(file_path)
-            with open(file_path, "r") as file:
-                content = json.loads(file.read())
-
-                try:
-                    request_parameters = content["request_parameters"]
-                except ValueError:
-                    raise Exception(
-                        "`request_parameters` key not found! It is supposed to contain parameters of the request function."
-                    )
+        with self.batch_expectations():
+            for file_path in files:
+                file_name = os.path.basename(file_path)
+                with open(file_path, "r") as file:
+                    content = json.loads(file.read())
+
+                    try:
+                        request_parameters = content["request_parameters"]
+                    except ValueError:
+                        raise Exception(
+                            "`request_parameters` key not found! It is supposed to contain parameters of the request function."
+                        )
 
-                path = f"{('/' + url_prefix) if url_prefix else ''}"
-                path = (
-                    f"{path}/{os.path.splitext(file_name)[0]}"
-                    if add_file_name
-                    else path
-                )
+                    path = f"{('/' + url_prefix) if url_prefix else ''}"
+                    path = (
+                        f"{path}/{os.path.splitext(file_name)[0]}"
+                        if add_file_name
+                        else path
+                    )
 
-                try:
-                    request_result = content["request_result"]
-                except ValueError:
-                    raise Exception(
-                        "`request_result` key not found. It is supposed to contain the expected result of the request function."
+                    try:
+                        request_result = content["request_result"]
+                    except ValueError:
+                        raise Exception(
+                            "`request_result` key not found. It is supposed to contain the expected result of the request function."
+                        )
+                    body = (
+                        json.dumps(request_result)
+                        if content_type == "application/fhir+json"
+                        else request_result
+                    )
+                    self.expect(
+                        request=mock_request(path=path, **request_parameters),
+                        response=mock_response(body=body),
+                        timing=times(1),
+                        file_path=file_path,
                     )
-                body = (
-                    json.dumps(request_result)
-                    if content_type == "application/fhir+json"
-                    else request_result
-                )
-                self.expect(
-                    request=mock_request(path=path, **request_parameters),
-                    response=mock_response(body=body),
-                    timing=times(1),
-                    file_path=file_path,
-                )
-                self.logger.info(f"Mocking {self.base_url}{path}: {request_parameters}")
         return files
 
     def expect_files_as_json_requests(
@@ -267,24 +826,24 @@ class MockServerFriendlyClient(object):
         files: List[str] = sorted(
             glob.glob(str(folder.joinpath("**/*.json")), recursive=True)
         )
-        for file_path in files:
-            file_name = os.path.basename(file_path)
-            with open(file_path, "r") as file:
-                content: Dict[str, Any] = json.loads(file.read())
-                path = (
-                    f"{path}/{os.path.splitext(file_name)[0]}"
-                    if add_file_name
-                    else path
-                )
-                self.expect(
-                    request=mock_request(
-                        path=path, body=json_equals([content]), method="POST"
-                    ),
-                    response=mock_response(body=json.dumps(json_response_body)),
-                    timing=times(1),
-                    file_path=file_path,
-                )
-                self.logger.info(f"Mocking {self.base_url}{path}")
+        with self.batch_expectations():
+            for file_path in files:
+                file_name = os.path.basename(file_path)
+                with open(file_path, "r") as file:
+                    content: Dict[str, Any] = json.loads(file.read())
+                    path = (
+                        f"{path}/{os.path.splitext(file_name)[0]}"
+                        if add_file_name
+                        else path
+                    )
+                    self.expect(
+                        request=mock_request(
+                            path=path, body=json_equals([content]), method="POST"
+                        ),
+                        response=mock_response(body=json.dumps(json_response_body)),
+                        timing=times(1),
+                        file_path=file_path,
+                    )
         return files
 
     def expect_default(
@@ -297,7 +856,9 @@ class MockServerFriendlyClient(object):
         """
         response: Dict[str, Any] = mock_response()
         timing: _Timing = times_any()
-        self.stub(request={}, response=response, timing=timing, time_to_live=None)
+        self._register_expectation(
+            _expectation_to_dict(request={}, response=response, timing=timing)
+        )
         self.expectations.append(
             MockExpectation(
                 {}, {}, timing, index=len(self.expectations), file_path="{catch all}"
@@ -308,6 +869,171 @@ class MockServerFriendlyClient(object):
         self,
         *,
         recorded_requests: List[MockRequest],
+        expectations: Optional[List[MockExpectation]] = None,
+    ) -> MatchRequestResult:
+        """
+        Matches recorded requests with expected requests (see _match_to_recorded_requests).
+        If verification_workers is set then the request bodies are compared in a process pool first.
+        The matching itself is always done in order so the result is the same as when comparing serially.
+
+
+        :param recorded_requests: list of requests actually made to the mock server
+        :param expectations: expectations to match.  Defaults to all the expectations
+        :return: list of match exceptions
+        """
+        if expectations is None:
+            expectations = self.get_expectations_to_match()
+        with (
+            self.instrumentation.span(
+                MATCH,
+                expectations=len(expectations),
+                recorded_requests=len(recorded_requests),
+            ),
+            self.instrumentation.activate(),
+        ):
+            self._json_differences = (
+                self.compare_request_bodies_in_parallel(
+                    recorded_requests=recorded_requests, expectations=expectations
+                )
+                if self.verification_workers
+                else {}
+            )
+            try:
+                return self._match_to_recorded_requests(
+                    recorded_requests=recorded_requests, expectations=expectations
+                )
+            finally:
+                self._json_differences = {}
+
+    def compare_request_bodies_in_parallel(
+        self,
+        *,
+        recorded_requests: List[MockRequest],
+        expectations: Optional[List[MockExpectation]] = None,
+    ) -> JsonDifferences:
+        """
+        Compares, in a process pool, the json bodies of the pairs of requests that matching is likely to compare:
+        each expectation with the recorded requests that match it on url (up to the first one with an identical
+        body) and the recorded requests that match each other on url.
+        Pairs that were not compared here are compared serially during matching.
+
+
+        :param recorded_requests: list of requests actually made to the mock server
+        :param expectations: expectations to compare.  Defaults to all the expectations
+        :return: differences keyed by the id() of both requests and whether timestamp fields were ignored
+        """
+        if expectations is None:
+            expectations = self.get_expectations_to_match()
+        index: MockRequestIndex = MockRequestIndex(recorded_requests)
+        ignore_timestamp_field: bool = bool(self.ignore_timestamp_field)
+        pairs: Dict[Tuple[int, int, bool], Tuple[MockRequest, MockRequest]] = {}
+
+        def add_pair(
+            request1: MockRequest, request2: MockRequest, ignore: bool
+        ) -> None:
+            if (
+                request1.json_list
+                and request2.json_list
+                and not request1.has_same_json_fingerprint(
+                    request2,
+                    ignore_timestamp_field=ignore,
+                    ignored_field_names=self.ignored_field_names,
+                )
+            ):
+                pairs.setdefault(
+                    (id(request1), id(request2), ignore), (request1, request2)
+                )
+
+        for expectation in expectations:
+            expected_request: MockRequest = expectation.request
+            if not expected_request.json_list:
+                continue
+            found_identical_body: bool = False
+            if expected_request.method:
+                for recorded_request in index.candidates_matching_url(expected_request):
+                    if not self.does_request_match(
+                        request1=expected_request,
+                        request2=recorded_request,
+                        check_body=False,
+                    ):
+                        continue
+                    if expected_request.has_same_json_fingerprint(
+                        recorded_request,
+                        ignore_timestamp_field=ignore_timestamp_field,
+                        ignored_field_names=self.ignored_field_names,
+                    ):
+                        found_identical_body = True
+                        break
+                    add_pair(expected_request, recorded_request, ignore_timestamp_field)
+            if not found_identical_body:
+                # when matching on url only, the body is compared with the first request matching on url or ids
+                for recorded_request in index.candidates_matching_url_or_ids(
+                    expected_request
+                ):
+                    if (
+                        expected_request.method
+                        and self.does_request_match(
+                            request1=expected_request,
+                            request2=recorded_request,
+                            check_body=False,
+                        )
+                    ) or (
+                        recorded_request.json_list is not None
+                        and self.does_id_in_request_match(
+                            request1=expected_request, request2=recorded_request
+                        )
+                    ):
+                        add_pair(
+                            expected_request, recorded_request, ignore_timestamp_field
+                        )
+                        break
+        # a matched request is compared with the unmatched requests with the same url
+        for recorded_request in recorded_requests:
+            for other_request in index.candidates_matching_url(recorded_request):
+                if other_request is not recorded_request and self.does_request_match(
+                    request1=other_request, request2=recorded_request, check_body=False
+                ):
+                    add_pair(other_request, recorded_request, False)
+                    if ignore_timestamp_field:
+                        add_pair(other_request, recorded_request, True)
+
+        keys: List[Tuple[int, int, bool]] = list(pairs)
+        if not keys:
+            return {}
+        self.instrumentation.count(PARALLEL_COMPARISONS, len(keys))
+        chunks: List[List[Tuple[Any, Any, bool]]] = [
+            [
+                (pairs[key][0].json_list, pairs[key][1].json_list, key[2])
+                for key in keys[i : i + self.verification_chunk_size]
+            ]
+            for i in range(0, len(keys), self.verification_chunk_size)
+        ]
+        self.logger.debug(
+            f"Comparing {len(keys)} request bodies in {len(chunks)} chunks"
+            f" with {self.verification_workers} workers"
+        )
+        with (
+            self.instrumentation.span(COMPARE_IN_PARALLEL, comparisons=len(keys)),
+            ProcessPoolExecutor(max_workers=self.verification_workers) as executor,
+        ):
+            results: List[Dict[str, Any]] = [
+                differences
+                for chunk_results in executor.map(
+                    partial(
+                        _compare_json_chunk,
+                        ignored_field_names=self.ignored_field_names,
+                    ),
+                    chunks,
+                )
+                for differences in chunk_results
+            ]
+        return dict(zip(keys, results))
+
+    def _match_to_recorded_requests(
+        self,
+        *,
+        recorded_requests: List[MockRequest],
+        expectations: Optional[List[MockExpectation]] = None,
     ) -> MatchRequestResult:
         """
         Matches recorded requests with expected requests
@@ -319,21 +1045,21 @@ class MockServerFriendlyClient(object):
 
 
         :param recorded_requests: list of requests actually made to the mock server
+        :param expectations: expectations to match.  Defaults to all the expectations
         :return: list of match exceptions
         """
+        if expectations is None:
+            expectations = self.get_expectations_to_match()
         exceptions: List[MockServerException] = []
         unmatched_expectation_requests: List[MockRequest] = []
-        unmatched_requests: List[MockRequest] = [r for r in recorded_requests]
-        expected_request: MockRequest
-        expectations_str = "\n".join([str(e) for e in self.expectations])
-        self.logger.debug(
-            f"\n-------- EXPECTATIONS --------\n{expectations_str}\n---------- END EXPECTATIONS --------"
-        )
-
-        requests_str: str = "\n".join([str(r) for r in recorded_requests])
-        self.logger.debug(
-            f"\n-------- REQUESTS --------\n{requests_str}\n-------- END REQUESTS --------"
+        # indexes so only requests with a matching method, path, query string or ids are compared
+        unmatched_requests: MockRequestIndex = MockRequestIndex(recorded_requests)
+        recorded_requests_not_matched_yet: MockRequestIndex = MockRequestIndex(
+            recorded_requests
         )
+        expected_request: MockRequest
+        self.match_reporter.dump(title="EXPECTATIONS", items=expectations)
+        self.match_reporter.dump(title="REQUESTS", items=recorded_requests)
 
         # get ids of all recorded requests
         recorded_request_ids: List[str] = []
@@ -348,18 +1074,16 @@ class MockServerFriendlyClient(object):
                     recorded_request_ids.append(j)
 
         matched_requests: List[MockRequest] = []
+        matched_expectations: List[MockRequest] = []
         self.logger.info("========= START MATCHING EXPECTATIONS  ================")
         # now try to match requests to expectations
-        for expectation in self.expectations:
+        for expectation in expectations:
             expected_request = expectation.request
             self.logger.info(
                 f"------- Expectation {expected_request.index}/{len(self.expectations) - 1} -------"
             )
-            self.logger.info(f"{expected_request}")
+            self.logger.info("%s", expected_request)
             matching_request: Optional[MockRequest] = None
-            recorded_requests_not_matched_yet: List[MockRequest] = [
-                r for r in recorded_requests if r not in matched_requests
-            ]
             try:
                 matching_request = self.find_matches_on_request_and_body(
                     expected_request=expected_request,
@@ -368,7 +1092,9 @@ class MockServerFriendlyClient(object):
                 )
                 if matching_request:
                     matched_requests.append(matching_request)
-                    self.logger.info(f"MATCHED (exact) to {matching_request}")
+                    matched_expectations.append(expected_request)
+                    recorded_requests_not_matched_yet.remove(matching_request)
+                    self.logger.info("MATCHED (exact) to %s", matching_request)
                 else:
                     matching_request = self.find_matches_on_request_url_only(
                         expected_request=expected_request,
@@ -377,7 +1103,9 @@ class MockServerFriendlyClient(object):
                     )
                     if matching_request:
                         matched_requests.append(matching_request)
-                        self.logger.info(f"MATCHED (url only) to {matching_request}")
+                        matched_expectations.append(expected_request)
+                        recorded_requests_not_matched_yet.remove(matching_request)
+                        self.logger.info("MATCHED (url only) to %s", matching_request)
                     else:
                         self.logger.info(f"NO {matching_request}")
             except MockServerJsonContentMismatchException as e:
@@ -385,7 +1113,7 @@ class MockServerFriendlyClient(object):
             if not matching_request and expected_request.method:
                 unmatched_expectation_requests.append(expected_request)
                 self.logger.info("---- EXPECTATION NOT MATCHED ----")
-                self.logger.info(f"{expected_request}")
+                self.logger.info("%s", expected_request)
                 self.logger.info("IDs sent in requests")
                 self.logger.info(f"{','.join(recorded_request_ids)}")
                 self.logger.info("---- END EXPECTATION NOT MATCHED ----")
@@ -414,15 +1142,17 @@ class MockServerFriendlyClient(object):
                 )
             )
         return MatchRequestResult(
-            exceptions=exceptions, found_expectations=matched_requests
+            exceptions=exceptions,
+            found_expectations=matched_requests,
+            matched_expectations=matched_expectations,
         )
 
     def find_matches_on_request_url_only(
         self,
         *,
         expected_request: MockRequest,
-        recorded_requests: List[MockRequest],
-        unmatched_requests: List[MockRequest],
+        recorded_requests: MockRequestIndex,
+        unmatched_requests: MockRequestIndex,
     ) -> Optional[MockRequest]:
         """
         Finds matches on url only and then compares the bodies.  Returns if match was found.
@@ -430,13 +1160,15 @@ class MockServerFriendlyClient(object):
 
 
         :param expected_request: request that was expected
-        :param recorded_requests: list of all requests made
-        :param unmatched_requests: list of requests that have not been matched to an expectation
+        :param recorded_requests: requests made that have not been matched to an expectation yet
+        :param unmatched_requests: requests that have not been matched to an expectation
         :return: whether a matching expectation was found
         """
         matched_request: Optional[MockRequest] = None
         recorded_request: MockRequest
-        for recorded_request in recorded_requests:
+        for recorded_request in recorded_requests.candidates_matching_url_or_ids(
+            expected_request
+        ):
             matched_request = self.does_request_match_on_url_only(
                 expected_request=expected_request,
                 recorded_request=recorded_request,
@@ -451,7 +1183,7 @@ class MockServerFriendlyClient(object):
         *,
         expected_request: MockRequest,
         recorded_request: MockRequest,
-        unmatched_requests: List[MockRequest],
+        unmatched_requests: MockRequestIndex,
     ) -> Optional[MockRequest]:
         """
         Checks if the two requests match on url only
@@ -485,12 +1217,14 @@ class MockServerFriendlyClient(object):
             # remove request from unmatched_requests
             unmatched_request_list = [
                 r
-                for r in unmatched_requests
+                for r in unmatched_requests.candidates_matching_url(recorded_request)
                 if self.does_request_match(
                     request1=r,
                     request2=recorded_request,
                     check_body=True,
                     ignore_timestamp_field=self.ignore_timestamp_field,
+                    ignored_field_names=self.ignored_field_names,
+                    json_differences=self._json_differences,
                 )
             ]
             if expected_request.json_list:
@@ -506,11 +1240,26 @@ class MockServerFriendlyClient(object):
                 )
                 if len(unmatched_request_list) > 0:
                     unmatched_requests.remove(unmatched_request_list[0])
+                if expected_request.has_same_json_fingerprint(
+                    recorded_request,
+                    ignore_timestamp_field=self.ignore_timestamp_field,
+                    ignored_field_names=self.ignored_field_names,
+                ):
+                    self.instrumentation.count(FINGERPRINT_HITS)
+                    return matched_request
                 self.compare_request_bodies_json(
                     request=recorded_request,
                     actual_json=actual_body_json,
                     expected_json=expected_body_json,
                     ignore_timestamp_field=self.ignore_timestamp_field,
+                    ignored_field_names=self.ignored_field_names,
+                    differences=self._json_differences.get(
+                        (
+                            id(expected_request),
+                            id(recorded_request),
+                            bool(self.ignore_timestamp_field),
+                        )
+                    ),
                     expected_file_path=(
                         Path(expected_request.file_path)
                         if expected_request.file_path
@@ -537,21 +1286,23 @@ class MockServerFriendlyClient(object):
         self,
         *,
         expected_request: MockRequest,
-        recorded_requests: List[MockRequest],
-        unmatched_requests: List[MockRequest],
+        recorded_requests: MockRequestIndex,
+        unmatched_requests: MockRequestIndex,
     ) -> Optional[MockRequest]:
         """
         Matches on both request and body and returns whether it was able to find a match
 
 
         :param expected_request: request that was expected
-        :param recorded_requests: list of all requests made
-        :param unmatched_requests: list of requests that have not been matched to an expectation
+        :param recorded_requests: requests made that have not been matched to an expectation yet
+        :param unmatched_requests: requests that have not been matched to an expectation
         :return: whether a matching expectation was found
         """
         # first try to find all exact matches on both request url and body
         matching_request: Optional[MockRequest] = None
-        for recorded_request in recorded_requests:
+        for recorded_request in recorded_requests.candidates_matching_url(
+            expected_request
+        ):
             matching_request = self.does_request_match_on_url_and_body(
                 expected_request=expected_request,
                 recorded_request=recorded_request,
@@ -567,10 +1318,10 @@ class MockServerFriendlyClient(object):
         *,
         expected_request: MockRequest,
         recorded_request: MockRequest,
-        unmatched_requests: List[MockRequest],
+        unmatched_requests: MockRequestIndex,
     ) -> Optional[MockRequest]:
         """
-        Returns the request if it matches and removes it from the unmatched_requests list
+        Returns the request if it matches and removes it from the unmatched_requests
 
 
         """
@@ -581,14 +1332,19 @@ class MockServerFriendlyClient(object):
             request2=recorded_request,
             check_body=True,
             ignore_timestamp_field=self.ignore_timestamp_field,
+            ignored_field_names=self.ignored_field_names,
+            json_differences=self._json_differences,
         ):
             matching_request = recorded_request
             # remove request from unmatched_requests
             unmatched_request_list = [
                 r
-                for r in unmatched_requests
+                for r in unmatched_requests.candidates_matching_url(recorded_request)
                 if self.does_request_match(
-                    request1=r, request2=recorded_request, check_body=True
+                    request1=r,
+                    request2=recorded_request,
+                    check_body=True,
+                    json_differences=self._json_differences,
                 )
             ]
             assert len(unmatched_request_list) >= 0, (
@@ -606,6 +1362,8 @@ class MockServerFriendlyClient(object):
         request2: MockRequest,
         check_body: bool,
         ignore_timestamp_field: Optional[bool] = False,
+        ignored_field_names: Optional[Collection[str]] = None,
+        json_differences: Optional[JsonDifferences] = None,
     ) -> bool:
         """
         Does request1 match request2
@@ -614,23 +1372,16 @@ class MockServerFriendlyClient(object):
         :param request2: request 2
         :param check_body: whether to match the body or not
         :param ignore_timestamp_field: whether to ignore timestamp field in a request body
+        :param ignored_field_names: names of the fields ignored by ignore_timestamp_field.  Defaults to ['timestamp']
+        :param json_differences: differences between request bodies that were already compared
         :return: whether the two requests match
         """
         if request1.method != request2.method:
             return False
         if request1.path != request2.path:
             return False
-        request1_query_string: Optional[Dict[str, Any]] = (
-            MockServerFriendlyClient.normalize_querystring_params(
-                querystring_params=request1.querystring_params
-            )
-        )
-        request2_query_string: Optional[Dict[str, Any]] = (
-            MockServerFriendlyClient.normalize_querystring_params(
-                querystring_params=request2.querystring_params
-            )
-        )
-        if request1_query_string != request2_query_string:
+        # normalized when the requests were created
+        if request1.querystring_key != request2.querystring_key:
             return False
         if (
             request1.json_list is not None
@@ -644,6 +1395,8 @@ class MockServerFriendlyClient(object):
             request1=request1,
             request2=request2,
             ignore_timestamp_field=ignore_timestamp_field,
+            ignored_field_names=ignored_field_names,
+            json_differences=json_differences,
         ):
             return False
         return True
@@ -654,6 +1407,8 @@ class MockServerFriendlyClient(object):
         request1: MockRequest,
         request2: MockRequest,
         ignore_timestamp_field: Optional[bool] = False,
+        ignored_field_names: Optional[Collection[str]] = None,
+        json_differences: Optional[JsonDifferences] = None,
     ) -> bool:
         """
         Does the body of the two specified requests match
@@ -661,6 +1416,8 @@ class MockServerFriendlyClient(object):
         :param request1: request 1
         :param request2: request 2
         :param ignore_timestamp_field: whether to ignore timestamp field in a request body
+        :param ignored_field_names: names of the fields ignored by ignore_timestamp_field.  Defaults to ['timestamp']
+        :param json_differences: differences between request bodies that were already compared
         :return: whether the body of the two specified requests match
         :rtype:
         """
@@ -671,12 +1428,36 @@ class MockServerFriendlyClient(object):
         if request2.body_list and not request1.body_list:
             return False
         if request1.json_list and request2.json_list:
+            # identical bodies don't need a full comparison
+            instrumentation: Optional[ClientInstrumentation] = (
+                get_active_instrumentation()
+            )
+            if request1.has_same_json_fingerprint(
+                request2,
+                ignore_timestamp_field=ignore_timestamp_field,
+                ignored_field_names=ignored_field_names,
+            ):
+                if instrumentation is not None:
+                    instrumentation.count(FINGERPRINT_HITS)
+                return True
             # now compare non bundle resources
+            differences: Optional[Dict[str, Any]] = (
+                json_differences.get(
+                    (id(request1), id(request2), bool(ignore_timestamp_field))
+                )
+                if json_differences
+                else None
+            )
+            if differences is not None and instrumentation is not None:
+                instrumentation.count(PRECOMPUTED_DIFFERENCE_HITS)
             comparison_results = list(
-                MockServerFriendlyClient.compare_dicts(
+                differences
+                if differences is not None
+                else MockServerFriendlyClient.compare_dicts(
                     dict_1=request1.json_list,
                     dict_2=request2.json_list,
                     ignore_timestamp_field=ignore_timestamp_field,
+                    ignored_field_names=ignored_field_names,
                 )
             )
             return True if len(comparison_results) == 0 else False
@@ -808,7 +1589,9 @@ class MockServerFriendlyClient(object):
         actual_json: Optional[List[Dict[str, Any]]],
         expected_json: Optional[List[Dict[str, Any]]],
         ignore_timestamp_field: Optional[bool] = False,
+        ignored_field_names: Optional[Collection[str]] = None,
         expected_file_path: Optional[Path],
+        differences: Optional[Dict[str, Any]] = None,
     ) -> None:
         """
         Compares the JSON bodies of the two requests and raises an exception with detailed diff if they don't match
@@ -817,15 +1600,19 @@ class MockServerFriendlyClient(object):
         :param actual_json: json of actual request
         :param expected_json: json of expected request
         :param ignore_timestamp_field: if True any timestamp fields in the request body will be ignored in the comparison
+        :param ignored_field_names: names of the fields ignored by ignore_timestamp_field.  Defaults to ['timestamp']
         :param expected_file_path: expected file path
+        :param differences: differences between the two bodies if they were already compared
         """
         # DeepDiff returns a dict with the differences
         difference_list: List[str] = []
-        differences = MockServerFriendlyClient.compare_dicts(
-            dict_1=expected_json,
-            dict_2=actual_json,
-            ignore_timestamp_field=ignore_timestamp_field,
-        )
+        if differences is None:
+            differences = MockServerFriendlyClient.compare_dicts(
+                dict_1=expected_json,
+                dict_2=actual_json,
+                ignore_timestamp_field=ignore_timestamp_field,
+                ignored_field_names=ignored_field_names,
+            )
         if differences.keys():
             difference_list = (
                 MockServerFriendlyClient._deep_diff_diff_dict_to_string_list(
@@ -848,31 +1635,56 @@ class MockServerFriendlyClient(object):
         dict_1: Optional[List[Dict[str, Any]]],
         dict_2: Optional[List[Dict[str, Any]]],
         ignore_timestamp_field: Optional[bool] = False,
+        ignored_field_names: Optional[Collection[str]] = None,
     ) -> Dict[str, Any]:
-        if ignore_timestamp_field:
-            comparison_results = DeepDiff(
-                dict_1,
-                dict_2,
-                ignore_order=True,
-                exclude_regex_paths=[r".*\['timestamp'\]"],
-            )
+        """
+        Compares the two json bodies ignoring the order of list items.  Returns the differences in DeepDiff format.
 
-            # do the delta without ignoring anything to ensure the ignored fields are present in the body
-            diff_result = Delta(DeepDiff(dict_1, dict_2))
-            diff_dict = diff_result.diff
-            if (
-                diff_dict.get("dictionary_item_added")
-                or diff_dict.get("dictionary_item_removed")
-                or diff_dict.get("iterable_item_added")
-                or diff_dict.get("iterable_item_removed")
-            ):
-                # we only want to know structural changes and not value changes so only add those to the comparison results
-                diff_dict.pop("values_changed")
-                comparison_results.update(diff_dict)
-        else:
-            comparison_results = DeepDiff(dict_1, dict_2, ignore_order=True)
+        If ignore_timestamp_field is set then the values of fields in ignored_field_names (default: `timestamp`)
+        are ignored but the fields still have to be present in both bodies.
+
+
+        :param dict_1: expected json
+        :param dict_2: actual json
+        :param ignore_timestamp_field: whether to ignore the values of the ignored fields
+        :param ignored_field_names: names of the fields to ignore.  Defaults to ['timestamp']
+        :return: differences
+        """
+        instrumentation: Optional[ClientInstrumentation] = get_active_instrumentation()
+        if instrumentation is None:
+            return MockServerFriendlyClient._compare_dicts(
+                dict_1=dict_1,
+                dict_2=dict_2,
+                ignore_timestamp_field=ignore_timestamp_field,
+                ignored_field_names=ignored_field_names,
+            )
+        instrumentation.count(BODY_COMPARISONS)
+        if not ignore_timestamp_field:
+            instrumentation.count(DEEP_DIFF_INVOCATIONS)
+        with instrumentation.span(
+            COMPARE_DICTS, ignore_timestamp_field=bool(ignore_timestamp_field)
+        ):
+            return MockServerFriendlyClient._compare_dicts(
+                dict_1=dict_1,
+                dict_2=dict_2,
+                ignore_timestamp_field=ignore_timestamp_field,
+                ignored_field_names=ignored_field_names,
+            )
 
-        return dict(comparison_results)
+    @staticmethod
+    def _compare_dicts(
+        *,
+        dict_1: Optional[List[Dict[str, Any]]],
+        dict_2: Optional[List[Dict[str, Any]]],
+        ignore_timestamp_field: Optional[bool],
+        ignored_field_names: Optional[Collection[str]],
+    ) -> Dict[str, Any]:
+        if ignore_timestamp_field:
+            # walks both bodies once instead of running DeepDiff with and without the excluded fields
+            return diff_json_ignoring_fields(
+                dict_1, dict_2, ignored_field_names=ignored_field_names
+            )
+        return dict(DeepDiff(dict_1, dict_2, ignore_order=True))
 
     @staticmethod
     def _deep_diff_diff_dict_to_string_list(*, difference: Dict[str, Any]) -> List[str]:
@@ -901,7 +1713,11 @@ class MockServerFriendlyClient(object):
         return diff_list
 
     def verify_expectations(
-        self, *, test_name: Optional[str] = None, files: Optional[List[str]] = None
+        self,
+        *,
+        test_name: Optional[str] = None,
+        files: Optional[List[str]] = None,
+        method: Optional[str] = None,
     ) -> None:
         """
         Verify that the requests made match the expectations.  Raises exceptions if there are mismatches
@@ -909,38 +1725,241 @@ class MockServerFriendlyClient(object):
 
         :param test_name: Name of test
         :param files: files to create expectations
+        :param method: if set, only the requests with this method are verified
         """
-        recorded_requests: List[MockRequest] = self.retrieve_requests()
-        recorded_request_responses: List[MockRequestResponse] = (
-            self.retrieve_request_responses()
+        with self.instrumentation.span(VERIFY, test_name=test_name):
+            recorded_requests: List[MockRequest]
+            recorded_request_responses: List[MockRequestResponse]
+            recorded_requests, recorded_request_responses = (
+                self.retrieve_requests_and_request_responses(
+                    request_filter=self.get_retrieve_request_filter(
+                        test_name=test_name, method=method
+                    )
+                )
+            )
+            self.verify_recorded_requests(
+                recorded_requests=recorded_requests,
+                recorded_request_responses=recorded_request_responses,
+                test_name=test_name,
+                files=files,
+                method=method,
+            )
+
+    def get_retrieve_request_filter(
+        self, *, test_name: Optional[str], method: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Returns the request matcher sent to /retrieve by verify_expectations()
+
+
+        :param test_name: Name of test
+        :param method: if set, only the requests with this method are retrieved
+        :return: request matcher or None if all the requests are retrieved
+        """
+        # log_all_requests_to_folder gets all the requests so the folder can be replayed as before
+        if (
+            not self.filter_retrieved_requests_on_server
+            or self.log_all_requests_to_folder
+        ):
+            return None
+        return get_retrieve_request_filter(
+            test_name=test_name,
+            method=method,
+            path_match_strategy=self.path_match_strategy,
         )
+
+    def verify_recorded_requests(
+        self,
+        *,
+        recorded_requests: List[MockRequest],
+        recorded_request_responses: List[MockRequestResponse],
+        test_name: Optional[str] = None,
+        files: Optional[List[str]] = None,
+        method: Optional[str] = None,
+    ) -> None:
+        """
+        Verify that the already retrieved requests match the expectations.  Raises exceptions if there are mismatches
+
+
+        :param recorded_requests: requests retrieved from the mock server
+        :param recorded_request_responses: request/responses retrieved from the mock server
+        :param test_name: Name of test
+        :param files: files to create expectations
+        :param method: if set, only the requests with this method are verified
+        """
         self.logger.debug(f"Count of retrieved requests: {len(recorded_requests)}")
         if self.log_all_requests_to_folder:
             self.write_all_requests_to_folder(
                 request_responses=recorded_request_responses
             )
-        self.logger.debug("-------- All Retrieved Requests -----")
-        for recorded_request in recorded_requests:
-            self.logger.debug(f"{recorded_request}")
-        self.logger.debug("-------- End All Retrieved Requests -----")
+        # printing a request parses its body so the reporter only does it if the dump will be written
+        self.match_reporter.dump(
+            title="ALL RETRIEVED REQUESTS", items=recorded_requests
+        )
         # now filter to the requests for this test only
+        recorded_requests = self._filter_recorded_requests(
+            recorded_requests=recorded_requests, test_name=test_name, method=method
+        )
+        match_result: MatchRequestResult = self.match_to_recorded_requests(
+            recorded_requests=recorded_requests
+        )
+        self._raise_match_exceptions(
+            exceptions=match_result.exceptions,
+            found_expectations=match_result.found_expectations,
+            files=files,
+        )
+
+    def verify_expectations_since_checkpoint(
+        self,
+        *,
+        checkpoint: VerificationCheckpoint,
+        files: Optional[List[str]] = None,
+        verify_all_expectations: bool = False,
+    ) -> None:
+        """
+        Verify only the requests made since the previous verification with this checkpoint, against the
+        expectations that have not been matched yet.  Raises exceptions if there are mismatches or requests
+        without an expectation.  The checkpoint is advanced even if an exception is raised.
+
+        The MockServer has no cursor so all the requests for the test are still retrieved, but only the new
+        ones are matched.
+
+
+        :param checkpoint: remembers the requests and expectations already verified
+        :param files: files to create expectations
+        :param verify_all_expectations: if True then expectations that have still not been matched are
+                                        reported as missing.  Set on the last verification of a test
+        """
+        with self.instrumentation.span(
+            VERIFY, test_name=checkpoint.test_name, checkpoint=True
+        ):
+            recorded_requests: List[MockRequest]
+            recorded_request_responses: List[MockRequestResponse]
+            recorded_requests, recorded_request_responses = (
+                self.retrieve_requests_and_request_responses(
+                    request_filter=self.get_retrieve_request_filter(
+                        test_name=checkpoint.test_name, method=checkpoint.method
+                    )
+                )
+            )
+            self.verify_recorded_requests_since_checkpoint(
+                checkpoint=checkpoint,
+                recorded_requests=recorded_requests,
+                recorded_request_responses=recorded_request_responses,
+                files=files,
+                verify_all_expectations=verify_all_expectations,
+            )
+
+    def verify_recorded_requests_since_checkpoint(
+        self,
+        *,
+        checkpoint: VerificationCheckpoint,
+        recorded_requests: List[MockRequest],
+        recorded_request_responses: List[MockRequestResponse],
+        files: Optional[List[str]] = None,
+        verify_all_expectations: bool = False,
+    ) -> None:
+        """
+        Verify the already retrieved requests that were made since the previous verification with this
+        checkpoint (see verify_expectations_since_checkpoint)
+
+
+        :param checkpoint: remembers the requests and expectations already verified
+        :param recorded_requests: all the requests retrieved from the mock server
+        :param recorded_request_responses: all the request/responses retrieved from the mock server
+        :param files: files to create expectations
+        :param verify_all_expectations: if True then expectations that have still not been matched are
+                                        reported as missing
+        """
+        # the requests were cleared on the mock server so they are all new
+        first_index: int = (
+            checkpoint.request_count
+            if checkpoint.request_count <= len(recorded_requests)
+            else 0
+        )
+        new_requests: List[MockRequest] = recorded_requests[first_index:]
+        self.logger.debug(
+            f"Count of retrieved requests since checkpoint: {len(new_requests)}"
+        )
+        if self.log_all_requests_to_folder:
+            self.write_all_requests_to_folder(
+                request_responses=recorded_request_responses[first_index:],
+                first_index=first_index,
+            )
+        self.match_reporter.dump(title="NEW RETRIEVED REQUESTS", items=new_requests)
+        new_requests = self._filter_recorded_requests(
+            recorded_requests=new_requests,
+            test_name=checkpoint.test_name,
+            method=checkpoint.method,
+        )
+        match_result: MatchRequestResult = self.match_to_recorded_requests(
+            recorded_requests=new_requests,
+            expectations=[
+                expectation
+                for expectation in self.expectations
+                for _ in range(
+                    expectation.occurrences
+                    - checkpoint.get_matched_count(expectation.request.index)
+                )
+            ],
+        )
+        checkpoint.advance(
+            request_count=len(recorded_requests),
+            matched_expectations=match_result.matched_expectations,
+            found_expectations=match_result.found_expectations,
+        )
+        exceptions: List[MockServerException] = (
+            match_result.exceptions
+            if verify_all_expectations
+            else [
+                e
+                for e in match_result.exceptions
+                if not isinstance(e, MockServerExpectationNotFoundException)
+            ]
+        )
+        self._raise_match_exceptions(
+            exceptions=exceptions,
+            found_expectations=checkpoint.found_expectations,
+            files=files,
+        )
+
+    def _filter_recorded_requests(
+        self,
+        *,
+        recorded_requests: List[MockRequest],
+        test_name: Optional[str],
+        method: Optional[str],
+    ) -> List[MockRequest]:
+        """
+        Returns the recorded requests for the test
+        """
         if test_name is not None:
             recorded_requests = [
-                r for r in recorded_requests if r.path and test_name in r.path
+                r
+                for r in recorded_requests
+                if self.path_match_strategy.matches(path=r.path, test_name=test_name)
             ]
+        if method is not None:
+            recorded_requests = [r for r in recorded_requests if r.method == method]
         self.logger.debug(
             f"Count of recorded requests for test: {len(recorded_requests)}"
         )
-        match_result: MatchRequestResult = self.match_to_recorded_requests(
-            recorded_requests=recorded_requests
-        )
-        exceptions: List[MockServerException] = match_result.exceptions
-        found_expectations: List[MockRequest] = match_result.found_expectations
+        return recorded_requests
 
+    def _raise_match_exceptions(
+        self,
+        *,
+        exceptions: List[MockServerException],
+        found_expectations: List[MockRequest],
+        files: Optional[List[str]],
+    ) -> None:
+        """
+        Raises a MockServerVerifyException if matching found any mismatches
+        """
         if len(exceptions) > 0:
             self.logger.info("-------- Matched Retrieved Requests -----")
             for found_expectation in found_expectations:
-                self.logger.info(f"{found_expectation}")
+                self.logger.info("%s", found_expectation)
             self.logger.info("-------- End Matched Retrieved Requests -----")
             raise MockServerVerifyException(
                 exceptions=exceptions,
@@ -948,43 +1967,144 @@ class MockServerFriendlyClient(object):
                 found_expectations=found_expectations,
             )
 
-    def retrieve_requests(self) -> List[MockRequest]:
+    def retrieve_requests(
+        self, *, request_filter: Optional[Dict[str, Any]] = None
+    ) -> List[MockRequest]:
         """
         Retrieve requests made to mock server
 
 
+        :param request_filter: if set, only the requests matching this request matcher are retrieved
         :return: list of requests made to mock server
         """
-        result = self._call("retrieve")
-        # https://app.swaggerhub.com/apis/jamesdbloom/mock-server-openapi/5.11.x#/control/put_retrieve
-        raw_requests: List[Dict[str, Any]] = cast(
-            List[Dict[str, Any]], json.loads(result.text)
+        result = self._call("retrieve", _to_retrieve_body(request_filter))
+        with self.instrumentation.span(RETRIEVE_PARSE, type="requests"):
+            # https://app.swaggerhub.com/apis/jamesdbloom/mock-server-openapi/5.11.x#/control/put_retrieve
+            raw_requests: List[Dict[str, Any]] = cast(
+                List[Dict[str, Any]], json.loads(result.text)
+            )
+            self.instrumentation.count(RETRIEVED_REQUESTS, len(raw_requests))
+            return [
+                MockRequest(request=r, index=index, file_path=None)
+                for index, r in enumerate(raw_requests)
+            ]
+
+    def retrieve_requests_and_request_responses(
+        self, *, request_filter: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[MockRequest], List[MockRequestResponse]]:
+        """
+        Retrieve requests made to mock server and the responses sent for them with a single call.
+        The requests are taken from the request/responses.  If the mock server does not return
+        request/response pairs then the requests are retrieved separately.
+
+
+        :param request_filter: if set, only the requests matching this request matcher are retrieved
+        :return: list of requests made to mock server and list of requests and responses
+        """
+        recorded_request_responses: Optional[List[MockRequestResponse]]
+        try:
+            recorded_request_responses = self.retrieve_request_responses(
+                request_filter=request_filter
+            )
+        except (ValueError, TypeError, AttributeError) as e:
+            self.logger.debug(f"Could not retrieve request/responses: {e}")
+            recorded_request_responses = None
+        return _get_requests_from_request_responses(
+            recorded_request_responses=recorded_request_responses,
+            retrieve_requests=partial(
+                self.retrieve_requests, request_filter=request_filter
+            ),
+            logger=self.logger,
         )
-        return [
-            MockRequest(request=r, index=index, file_path=None)
-            for index, r in enumerate(raw_requests)
-        ]
 
-    def retrieve_request_responses(self) -> List[MockRequestResponse]:
+    def retrieve_request_responses(
+        self, *, request_filter: Optional[Dict[str, Any]] = None
+    ) -> List[MockRequestResponse]:
         """
         Retrieve requests made to mock server
 
 
+        :param request_filter: if set, only the requests matching this request matcher are retrieved
         :return: list of requests made to mock server
         """
-        result = self._call("retrieve", query_string="type=request_responses")
-        # https://app.swaggerhub.com/apis/jamesdbloom/mock-server-openapi/5.11.x#/control/put_retrieve
-        raw_requests: List[Dict[str, Any]] = cast(
-            List[Dict[str, Any]], json.loads(result.text)
+        result = self._call(
+            "retrieve",
+            _to_retrieve_body(request_filter),
+            query_string="type=request_responses",
         )
-        return [
-            MockRequestResponse(
-                request=r.get("httpRequest"),
-                response=r.get("httpResponse"),
-                index=index,
+        with self.instrumentation.span(RETRIEVE_PARSE, type="request_responses"):
+            # https://app.swaggerhub.com/apis/jamesdbloom/mock-server-openapi/5.11.x#/control/put_retrieve
+            raw_requests: List[Dict[str, Any]] = cast(
+                List[Dict[str, Any]], json.loads(result.text)
             )
-            for index, r in enumerate(raw_requests)
-        ]
+            self.instrumentation.count(RETRIEVED_REQUESTS, len(raw_requests))
+            return [
+                MockRequestResponse(
+                    request=r.get("httpRequest"),
+                    response=r.get("httpResponse"),
+                    index=index,
+                )
+                for index, r in enumerate(raw_requests)
+            ]
+
+    def iter_retrieved_requests(
+        self,
+        *,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        request_filter: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[MockRequest]:
+        """
+        Retrieve requests made to mock server one at a time while the response is being downloaded.
+        Unlike retrieve_requests(), the full response is never held in memory.
+
+
+        :param chunk_size: number of bytes to read from the response at a time
+        :param request_filter: if set, only the requests matching this request matcher are retrieved
+        :return: iterator over the requests made to mock server
+        """
+        response: Response = self._call(
+            "retrieve", _to_retrieve_body(request_filter), stream=True
+        )
+        try:
+            for index, r in enumerate(
+                iter_json_array(response.iter_content(chunk_size=chunk_size))
+            ):
+                yield MockRequest(request=r, index=index, file_path=None)
+        finally:
+            response.close()
+
+    def iter_retrieved_request_responses(
+        self,
+        *,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        request_filter: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[MockRequestResponse]:
+        """
+        Retrieve requests made to mock server, and the responses sent for them, one at a time while the
+        response is being downloaded.  Unlike retrieve_request_responses(), the full response is never held in memory.
+
+
+        :param chunk_size: number of bytes to read from the response at a time
+        :param request_filter: if set, only the requests matching this request matcher are retrieved
+        :return: iterator over the requests and responses made to mock server
+        """
+        response: Response = self._call(
+            "retrieve",
+            _to_retrieve_body(request_filter),
+            query_string="type=request_responses",
+            stream=True,
+        )
+        try:
+            for index, r in enumerate(
+                iter_json_array(response.iter_content(chunk_size=chunk_size))
+            ):
+                yield MockRequestResponse(
+                    request=r.get("httpRequest"),
+                    response=r.get("httpResponse"),
+                    index=index,
+                )
+        finally:
+            response.close()
 
     @classmethod
     def safe_string_for_file_path(cls, s: str) -> str:
@@ -1013,48 +2133,87 @@ class MockServerFriendlyClient(object):
         return s
 
     def write_all_requests_to_folder(
-        self, *, request_responses: List[MockRequestResponse]
+        self, *, request_responses: List[MockRequestResponse], first_index: int = 0
     ) -> None:
+        """
+        Writes the recorded requests to log_all_requests_to_folder, either as one file per request
+        (written in a thread pool) or as a single archive depending on log_all_requests_format.
+        load_mock_source_api_json_responses() can replay either
+
+
+        :param request_responses: request/responses retrieved from the mock server
+        :param first_index: index of the first request among all the retrieved requests.  Used in the file
+                            names and, if not zero, the requests are appended to the archive
+        """
         assert self.log_all_requests_to_folder
+        folder: Path = Path(self.log_all_requests_to_folder)
         # write all requests to file
-        recorded_request_response: MockRequestResponse
-        for index, recorded_request_response in enumerate(request_responses):
-            request: MockRequest | None = recorded_request_response.request
-            if not request:
-                continue
-            json_dict: Dict[str, Any] = {
-                "request_parameters": {
-                    "method": f"{request.method}",
-                    "path": request.path,
-                }
-            }
-            if request.querystring_params:
-                json_dict["request_parameters"]["querystring"] = (
-                    request.querystring_params
+        with self.instrumentation.span(WRITE_REQUESTS, requests=len(request_responses)):
+            entries: Iterator[RequestArchiveEntry] = (
+                entry
+                for index, recorded_request_response in enumerate(
+                    request_responses, start=first_index
+                )
+                if (
+                    entry := self._to_request_archive_entry(
+                        index=index, request_response=recorded_request_response
+                    )
                 )
-            if request.json_list:
-                json_dict["request_body"] = request.json_list
-            response: MockResponse | None = recorded_request_response.response
-            if response:
-                if response.json_body:
-                    json_dict["request_result"] = response.json_body
-                elif response.status_code:
-                    json_dict["request_result"] = {"status_code": response.status_code}
-
-            json_content = json.dumps(json_dict, indent=4)
-
-            # path_parts: List[str] = recorded_request_response.path.split("/")
-            file_name: str = (
-                f"{index}-{self.safe_string_for_file_path(str(request.path))}.json"
-                if request.path
-                else f"{index}.json"
+                is not None
             )
+            if self.log_all_requests_format is RequestLogFormat.FILES:
+                with ThreadPoolExecutor() as executor:
+                    # consume the results so errors are raised
+                    for _ in executor.map(
+                        lambda entry: _write_json_file(
+                            folder.joinpath(entry[0]), entry[1]
+                        ),
+                        entries,
+                    ):
+                        pass
+            else:
+                write_request_archive(
+                    archive_path=folder.joinpath(
+                        self.log_all_requests_format.archive_file_name
+                    ),
+                    entries=entries,
+                    append=first_index > 0,
+                )
 
-            path = Path(self.log_all_requests_to_folder)
-
-            path = path.joinpath(file_name)
-            with open(path, "w") as file:
-                file.write(json_content)
+    def _to_request_archive_entry(
+        self, *, index: int, request_response: MockRequestResponse
+    ) -> Optional[RequestArchiveEntry]:
+        """
+        Returns the file name and contents for a recorded request in the format read by
+        load_mock_source_api_json_responses()
+        """
+        request: MockRequest | None = request_response.request
+        if not request:
+            return None
+        json_dict: Dict[str, Any] = {
+            "request_parameters": {
+                "method": f"{request.method}",
+                "path": request.path,
+            }
+        }
+        if request.querystring_params:
+            json_dict["request_parameters"]["querystring"] = request.querystring_params
+        if request.json_list:
+            json_dict["request_body"] = request.json_list
+        response: MockResponse | None = request_response.response
+        if response:
+            json_body: Dict[str, Any] | List[Dict[str, Any]] | None = response.json_body
+            if json_body:
+                json_dict["request_result"] = json_body
+            elif response.status_code:
+                json_dict["request_result"] = {"status_code": response.status_code}
+
+        file_name: str = (
+            f"{index}-{self.safe_string_for_file_path(str(request.path))}.json"
+            if request.path
+            else f"{index}.json"
+        )
+        return file_name, json_dict
 
     @staticmethod
     def normalize_querystring_params(
@@ -1303,6 +2462,79 @@ def _non_null_options_to_dict(*options: Any) -> Dict[str, Any]:
     return {o.field: o.formatter(o.value) for o in options if o.value is not None}
 
 
+def _expectation_to_dict(
+    *,
+    request: Any,
+    response: Any,
+    timing: Optional[_Timing] = None,
+    time_to_live: Any = None,
+) -> Dict[str, Any]:
+    return _non_null_options_to_dict(
+        _Option("httpRequest", request),
+        _Option("httpResponse", response),
+        _Option("times", (timing or _Timing()).for_expectation()),
+        _Option("timeToLive", time_to_live, formatter=_to_time_to_live),
+    )
+
+
+def _compare_json_chunk(
+    chunk: List[Tuple[Any, Any, bool]], *, ignored_field_names: List[str]
+) -> List[Dict[str, Any]]:
+    """
+    Compares a chunk of (expected json, actual json, ignore_timestamp_field) in a worker process
+    """
+    return [
+        MockServerFriendlyClient.compare_dicts(
+            dict_1=json1,
+            dict_2=json2,
+            ignore_timestamp_field=ignore_timestamp_field,
+            ignored_field_names=ignored_field_names,
+        )
+        for json1, json2, ignore_timestamp_field in chunk
+    ]
+
+
+def _to_retrieve_body(request_filter: Optional[Dict[str, Any]]) -> Optional[str]:
+    return json.dumps(request_filter) if request_filter else None
+
+
+def _get_requests_from_request_responses(
+    *,
+    recorded_request_responses: Optional[List[MockRequestResponse]],
+    retrieve_requests: Callable[[], List[MockRequest]],
+    logger: Logger,
+) -> Tuple[List[MockRequest], List[MockRequestResponse]]:
+    """
+    Returns the requests in the request/responses, or calls retrieve_requests if the request/responses
+    are missing or incomplete
+    """
+    recorded_requests: Optional[List[MockRequest]] = _get_requests_in_request_responses(
+        recorded_request_responses=recorded_request_responses, logger=logger
+    )
+    if recorded_requests is None:
+        recorded_requests = retrieve_requests()
+    return recorded_requests, recorded_request_responses or []
+
+
+def _get_requests_in_request_responses(
+    *,
+    recorded_request_responses: Optional[List[MockRequestResponse]],
+    logger: Logger,
+) -> Optional[List[MockRequest]]:
+    """
+    Returns the requests in the request/responses or None if the request/responses are missing or
+    incomplete and the requests have to be retrieved separately
+    """
+    if recorded_request_responses is not None and all(
+        r.request is not None for r in recorded_request_responses
+    ):
+        return [cast(MockRequest, r.request) for r in recorded_request_responses]
+    logger.debug(
+        "Mock server did not return request/response pairs so retrieving requests separately"
+    )
+    return None
+
+
 def _to_named_values_list(dictionary: Dict[str, Any]) -> List[Dict[str, Any]]:
     return [
         {"name": key, "values": [value] if not isinstance(value, list) else value}
@@ -1324,3 +2556,8 @@ def _to_delay(delay: _Time) -> Dict[str, Any]:
 def _to_time_to_live(time: Union[_Time, int]) -> Dict[str, Any]:
     time = _to_time(time)
     return {"timeToLive": time.value, "timeUnit": time.unit, "unlimited": False}
+
+
+def _write_json_file(file_path: Path, content: Dict[str, Any]) -> None:
+    with open(file_path, "w") as file:
+        file.write(json.dumps(content, indent=4))
@@ -0,0 +1,171 @@
+from types import TracebackType
+from typing import Any, Optional, Self, Type
+from urllib.parse import urlsplit
+
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import ConnectionPool
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.response import BaseHTTPResponse
+from urllib3.util.retry import Retry
+
+
+class MockServerTransport:
+    """
+    HTTP transport used by MockServerFriendlyClient to talk to the MockServer control plane.
+
+    Keeps a pooled keep-alive session so consecutive calls reuse the same TCP connections
+    instead of opening a new one per call.  Subclass and override `put` to plug in a different transport.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_size: int = 10,
+        retries: int = 3,
+        backoff_factor: float = 0.1,
+        timeout: float = 60,
+    ) -> None:
+        """
+        HTTP transport used by MockServerFriendlyClient to talk to the MockServer control plane.
+
+
+        :param pool_size: maximum number of connections to keep alive in the pool
+        :param retries: number of times to retry a call that failed to connect, or a call to retrieve,
+                        clear or reset that got a 502/503/504
+        :param backoff_factor: backoff factor between retries (see urllib3 Retry)
+        :param timeout: default timeout in seconds for each call
+        """
+        self.pool_size: int = pool_size
+        self.retries: int = retries
+        self.backoff_factor: float = backoff_factor
+        self.timeout: float = timeout
+        self.session: Session = self.create_session()
+
+    def create_session(self) -> Session:
+        """
+        Creates the pooled session.  Reads are never retried and only the commands that are safe to repeat
+        are retried on a 502/503/504 since a retried PUT to /expectation could register the same
+        expectation twice.
+
+
+        :return: session
+        """
+        retry: Retry = _ControlCallRetry(
+            total=self.retries,
+            connect=self.retries,
+            read=0,
+            status=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"PUT"}),
+            raise_on_status=False,
+        )
+        adapter: HTTPAdapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            max_retries=retry,
+        )
+        session: Session = Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def put(
+        self,
+        url: str,
+        *,
+        data: Any = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        """
+        Sends a PUT request using the pooled session
+
+
+        :param url: url to call
+        :param data: body to send
+        :param timeout: timeout in seconds.  Uses the default timeout of the transport if not specified
+        :param stream: if True the body of the response is not downloaded until it is read.
+                        The caller has to close the response
+        :return: response
+        """
+        return self.session.put(
+            url,
+            data=data,
+            timeout=timeout if timeout is not None else self.timeout,
+            stream=stream,
+        )
+
+    def close(self) -> None:
+        """
+        Releases the connections held in the pool
+
+        """
+        self.session.close()
+
+    def __enter__(self) -> "MockServerTransport":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+class _ControlCallRetry(Retry):
+    """
+    Retry that only retries a 502/503/504 for the control plane commands that are safe to repeat.
+    A proxy can return a 502 or 504 after the MockServer has already registered an expectation.
+    """
+
+    # commands that leave the MockServer in the same state however many times they are made
+    IDEMPOTENT_COMMANDS = frozenset({"retrieve", "clear", "reset"})
+
+    def increment(
+        self,
+        method: Optional[str] = None,
+        url: Optional[str] = None,
+        response: Optional[BaseHTTPResponse] = None,
+        error: Optional[Exception] = None,
+        _pool: Optional[ConnectionPool] = None,
+        _stacktrace: Optional[TracebackType] = None,
+    ) -> Self:
+        if (
+            error is None
+            and response is not None
+            and not self.is_idempotent_command(url)
+        ):
+            # with raise_on_status=False the response is returned to the caller as is
+            raise MaxRetryError(
+                _pool,  # type: ignore[arg-type]
+                url or "",
+                ResponseError(
+                    ResponseError.SPECIFIC_ERROR.format(status_code=response.status)
+                ),
+            )
+        return super().increment(
+            method=method,
+            url=url,
+            response=response,
+            error=error,
+            _pool=_pool,
+            _stacktrace=_stacktrace,
+        )
+
+    @classmethod
+    def is_idempotent_command(cls, url: Optional[str]) -> bool:
+        """
+        Whether the url calls a control plane command that is safe to repeat e.g. /mockserver/retrieve
+
+
+        :param url: url or path of the call
+        """
+        if not url:
+            return False
+        return urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1] in (
+            cls.IDEMPOTENT_COMMANDS
+        )
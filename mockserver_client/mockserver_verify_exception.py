@@ -1,11 +1,11 @@
-import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .exceptions.mock_server_exception import MockServerException
 from .exceptions.mock_server_json_content_mismatch_exception import (
     MockServerJsonContentMismatchException,
 )
+from .fixture_cache import FixtureCache, get_default_fixture_cache
 from .mock_request import MockRequest
 
 
@@ -30,6 +30,8 @@ class MockServerVerifyException(Exception):
 
     def set_files_in_exceptions(self) -> None:
         # iterate through the exceptions and find the corresponding files
+        # file of each resource, only read if there is a mismatch to look up
+        resource_files: Optional[Dict[Tuple[str, str], str]] = None
         exception: MockServerException
         for exception in self.exceptions:
             if isinstance(exception, MockServerJsonContentMismatchException):
@@ -39,32 +41,13 @@ class MockServerVerifyException(Exception):
                 if actual_list_or_obj:
                     for actual in actual_list_or_obj:
                         if "resourceType" in actual and "id" in actual:
-                            # noinspection PyPep8Naming
-                            resourceType: str = actual["resourceType"]
-                            id_: str = actual["id"]
-                            # now iterate through the files to find the file for this
-                            file_name: str
-                            for file_name in self.files:
-                                with open(file_name, "r") as file:
-                                    json_data = json.loads(file.read())
-                                    if isinstance(json_data, list):
-                                        for json_data1 in json_data:
-                                            if (
-                                                json_data1["resourceType"]
-                                                == resourceType
-                                                and json_data1["id"] == id_
-                                            ):
-                                                exception.expected_file_path = Path(
-                                                    file_name
-                                                )
-                                    else:
-                                        if (
-                                            json_data["resourceType"] == resourceType
-                                            and json_data["id"] == id_
-                                        ):
-                                            exception.expected_file_path = Path(
-                                                file_name
-                                            )
+                            if resource_files is None:
+                                resource_files = get_resource_files(self.files)
+                            file_name: Optional[str] = resource_files.get(
+                                (actual["resourceType"], actual["id"])
+                            )
+                            if file_name is not None:
+                                exception.expected_file_path = Path(file_name)
 
     def __str__(self) -> str:
         return ",".join(
@@ -74,3 +57,33 @@ class MockServerVerifyException(Exception):
                 if isinstance(e, MockServerJsonContentMismatchException)
             ]
         )
+
+
+def get_resource_files(
+    files: List[str], *, fixture_cache: Optional[FixtureCache] = None
+) -> Dict[Tuple[str, str], str]:
+    """
+    Returns the file each resource is in, keyed by the resourceType and id of the resource.  If a
+    resource is in several files, the last file wins.  Files that cannot be read or are not resources
+    are skipped.
+
+
+    :param files: paths of the files containing a resource or a list of resources
+    :param fixture_cache: cache to load the files with.  Defaults to the shared cache
+    :return: path of the file by (resourceType, id)
+    """
+    fixture_cache = fixture_cache or get_default_fixture_cache()
+    resource_files: Dict[Tuple[str, str], str] = {}
+    for file_name in files:
+        try:
+            json_data: Any = fixture_cache.load_file(file_name)
+        except (OSError, ValueError):
+            continue
+        for resource in json_data if isinstance(json_data, list) else [json_data]:
+            if (
+                isinstance(resource, dict)
+                and "resourceType" in resource
+                and "id" in resource
+            ):
+                resource_files[(resource["resourceType"], resource["id"])] = file_name
+    return resource_files
@@ -0,0 +1,72 @@
+import re
+from enum import Enum
+from typing import Any, Dict, Optional
+
+
+class PathMatchStrategy(str, Enum):
+    """
+    How the test_name passed to verify_expectations() is matched to the path of the recorded requests
+    """
+
+    # test_name appears anywhere in the path
+    SUBSTRING = "substring"
+    # path starts with test_name (the leading / is optional in test_name)
+    PREFIX = "prefix"
+    # test_name is a regular expression that is searched for in the path
+    REGEX = "regex"
+
+    def matches(self, *, path: Optional[str], test_name: str) -> bool:
+        """
+        Returns whether the path of a recorded request belongs to the test
+
+
+        :param path: path of the recorded request
+        :param test_name: name of the test
+        :return: True if the path matches
+        """
+        if not path:
+            return False
+        if self is PathMatchStrategy.PREFIX:
+            return path.lstrip("/").startswith(test_name.lstrip("/"))
+        if self is PathMatchStrategy.REGEX:
+            return re.search(test_name, path) is not None
+        return test_name in path
+
+    def to_path_regex(self, *, test_name: str) -> str:
+        """
+        Returns a regular expression for the path matcher of the MockServer.  The MockServer matches the
+        regular expression against the whole path so it selects the same requests as matches()
+
+
+        :param test_name: name of the test
+        :return: regular expression
+        """
+        if self is PathMatchStrategy.PREFIX:
+            return "/" + re.escape(test_name.lstrip("/")) + ".*"
+        if self is PathMatchStrategy.REGEX:
+            return f".*(?:{test_name}).*"
+        return ".*" + re.escape(test_name) + ".*"
+
+
+def get_retrieve_request_filter(
+    *,
+    test_name: Optional[str],
+    method: Optional[str] = None,
+    path_match_strategy: PathMatchStrategy = PathMatchStrategy.SUBSTRING,
+) -> Optional[Dict[str, Any]]:
+    """
+    Returns the request matcher to send in the body of /retrieve so the MockServer only returns
+    the requests for the test
+
+
+    :param test_name: name of the test.  If not set, requests to any path are returned
+    :param method: if set, only requests with this method are returned
+    :param path_match_strategy: how test_name is matched to the path
+    :return: request matcher or None to return all the requests
+    """
+    request_filter: Dict[str, Any] = {}
+    if test_name is not None:
+        request_filter["path"] = path_match_strategy.to_path_regex(test_name=test_name)
+    if method is not None:
+        request_filter["method"] = method
+    return request_filter or None
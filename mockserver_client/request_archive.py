@@ -0,0 +1,83 @@
+import gzip
+import json
+from enum import Enum
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, Tuple
+
+# name of the file the request was written to and its contents
+RequestArchiveEntry = Tuple[str, Dict[str, Any]]
+
+
+class RequestLogFormat(str, Enum):
+    """
+    How write_all_requests_to_folder() writes the recorded requests
+    """
+
+    # one indented .json file per request
+    FILES = "files"
+    # a single requests.ndjson archive with one line per request
+    NDJSON = "ndjson"
+    # a single gzip compressed requests.ndjson.gz archive with one line per request
+    NDJSON_GZIP = "ndjson.gz"
+
+    @property
+    def archive_file_name(self) -> str:
+        """
+        Returns the name of the archive written to the folder
+        """
+        assert self is not RequestLogFormat.FILES
+        return f"requests.{self.value}"
+
+
+def is_request_archive(path: Path) -> bool:
+    """
+    Returns whether the path is an archive written by write_request_archive()
+
+
+    :param path: path of a file or folder
+    """
+    return path.is_file() and (
+        path.name.endswith(".ndjson") or path.name.endswith(".ndjson.gz")
+    )
+
+
+def write_request_archive(
+    *,
+    archive_path: Path,
+    entries: Iterable[RequestArchiveEntry],
+    append: bool = False,
+) -> None:
+    """
+    Writes the requests to an NDJSON archive, gzip compressed if the path ends with .gz
+
+
+    :param archive_path: path of the archive
+    :param entries: file name and contents of each request
+    :param append: if True, the requests are added to the end of an existing archive
+    """
+    with _open_archive(archive_path, "at" if append else "wt") as file:
+        for file_name, content in entries:
+            file.write(json.dumps({"file_name": file_name, "content": content}))
+            file.write("\n")
+
+
+def read_request_archive(archive_path: Path) -> Iterator[RequestArchiveEntry]:
+    """
+    Reads the requests from an archive written by write_request_archive()
+
+
+    :param archive_path: path of the archive
+    :return: iterator over the file name and contents of each request
+    """
+    with _open_archive(archive_path, "rt") as file:
+        for line in file:
+            if line.strip():
+                entry: Dict[str, Any] = json.loads(line)
+                yield entry["file_name"], entry["content"]
+
+
+def _open_archive(archive_path: Path, mode: str) -> IO[str]:
+    if archive_path.name.endswith(".gz"):
+        # a lower compression level is several times faster than the default and nearly as small
+        return gzip.open(archive_path, mode, compresslevel=6, encoding="utf-8")  # type: ignore[return-value]
+    return open(archive_path, mode.replace("t", ""), encoding="utf-8")
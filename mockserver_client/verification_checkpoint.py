@@ -0,0 +1,75 @@
+from typing import Dict, List, Optional, Set
+
+from .mock_request import MockRequest
+
+
+class VerificationCheckpoint:
+    """
+    Cursor for MockServerFriendlyClient.verify_expectations_since_checkpoint().  Remembers how many of the
+    recorded requests and which expectations were already reconciled so each verification only matches
+    the requests recorded since the previous one against the expectations not matched yet.
+
+    Create a new checkpoint after reset() since expectations are numbered again from zero.
+    """
+
+    def __init__(
+        self, *, test_name: Optional[str] = None, method: Optional[str] = None
+    ) -> None:
+        """
+        Cursor for incremental verification
+
+
+        :param test_name: only the requests for this test are verified
+        :param method: if set, only the requests with this method are verified
+        """
+        self.test_name: Optional[str] = test_name
+        self.method: Optional[str] = method
+        # number of requests retrieved from the mock server that were already verified
+        self.request_count: int = 0
+        # number of times each expectation (by index) was matched.  Merged expectations are matched more than once
+        self.matched_expectation_counts: Dict[int, int] = {}
+        # recorded requests matched to an expectation by all the verifications so far
+        self.found_expectations: List[MockRequest] = []
+        self.verification_count: int = 0
+
+    def advance(
+        self,
+        *,
+        request_count: int,
+        matched_expectations: List[MockRequest],
+        found_expectations: List[MockRequest],
+    ) -> None:
+        """
+        Records the result of a verification
+
+
+        :param request_count: number of requests retrieved from the mock server
+        :param matched_expectations: requests of the expectations that were matched
+        :param found_expectations: recorded requests that were matched
+        """
+        self.request_count = request_count
+        for expectation in matched_expectations:
+            self.matched_expectation_counts[expectation.index] = (
+                self.matched_expectation_counts.get(expectation.index, 0) + 1
+            )
+        self.found_expectations.extend(found_expectations)
+        self.verification_count += 1
+
+    @property
+    def matched_expectation_indexes(self) -> Set[int]:
+        """
+        Indexes of the expectations matched to at least one recorded request
+        """
+        return set(self.matched_expectation_counts)
+
+    def is_matched(self, index: int) -> bool:
+        """
+        Returns whether the expectation with this index was already matched to a recorded request
+        """
+        return index in self.matched_expectation_counts
+
+    def get_matched_count(self, index: int) -> int:
+        """
+        Returns how many recorded requests the expectation with this index was already matched to
+        """
+        return self.matched_expectation_counts.get(index, 0)
@@ -0,0 +1,171 @@
+import threading
+from types import TracebackType
+from typing import Callable, List, Optional, Self, Type
+
+from .exceptions.mock_server_exception import MockServerException
+from .mock_request import MockRequest
+from .mockserver_client import MockServerFriendlyClient
+from .mockserver_verify_exception import MockServerVerifyException
+from .verification_checkpoint import VerificationCheckpoint
+
+# called from the watcher thread with the mismatches found by a check
+MismatchHandler = Callable[[MockServerVerifyException], None]
+
+
+class VerificationWatcher:
+    """
+    Verifies the requests made to the mock server while the system under test runs.
+
+    A background thread retrieves the recorded requests every interval seconds and matches the new ones
+    against the expectations not matched yet (see MockServerFriendlyClient.verify_expectations_since_checkpoint).
+    Requests without an expectation and content mismatches are collected as they happen so a long test can
+    check failed or call raise_if_failed() between steps instead of waiting for the end.  stop() makes a
+    last check that also reports the expectations that were never matched.
+
+    Don't call verify_expectations() on the same client while the watcher is running.
+    """
+
+    DEFAULT_INTERVAL = 1.0  # seconds between checks
+
+    def __init__(
+        self,
+        *,
+        mock_client: MockServerFriendlyClient,
+        test_name: Optional[str] = None,
+        method: Optional[str] = None,
+        files: Optional[List[str]] = None,
+        interval: float = DEFAULT_INTERVAL,
+        on_mismatch: Optional[MismatchHandler] = None,
+        stop_on_mismatch: bool = True,
+    ) -> None:
+        """
+        Verifies the requests made to the mock server while the system under test runs
+
+
+        :param mock_client: client to mock server
+        :param test_name: only the requests for this test are verified
+        :param method: if set, only the requests with this method are verified
+        :param files: files to create expectations
+        :param interval: seconds between checks
+        :param on_mismatch: called from the watcher thread with the mismatches found by each failed check
+        :param stop_on_mismatch: if True then the watcher stops checking after the first failed check
+        """
+        self.mock_client: MockServerFriendlyClient = mock_client
+        self.files: Optional[List[str]] = files
+        self.interval: float = interval
+        self.on_mismatch: Optional[MismatchHandler] = on_mismatch
+        self.stop_on_mismatch: bool = stop_on_mismatch
+        self.checkpoint: VerificationCheckpoint = VerificationCheckpoint(
+            test_name=test_name, method=method
+        )
+        self.exceptions: List[MockServerException] = []
+        # set when a check found mismatches
+        self.failed: threading.Event = threading.Event()
+        # error raised by a check other than a mismatch e.g. the mock server could not be reached
+        self.error: Optional[BaseException] = None
+        self._stopping: threading.Event = threading.Event()
+        # a check from the watcher thread never overlaps with the last check made by stop()
+        self._lock: threading.Lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> Self:
+        """
+        Starts checking in a background thread
+
+
+        :return: this watcher
+        """
+        assert self._thread is None, "The watcher has already been started"
+        self._thread = threading.Thread(
+            target=self._watch, name="VerificationWatcher", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def check(self, *, verify_all_expectations: bool = False) -> bool:
+        """
+        Verifies the requests made since the previous check and collects any mismatches
+
+
+        :param verify_all_expectations: if True then expectations that have still not been matched are
+                                        reported as missing
+        :return: True if no mismatches were found
+        """
+        with self._lock:
+            try:
+                self.mock_client.verify_expectations_since_checkpoint(
+                    checkpoint=self.checkpoint,
+                    files=self.files,
+                    verify_all_expectations=verify_all_expectations,
+                )
+            except MockServerVerifyException as e:
+                self.exceptions.extend(e.exceptions)
+                self.failed.set()
+                if self.on_mismatch:
+                    self.on_mismatch(e)
+                return False
+            return True
+
+    def raise_if_failed(self) -> None:
+        """
+        Raises the mismatches found so far, or the error that stopped the watcher
+
+
+        """
+        if self.error is not None:
+            raise self.error
+        if self.exceptions:
+            raise MockServerVerifyException(
+                exceptions=list(self.exceptions),
+                files=self.files,
+                found_expectations=self.found_expectations,
+            )
+
+    @property
+    def found_expectations(self) -> List[MockRequest]:
+        """
+        Recorded requests matched to an expectation so far
+        """
+        return self.checkpoint.found_expectations
+
+    def stop(self, *, verify_all_expectations: bool = True) -> None:
+        """
+        Stops the background thread, makes a last check and raises all the mismatches found
+
+
+        :param verify_all_expectations: if True then the last check also reports the expectations that
+                                        were never matched
+        """
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.error is None and not (self.stop_on_mismatch and self.failed.is_set()):
+            self.check(verify_all_expectations=verify_all_expectations)
+        self.raise_if_failed()
+
+    def _watch(self) -> None:
+        while not self._stopping.wait(self.interval):
+            try:
+                passed: bool = self.check()
+            except Exception as e:
+                self.error = e
+                return
+            if not passed and self.stop_on_mismatch:
+                return
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            self.stop()
+        else:
+            # don't hide the exception raised by the test
+            self._stopping.set()
+            if self._thread is not None:
+                self._thread.join()
@@ -23,6 +23,8 @@ except IOError:
 # create the package setup
 setup(
     install_requires=["requests", "deepdiff>8", "uvicorn>=0.28.0"],
+    # aiohttp is only needed for AsyncMockServerClient
+    extras_require={"async": ["aiohttp>=3.10.11"]},
     name=package_name,
     version=version,
     author="Imran Qureshi",
@@ -0,0 +1,79 @@
+import asyncio
+import json
+
+import aiohttp
+import pytest
+
+from mockserver_client.async_mockserver_client import AsyncMockServerClient
+from mockserver_client.mockserver_client import (
+    mock_request,
+    mock_response,
+    times,
+)
+from mockserver_client.mockserver_verify_exception import MockServerVerifyException
+
+
+async def test_async_mock_server_client() -> None:
+    test_name = "test_async_mock_server_client"
+
+    mock_server_url = "http://mock-server:1080"
+    async with AsyncMockServerClient(
+        base_url=mock_server_url, max_concurrency=4
+    ) as mock_client:
+        await mock_client.clear(f"/{test_name}/*.*")
+
+        # expectations can be registered concurrently
+        await asyncio.gather(
+            *[
+                mock_client.expect(
+                    request=mock_request(path=f"/{test_name}/{i}", method="GET"),
+                    response=mock_response(body=json.dumps({"id": i})),
+                    timing=times(1),
+                    file_path=None,
+                )
+                for i in range(10)
+            ]
+        )
+        assert len(mock_client.expectations) == 10
+
+        async with aiohttp.ClientSession() as session:
+            for i in range(10):
+                async with session.get(
+                    f"{mock_server_url}/{test_name}/{i}"
+                ) as response:
+                    assert json.loads(await response.text()) == {"id": i}
+
+        try:
+            await mock_client.verify_expectations(test_name=test_name)
+        except MockServerVerifyException as e:
+            print(str(e))
+            raise
+
+
+async def test_async_mock_server_client_fail() -> None:
+    test_name = "test_async_mock_server_client_fail"
+
+    mock_server_url = "http://mock-server:1080"
+    async with AsyncMockServerClient(base_url=mock_server_url) as mock_client:
+        await mock_client.clear(f"/{test_name}/*.*")
+
+        await mock_client.expect_many(
+            expectations=[
+                {
+                    "request": mock_request(path=f"/{test_name}/{i}", method="GET"),
+                    "response": mock_response(body=json.dumps({"id": i})),
+                    "timing": times(1),
+                }
+                for i in range(3)
+            ]
+        )
+
+        async with (
+            aiohttp.ClientSession() as session,
+            session.get(f"{mock_server_url}/{test_name}/0") as response,
+        ):
+            assert response.status == 200
+
+        with pytest.raises(MockServerVerifyException) as e:
+            await mock_client.verify_expectations(test_name=test_name)
+        assert len(e.value.exceptions) == 2
@@ -0,0 +1,148 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+
+# benchmarks are slow so they only run when asked for, e.g. `MOCKSERVER_CLIENT_BENCHMARKS=1 pytest tests/benchmarks`
+RUN_BENCHMARKS: bool = os.environ.get("MOCKSERVER_CLIENT_BENCHMARKS") == "1"
+# set to 1 to write the timings of this run to the baseline file instead of comparing with it
+UPDATE_BASELINE: bool = (
+    os.environ.get("MOCKSERVER_CLIENT_BENCHMARKS_UPDATE_BASELINE") == "1"
+)
+# set to 1 to fail a benchmark that is more than TOLERANCE times slower than its baseline.  Off by default since
+# the baseline holds absolute timings from one machine and timings on a shared CI runner vary too much
+CHECK_BASELINE: bool = (
+    os.environ.get("MOCKSERVER_CLIENT_BENCHMARKS_CHECK_BASELINE") == "1"
+)
+# a benchmark fails if it is this many times slower than its baseline
+TOLERANCE: float = float(
+    os.environ.get("MOCKSERVER_CLIENT_BENCHMARKS_TOLERANCE", "2.0")
+)
+BASELINE_PATH: Path = Path(__file__).parent.joinpath("baseline.json")
+
+# number of requests, files etc. in each workload
+SCALES: List[int] = [100, 1000]
+
+skip_unless_benchmarks = pytest.mark.skipif(
+    not RUN_BENCHMARKS,
+    reason="set MOCKSERVER_CLIENT_BENCHMARKS=1 to run the benchmarks",
+)
+
+
+class BenchmarkRecorder:
+    """
+    Times a function over several rounds and reports the fastest round next to the baseline.
+    Only fails on a slow round if MOCKSERVER_CLIENT_BENCHMARKS_CHECK_BASELINE=1
+    """
+
+    def __init__(
+        self, *, baseline: Dict[str, float], results: Dict[str, float]
+    ) -> None:
+        self.baseline: Dict[str, float] = baseline
+        self.results: Dict[str, float] = results
+
+    def __call__(
+        self,
+        name: str,
+        function: Callable[[], Any],
+        *,
+        setup: Optional[Callable[[], Any]] = None,
+        rounds: int = 5,
+    ) -> float:
+        """
+        Runs function rounds times and returns the fastest time in seconds
+
+
+        :param name: name of the benchmark in the baseline file
+        :param function: function to time
+        :param setup: called before each round and not timed
+        :param rounds: number of times to run function
+        :return: fastest time in seconds
+        """
+        timings: List[float] = []
+        for _ in range(rounds):
+            if setup is not None:
+                setup()
+            start: float = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+        fastest: float = min(timings)
+        self.results[name] = fastest
+        baseline: Optional[float] = self.baseline.get(name)
+        print(
+            f"{name}: {fastest * 1000:.2f} ms"
+            + (f" (baseline {baseline * 1000:.2f} ms)" if baseline else "")
+        )
+        if baseline is not None and CHECK_BASELINE and not UPDATE_BASELINE:
+            assert fastest <= baseline * TOLERANCE, (
+                f"{name} took {fastest * 1000:.2f} ms which is more than {TOLERANCE} times"
+                f" the baseline of {baseline * 1000:.2f} ms"
+            )
+        return fastest
+
+
+def read_baseline() -> Dict[str, float]:
+    if not BASELINE_PATH.exists():
+        return {}
+    with open(BASELINE_PATH, "r") as file:
+        return dict(json.load(file))
+
+
+def write_baseline(results: Dict[str, float]) -> None:
+    baseline: Dict[str, float] = read_baseline()
+    baseline.update({name: round(seconds, 6) for name, seconds in results.items()})
+    with open(BASELINE_PATH, "w") as file:
+        json.dump(dict(sorted(baseline.items())), file, indent=2)
+        file.write("\n")
+
+
+def get_fhir_resource(
+    index: int, *, resource_type: str = "Patient", timestamp: str = "2024-01-01"
+) -> Dict[str, Any]:
+    """
+    Returns a synthetic FHIR resource shaped like the ones in our fixture folders
+    """
+    return {
+        "resourceType": resource_type,
+        "id": str(index),
+        "meta": {
+            "source": "http://example.com/source",
+            "lastUpdated": f"{timestamp}T00:00:00.000Z",
+            "security": [
+                {"system": "https://www.icanbwell.com/access", "code": "bwell"},
+                {"system": "https://www.icanbwell.com/owner", "code": "bwell"},
+            ],
+        },
+        "identifier": [
+            {"system": "http://example.com/mrn", "value": f"mrn-{index}"},
+            {"system": "http://example.com/ssn", "value": f"{index:09d}"},
+        ],
+        "name": [{"use": "usual", "family": f"Family{index}", "given": ["Given"]}],
+        "telecom": [{"system": "phone", "value": f"555-{index:04d}", "use": "home"}],
+        "address": [
+            {"line": [f"{index} Main St"], "city": "Springfield", "state": "IL"}
+        ],
+        "extension": [
+            {
+                "url": "http://example.com/extension",
+                "extension": [{"url": "timestamp", "valueDateTime": timestamp}],
+            }
+        ],
+    }
+
+
+def get_fhir_bundle(count: int, *, start: int = 0) -> Dict[str, Any]:
+    """
+    Returns a synthetic FHIR bundle with count entries
+    """
+    return {
+        "resourceType": "Bundle",
+        "id": f"bundle-{start}",
+        "type": "collection",
+        "entry": [
+            {"resource": get_fhir_resource(i)} for i in range(start, start + count)
+        ],
+    }
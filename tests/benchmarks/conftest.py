@@ -0,0 +1,23 @@
+from typing import Dict, Iterator
+
+import pytest
+
+from tests.benchmarks.benchmark_harness import (
+    UPDATE_BASELINE,
+    BenchmarkRecorder,
+    read_baseline,
+    write_baseline,
+)
+
+
+@pytest.fixture(scope="session")
+def benchmark_results() -> Iterator[Dict[str, float]]:
+    results: Dict[str, float] = {}
+    yield results
+    if UPDATE_BASELINE and results:
+        write_baseline(results)
+
+
+@pytest.fixture
+def benchmark(benchmark_results: Dict[str, float]) -> BenchmarkRecorder:
+    return BenchmarkRecorder(baseline=read_baseline(), results=benchmark_results)
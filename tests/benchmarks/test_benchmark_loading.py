@@ -0,0 +1,324 @@
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+import pytest
+import requests
+
+from mockserver_client.fixture_cache import FixtureCache
+from mockserver_client.local_mock_server import LocalMockServer
+from mockserver_client.mock_request_response import MockRequestResponse
+from mockserver_client.mock_requests_loader import (
+    bulk_load_mock_fhir_requests_from_folder,
+    load_mock_elasticsearch_requests_from_folder,
+    load_mock_fhir_everything_batch_requests_from_folder,
+    load_mock_fhir_everything_requests_from_folder,
+    load_mock_fhir_requests_for_single_file,
+    load_mock_fhir_requests_from_folder,
+    load_mock_source_api_json_responses,
+    load_mock_source_api_responses_from_folder,
+)
+from mockserver_client.mockserver_client import (
+    MockServerFriendlyClient,
+    json_equals,
+    mock_request,
+    mock_response,
+    times,
+)
+from mockserver_client.request_archive import RequestLogFormat
+from tests.benchmarks.benchmark_harness import (
+    SCALES,
+    BenchmarkRecorder,
+    get_fhir_bundle,
+    get_fhir_resource,
+    skip_unless_benchmarks,
+)
+
+pytestmark = skip_unless_benchmarks
+
+
+@pytest.fixture(scope="module")
+def local_mock_server() -> Iterator[LocalMockServer]:
+    with LocalMockServer() as mock_server:
+        yield mock_server
+
+
+def write_json_files(
+    folder: Path, count: int, get_content: Callable[[int], Any]
+) -> Path:
+    folder.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        folder.joinpath(f"{i}.json").write_text(json.dumps(get_content(i), indent=2))
+    return folder
+
+
+def get_source_api_response(index: int) -> Dict[str, Any]:
+    return {
+        "request_parameters": {"method": "GET", "path": f"api/v1/patients/{index}"},
+        "request_result": get_fhir_resource(index),
+    }
+
+
+def get_elasticsearch_bulk_request(index: int) -> str:
+    return "\n".join(
+        json.dumps(line)
+        for i in range(index * 10, index * 10 + 10)
+        for line in [{"index": {"_id": str(i)}}, get_fhir_resource(i)]
+    )
+
+
+@pytest.mark.parametrize("count", SCALES)
+@pytest.mark.parametrize(
+    "loader",
+    [
+        "load_mock_fhir_requests_from_folder",
+        "bulk_load_mock_fhir_requests_from_folder",
+        "load_mock_fhir_requests_for_single_file",
+        "load_mock_fhir_everything_requests_from_folder",
+        "load_mock_fhir_everything_batch_requests_from_folder",
+        "load_mock_elasticsearch_requests_from_folder",
+        "load_mock_source_api_responses_from_folder",
+        "load_mock_source_api_json_responses",
+        "expect_files_as_requests",
+    ],
+)
+def test_benchmark_loader(
+    benchmark: BenchmarkRecorder,
+    local_mock_server: LocalMockServer,
+    tmp_path: Path,
+    loader: str,
+    count: int,
+) -> None:
+    folder: Path = tmp_path.joinpath("fixtures")
+    if loader == "load_mock_fhir_requests_from_folder":
+        write_json_files(folder, count, get_fhir_resource)
+
+        def load(client: MockServerFriendlyClient, cache: FixtureCache) -> List[str]:
+            return load_mock_fhir_requests_from_folder(
+                folder=folder, mock_client=client, fixture_cache=cache
+            )
+    elif loader == "bulk_load_mock_fhir_requests_from_folder":
+        write_json_files(folder, count, lambda i: [get_fhir_resource(i)])
+
+        def load(client: MockServerFriendlyClient, cache: FixtureCache) -> List[str]:
+            return bulk_load_mock_fhir_requests_from_folder(
+                folder=folder, mock_client=client, fixture_cache=cache
+            )
+    elif loader == "load_mock_fhir_requests_for_single_file":
+        # one large file since the loader only reads a single file
+        write_json_files(folder, 1, lambda i: get_fhir_bundle(count))
+
+        def load(client: MockServerFriendlyClient, cache: FixtureCache) -> List[str]:
+            return load_mock_fhir_requests_for_single_file(
+                folder=folder,
+                single_file_name="0.json",
+                mock_client=client,
+                method="GET",
+                relative_path="Bundle",
+                fixture_cache=cache,
+            )
+    elif loader == "load_mock_fhir_everything_requests_from_folder":
+        write_json_files(folder, count, get_fhir_resource)
+
+        def load(client: MockServerFriendlyClient, cache: FixtureCache) -> List[str]:
+            return load_mock_fhir_everything_requests_from_folder(
+                folder=folder,
+                mock_client=client,
+                resourceType="Patient",
+                fixture_cache=cache,
+            )
+    elif loader == "load_mock_fhir_everything_batch_requests_from_folder":
+        write_json_files(folder, count, lambda i: get_fhir_bundle(5, start=i * 5))
+
+        def load(client: MockServerFriendlyClient, cache: FixtureCache) -> List[str]:
+            return load_mock_fhir_everything_batch_requests_from_folder(
+                folder=folder,
+                mock_client=client,
+                resourceType="Patient",
+                ids=[str(i) for i in range(0, count * 5, 7)],
+                fixture_cache=cache,
+            )
+    elif loader == "load_mock_elasticsearch_requests_from_folder":
+        folder.mkdir(parents=True)
+        for i in range(count):
+            folder.joinpath(f"{i}.json").write_text(get_elasticsearch_bulk_request(i))
+
+        def load(client: MockServerFriendlyClient, cache: FixtureCache) -> List[str]:
+            return load_mock_elasticsearch_requests_from_folder(
+                folder=folder, mock_client=client, index="patients", fixture_cache=cache
+            )
+    elif loader == "load_mock_source_api_responses_from_folder":
+        write_json_files(folder, count, get_fhir_resource)
+
+        def load(client: MockServerFriendlyClient, cache: FixtureCache) -> List[str]:
+            return load_mock_source_api_responses_from_folder(
+                folder=folder, mock_client=client, url_prefix="api", fixture_cache=cache
+            )
+    elif loader == "load_mock_source_api_json_responses":
+        write_json_files(folder, count, get_source_api_response)
+
+        def load(client: MockServerFriendlyClient, cache: FixtureCache) -> List[str]:
+            return load_mock_source_api_json_responses(
+                folder=folder, mock_client=client, url_prefix="api", fixture_cache=cache
+            )
+    else:
+        # expect_files_as_requests() uses the file name as the path
+        write_json_files(
+            folder,
+            count,
+            lambda i: {
+                "request_parameters": {"method": "GET"},
+                "request_result": get_fhir_resource(i),
+            },
+        )
+
+        def load(client: MockServerFriendlyClient, cache: FixtureCache) -> List[str]:
+            return client.expect_files_as_requests(folder=folder, url_prefix="api")
+
+    mock_client = MockServerFriendlyClient(base_url=local_mock_server.base_url)
+    fixture_cache = FixtureCache(cache_folder=None)
+
+    def setup() -> None:
+        mock_client.reset()
+        # start each round with nothing parsed
+        fixture_cache.clear()
+
+    benchmark(
+        f"{loader}[{count}]",
+        lambda: load(mock_client, fixture_cache),
+        setup=setup,
+        rounds=3,
+    )
+    assert local_mock_server.active_expectations
+    mock_client.close()
+
+
+@pytest.mark.parametrize("count", SCALES)
+def test_benchmark_retrieve(
+    benchmark: BenchmarkRecorder, local_mock_server: LocalMockServer, count: int
+) -> None:
+    mock_client = MockServerFriendlyClient(base_url=local_mock_server.base_url)
+    mock_client.reset()
+    with requests.Session() as http:
+        for i in range(count):
+            http.post(
+                f"{local_mock_server.base_url}/benchmark/4_0_0/Patient/{i}/$merge",
+                json=[get_fhir_resource(i)],
+            )
+    benchmark(
+        f"retrieve_requests_and_request_responses[{count}]",
+        mock_client.retrieve_requests_and_request_responses,
+    )
+    mock_client.reset()
+    mock_client.close()
+
+
+@pytest.mark.parametrize("count", SCALES)
+def test_benchmark_local_mock_server_requests(
+    benchmark: BenchmarkRecorder, local_mock_server: LocalMockServer, count: int
+) -> None:
+    mock_client = MockServerFriendlyClient(base_url=local_mock_server.base_url)
+    resources: List[Dict[str, Any]] = [get_fhir_resource(i) for i in range(count)]
+    http = requests.Session()
+
+    def setup() -> None:
+        mock_client.reset()
+        with mock_client.batch_expectations():
+            for resource in resources:
+                mock_client.expect(
+                    request=mock_request(
+                        method="POST",
+                        path=f"/benchmark/4_0_0/Patient/{resource['id']}/$merge",
+                        body=json_equals([resource]),
+                    ),
+                    response=mock_response(body=json.dumps([{"created": True}])),
+                    timing=times(1),
+                    file_path=None,
+                )
+
+    def send_requests() -> None:
+        # in reverse so every request is matched against all the expectations left
+        for resource in reversed(resources):
+            http.post(
+                f"{local_mock_server.base_url}/benchmark/4_0_0/Patient/{resource['id']}/$merge",
+                json=[resource],
+            ).raise_for_status()
+
+    benchmark(
+        f"local_mock_server_requests[{count}]",
+        send_requests,
+        setup=setup,
+        rounds=3,
+    )
+    mock_client.verify_expectations(test_name="benchmark")
+    http.close()
+    mock_client.close()
+
+
+@pytest.mark.parametrize("count", SCALES)
+def test_benchmark_write_all_requests_to_folder(
+    benchmark: BenchmarkRecorder, tmp_path: Path, count: int
+) -> None:
+    folder: Path = tmp_path.joinpath("requests")
+    request_responses: List[MockRequestResponse] = [
+        MockRequestResponse(
+            request={
+                "method": "POST",
+                "path": f"/benchmark/4_0_0/Patient/{i}/$merge",
+                "body": {"type": "JSON", "json": [get_fhir_resource(i)]},
+            },
+            response={"statusCode": 200, "body": json.dumps([{"id": str(i)}])},
+            index=i,
+        )
+        for i in range(count)
+    ]
+    mock_client = MockServerFriendlyClient(
+        base_url="http://mock-server:1080", log_all_requests_to_folder=folder
+    )
+
+    def setup() -> None:
+        shutil.rmtree(folder, ignore_errors=True)
+        folder.mkdir()
+
+    benchmark(
+        f"write_all_requests_to_folder[{count}]",
+        lambda: mock_client.write_all_requests_to_folder(
+            request_responses=request_responses
+        ),
+        setup=setup,
+        rounds=3,
+    )
+
+
+@pytest.mark.parametrize("count", SCALES)
+def test_benchmark_write_all_requests_to_archive(
+    benchmark: BenchmarkRecorder, tmp_path: Path, count: int
+) -> None:
+    folder: Path = tmp_path.joinpath("requests")
+    folder.mkdir()
+    request_responses: List[MockRequestResponse] = [
+        MockRequestResponse(
+            request={
+                "method": "POST",
+                "path": f"/benchmark/4_0_0/Patient/{i}/$merge",
+                "body": {"type": "JSON", "json": [get_fhir_resource(i)]},
+            },
+            response={"statusCode": 200, "body": json.dumps([{"id": str(i)}])},
+            index=i,
+        )
+        for i in range(count)
+    ]
+    mock_client = MockServerFriendlyClient(
+        base_url="http://mock-server:1080",
+        log_all_requests_to_folder=folder,
+        log_all_requests_format=RequestLogFormat.NDJSON_GZIP,
+    )
+
+    benchmark(
+        f"write_all_requests_to_archive[{count}]",
+        lambda: mock_client.write_all_requests_to_folder(
+            request_responses=request_responses
+        ),
+        rounds=3,
+    )
@@ -0,0 +1,167 @@
+import copy
+from typing import Any, Dict, List
+
+import pytest
+
+from mockserver_client.mock_expectation import MockExpectation
+from mockserver_client.mock_request import MockRequest
+from mockserver_client.mockserver_client import (
+    MockServerFriendlyClient,
+    json_equals,
+    mock_request,
+    times,
+)
+from tests.benchmarks.benchmark_harness import (
+    SCALES,
+    BenchmarkRecorder,
+    get_fhir_bundle,
+    get_fhir_resource,
+    skip_unless_benchmarks,
+)
+
+pytestmark = skip_unless_benchmarks
+
+
+def get_recorded_request(index: int, *, name: str = "Given") -> Dict[str, Any]:
+    resource = get_fhir_resource(index)
+    resource["name"][0]["given"] = [name]
+    return {
+        "method": "POST",
+        "path": f"/benchmark/4_0_0/Patient/{index}/$merge",
+        "queryStringParameters": [{"name": "smartMerge", "values": ["false"]}],
+        "headers": {"Content-Type": ["application/fhir+json"]},
+        "body": {"type": "JSON", "json": [resource]},
+    }
+
+
+def get_expectations(count: int) -> List[MockExpectation]:
+    return [
+        MockExpectation(
+            request=mock_request(
+                method="POST",
+                path=f"/benchmark/4_0_0/Patient/{i}/$merge",
+                querystring={"smartMerge": ["false"]},
+                body=json_equals([get_fhir_resource(i)]),
+            ),
+            response={},
+            timing=times(1),
+            index=i,
+            file_path=f"/fixtures/{i}.json",
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("count", SCALES)
+def test_benchmark_match_to_recorded_requests(
+    benchmark: BenchmarkRecorder, count: int
+) -> None:
+    mock_client = MockServerFriendlyClient(base_url="http://mock-server:1080")
+    recorded_requests: List[MockRequest] = []
+
+    def setup() -> None:
+        mock_client.expectations = get_expectations(count)
+        # every tenth request has a different body so the mismatch paths are measured too
+        recorded_requests[:] = [
+            MockRequest(
+                request=get_recorded_request(
+                    i, name="Changed" if i % 10 == 0 else "Given"
+                ),
+                index=i,
+                file_path=None,
+            )
+            for i in range(count)
+        ]
+
+    benchmark(
+        f"match_to_recorded_requests[{count}]",
+        lambda: mock_client.match_to_recorded_requests(
+            recorded_requests=recorded_requests
+        ),
+        setup=setup,
+    )
+
+
+# compare_dicts uses DeepDiff with ignore_order when timestamps are not ignored, which is quadratic in the
+# number of list items that differ, so that mode is measured at smaller scales
+@pytest.mark.parametrize(
+    "count,ignore_timestamp_field",
+    [(count, True) for count in SCALES] + [(10, False), (100, False)],
+)
+def test_benchmark_compare_dicts(
+    benchmark: BenchmarkRecorder, count: int, ignore_timestamp_field: bool
+) -> None:
+    bundle_1: Dict[str, Any] = get_fhir_bundle(count)
+    bundle_2: Dict[str, Any] = copy.deepcopy(bundle_1)
+    # reorder the entries and change a few values
+    bundle_2["entry"].reverse()
+    for entry in bundle_2["entry"][::10]:
+        entry["resource"]["name"][0]["family"] = "Changed"
+        entry["resource"]["extension"][0]["extension"][0]["valueDateTime"] = "2025"
+
+    benchmark(
+        f"compare_dicts[{count}-{'ignore_timestamp' if ignore_timestamp_field else 'strict'}]",
+        lambda: MockServerFriendlyClient.compare_dicts(
+            dict_1=[bundle_1],
+            dict_2=[bundle_2],
+            ignore_timestamp_field=ignore_timestamp_field,
+        ),
+        rounds=3,
+    )
+
+
+@pytest.mark.parametrize("count", SCALES)
+def test_benchmark_mock_request(benchmark: BenchmarkRecorder, count: int) -> None:
+    raw_requests: List[Dict[str, Any]] = [get_recorded_request(i) for i in range(count)]
+
+    def create_requests() -> None:
+        for i, raw_request in enumerate(raw_requests):
+            # json_list is parsed on first access
+            assert MockRequest(request=raw_request, index=i, file_path=None).json_list
+
+    benchmark(f"mock_request[{count}]", create_requests)
+
+
+@pytest.mark.parametrize("count", SCALES)
+def test_benchmark_normalize_querystring_params(
+    benchmark: BenchmarkRecorder, count: int
+) -> None:
+    querystring_params: List[List[Dict[str, Any]]] = [
+        [
+            {"name": "id", "values": [str(i)]},
+            {"name": "contained", "values": ["true"]},
+            {"name": "_count", "values": ["100"]},
+        ]
+        for i in range(count)
+    ]
+
+    def normalize() -> None:
+        for params in querystring_params:
+            MockServerFriendlyClient.normalize_querystring_params(
+                querystring_params=params
+            )
+
+    benchmark(f"normalize_querystring_params[{count}]", normalize)
+
+
+@pytest.mark.parametrize("count", SCALES)
+def test_benchmark_does_request_match(benchmark: BenchmarkRecorder, count: int) -> None:
+    expected_requests: List[MockRequest] = [
+        expectation.request for expectation in get_expectations(count)
+    ]
+    recorded_requests: List[MockRequest] = [
+        MockRequest(request=get_recorded_request(i), index=i, file_path=None)
+        for i in range(count)
+    ]
+
+    def match() -> None:
+        for expected_request, recorded_request in zip(
+            expected_requests, recorded_requests
+        ):
+            assert MockServerFriendlyClient.does_request_match(
+                request1=expected_request,
+                request2=recorded_request,
+                check_body=False,
+            )
+
+    benchmark(f"does_request_match[{count}]", match)
@@ -0,0 +1,103 @@
+import json
+from typing import Any, List, Optional
+
+import pytest
+import requests
+from requests import Response
+
+from mockserver_client.mockserver_client import (
+    MockServerFriendlyClient,
+    mock_request,
+    mock_response,
+    times,
+)
+from mockserver_client.mockserver_transport import MockServerTransport
+from mockserver_client.mockserver_verify_exception import MockServerVerifyException
+
+
+class CountingTransport(MockServerTransport):
+    def __init__(self) -> None:
+        super().__init__()
+        self.urls: List[str] = []
+
+    def put(
+        self,
+        url: str,
+        *,
+        data: Any = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        self.urls.append(url)
+        return super().put(url, data=data, timeout=timeout, stream=stream)
+
+
+def test_mock_server_expect_many() -> None:
+    test_name = "test_mock_server_expect_many"
+
+    mock_server_url = "http://mock-server:1080"
+    transport = CountingTransport()
+    mock_client: MockServerFriendlyClient = MockServerFriendlyClient(
+        base_url=mock_server_url, transport=transport
+    )
+
+    mock_client.clear(f"/{test_name}/*.*")
+    transport.urls.clear()
+
+    mock_client.expect_many(
+        expectations=(
+            {
+                "request": mock_request(path=f"/{test_name}/{i}", method="GET"),
+                "response": mock_response(body=json.dumps({"id": i})),
+                "timing": times(1),
+                "file_path": f"{i}.json",
+            }
+            for i in range(25)
+        ),
+        batch_size=10,
+    )
+
+    # 25 expectations in batches of 10 are sent in 3 calls
+    assert transport.urls == [f"{mock_server_url}/expectation"] * 3
+    assert [e.request.path for e in mock_client.expectations] == [
+        f"/{test_name}/{i}" for i in range(25)
+    ]
+    assert [e.request.index for e in mock_client.expectations] == list(range(25))
+
+    http = requests.Session()
+    for i in range(25):
+        response = http.get(f"{mock_server_url}/{test_name}/{i}")
+        assert response.json() == {"id": i}
+
+    try:
+        mock_client.verify_expectations(test_name=test_name)
+    except MockServerVerifyException as e:
+        print(str(e))
+        raise
+
+
+def test_mock_server_batch_expectations_error_drops_pending() -> None:
+    test_name = "test_mock_server_batch_expectations_error_drops_pending"
+
+    # nothing is sent so no mock server is needed
+    transport = CountingTransport()
+    mock_client: MockServerFriendlyClient = MockServerFriendlyClient(
+        base_url="http://mock-server:1080", transport=transport
+    )
+
+    with (
+        pytest.raises(ValueError, match="bad fixture"),
+        mock_client.batch_expectations(),
+    ):
+        mock_client.expect(
+            request=mock_request(path=f"/{test_name}/1", method="GET"),
+            response=mock_response(body=json.dumps({"id": 1})),
+            timing=times(1),
+            file_path="1.json",
+        )
+        raise ValueError("bad fixture")
+
+    # the partial batch is not sent and the original error is raised
+    assert transport.urls == []
+    assert mock_client._pending_expectations == []
+    assert mock_client._batch_depth == 0
@@ -0,0 +1,243 @@
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Iterator
+
+import pytest
+import requests
+
+from mockserver_client.async_mockserver_client import AsyncMockServerClient
+from mockserver_client.exceptions.mock_server_expectation_not_found_exception import (
+    MockServerExpectationNotFoundException,
+)
+from mockserver_client.expectation_index import DuplicateExpectationPolicy
+from mockserver_client.local_mock_server import LocalMockServer
+from mockserver_client.mockserver_client import (
+    MockServerFriendlyClient,
+    mock_request,
+    mock_response,
+    times,
+    times_any,
+)
+from mockserver_client.mockserver_verify_exception import MockServerVerifyException
+
+TEST_NAME = "test_expectation_index"
+
+
+@pytest.fixture(scope="module")
+def local_mock_server() -> Iterator[LocalMockServer]:
+    with LocalMockServer() as mock_server:
+        yield mock_server
+
+
+def patient_request(i: int) -> Dict[str, Any]:
+    return mock_request(
+        path=f"/{TEST_NAME}/Patient/{i}",
+        method="POST",
+        body={"json": {"resourceType": "Patient", "id": str(i)}},
+    )
+
+
+def post_patient(mock_client: MockServerFriendlyClient, i: int) -> None:
+    requests.post(
+        f"{mock_client.base_url}/{TEST_NAME}/Patient/{i}",
+        json={"resourceType": "Patient", "id": str(i)},
+    )
+
+
+def test_duplicate_and_shadowed_expectations(
+    local_mock_server: LocalMockServer, caplog: pytest.LogCaptureFixture
+) -> None:
+    with MockServerFriendlyClient(
+        base_url=local_mock_server.base_url,
+        duplicate_expectations=DuplicateExpectationPolicy.WARN,
+    ) as mock_client:
+        mock_client.reset()
+        with caplog.at_level(logging.WARNING, logger="MockServerClient"):
+            mock_client.expect(
+                request=patient_request(1),
+                response=mock_response(),
+                timing=times_any(),
+                file_path="1.json",
+            )
+            mock_client.expect(
+                request=patient_request(2),
+                response=mock_response(),
+                timing=times(1),
+                file_path="2.json",
+            )
+            mock_client.expect(
+                request=patient_request(1),
+                response=mock_response(),
+                timing=times(1),
+                file_path="1-again.json",
+            )
+
+        assert len(mock_client.expectations) == 3
+        assert len(local_mock_server.active_expectations) == 3
+        assert "duplicates expectation 0 from 1.json" in caplog.text
+
+        expectation_index = mock_client.get_expectation_index()
+        assert len(expectation_index) == 3
+        assert [
+            [e.request.file_path for e in duplicates]
+            for duplicates in expectation_index.get_duplicate_expectations()
+        ] == [["1.json", "1-again.json"]]
+        assert [
+            e.request.file_path for e in expectation_index.get_shadowed_expectations()
+        ] == ["1-again.json"]
+
+        mock_client.reset()
+        assert len(mock_client.get_expectation_index()) == 0
+
+
+def test_allowed_duplicates_are_indexed_when_needed(
+    local_mock_server: LocalMockServer,
+) -> None:
+    with MockServerFriendlyClient(base_url=local_mock_server.base_url) as mock_client:
+        mock_client.reset()
+        for file_path in ["1.json", "1-again.json"]:
+            mock_client.expect(
+                request=patient_request(1),
+                response=mock_response(),
+                timing=times(1),
+                file_path=file_path,
+            )
+        assert (
+            len(mock_client.get_expectation_index().get_duplicate_expectations()) == 1
+        )
+        assert mock_client.get_expectation_index().get_shadowed_expectations() == []
+
+
+def test_merge_duplicate_expectations(local_mock_server: LocalMockServer) -> None:
+    with MockServerFriendlyClient(
+        base_url=local_mock_server.base_url,
+        duplicate_expectations=DuplicateExpectationPolicy.MERGE,
+    ) as mock_client:
+        mock_client.reset()
+        with mock_client.batch_expectations():
+            for i in [1, 2, 1]:
+                mock_client.expect(
+                    request=patient_request(i),
+                    response=mock_response(body=json.dumps({"id": str(i)})),
+                    timing=times(1),
+                    file_path=f"{i}.json",
+                )
+        # a different response is not merged
+        mock_client.expect(
+            request=patient_request(2),
+            response=mock_response(body=json.dumps({"id": "other"})),
+            timing=times(1),
+            file_path="2-other.json",
+        )
+
+        assert [e.request.file_path for e in mock_client.expectations] == [
+            "1.json",
+            "2.json",
+            "2-other.json",
+        ]
+        assert mock_client.expectations[0].timing.count == 2
+        assert mock_client.expectations[0].occurrences == 2
+        assert [e["times"] for e in local_mock_server.active_expectations[:2]] == [
+            {"remainingTimes": 2},
+            {"remainingTimes": 1},
+        ]
+
+        for i in [1, 2, 1, 2]:
+            post_patient(mock_client, i)
+        mock_client.verify_expectations(test_name=TEST_NAME)
+
+        # merged expectations still expect one request each
+        mock_client.reset()
+        for _ in range(2):
+            mock_client.expect(
+                request=patient_request(1),
+                response=mock_response(),
+                timing=times(1),
+                file_path="1.json",
+            )
+        post_patient(mock_client, 1)
+        with pytest.raises(MockServerVerifyException) as e:
+            mock_client.verify_expectations(test_name=TEST_NAME)
+        assert [type(exception) for exception in e.value.exceptions] == [
+            MockServerExpectationNotFoundException
+        ]
+
+
+def test_async_merge_duplicate_expectations(local_mock_server: LocalMockServer) -> None:
+    async def expect_and_verify() -> None:
+        async with AsyncMockServerClient(
+            base_url=local_mock_server.base_url,
+            duplicate_expectations=DuplicateExpectationPolicy.MERGE,
+        ) as mock_client:
+            await mock_client.reset()
+            await mock_client.expect_many(
+                expectations=[
+                    {
+                        "request": patient_request(i),
+                        "response": mock_response(),
+                        "timing": times(1),
+                        "file_path": f"{i}.json",
+                    }
+                    for i in [1, 2, 1]
+                ]
+            )
+            await mock_client.expect(
+                request=patient_request(2),
+                response=mock_response(),
+                timing=times(1),
+                file_path="2-again.json",
+            )
+            assert [
+                (e.request.file_path, e.timing.count, e.occurrences)
+                for e in mock_client.expectations
+            ] == [("1.json", 2, 2), ("2.json", 2, 2)]
+            # merged while waiting in the batch, then sent on its own after the batch was sent
+            assert [e["times"] for e in local_mock_server.active_expectations] == [
+                {"remainingTimes": 2},
+                {"remainingTimes": 1},
+                {"remainingTimes": 1},
+            ]
+
+            for i in [1, 2, 1, 2]:
+                await asyncio.to_thread(post_patient, mock_client._client, i)
+            await mock_client.verify_expectations(test_name=TEST_NAME)
+
+    asyncio.run(expect_and_verify())
+
+
+def test_merge_compiled_duplicate_expectations(
+    local_mock_server: LocalMockServer,
+) -> None:
+    with MockServerFriendlyClient(
+        base_url=local_mock_server.base_url,
+        duplicate_expectations=DuplicateExpectationPolicy.MERGE,
+    ) as mock_client:
+        mock_client.reset()
+        compiled_expectations = [
+            {
+                "httpRequest": patient_request(i),
+                "httpResponse": mock_response(),
+                "times": times(1).for_expectation(),
+            }
+            for i in [1, 2, 1]
+        ]
+        mock_client.expect_compiled(
+            expectations=compiled_expectations,
+            file_paths=["1.json", "2.json", "1-again.json"],
+        )
+
+        assert [
+            (e.request.file_path, e.timing.count, e.occurrences)
+            for e in mock_client.expectations
+        ] == [("1.json", 2, 2), ("2.json", 1, 1)]
+        assert [e["times"] for e in local_mock_server.active_expectations] == [
+            {"remainingTimes": 2},
+            {"remainingTimes": 1},
+        ]
+        # the compiled expectations are left as they were
+        assert compiled_expectations[0]["times"] == times(1).for_expectation()
+
+        for i in [1, 2, 1]:
+            post_patient(mock_client, i)
+        mock_client.verify_expectations(test_name=TEST_NAME)
@@ -0,0 +1,165 @@
+import json
+import shutil
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+import pytest
+from requests import Response
+
+from mockserver_client.expectation_snapshot import (
+    ExpectationSnapshot,
+    load_expectations_with_snapshot,
+)
+from mockserver_client.mock_requests_loader import load_mock_source_api_json_responses
+from mockserver_client.mockserver_client import MockServerFriendlyClient
+from mockserver_client.mockserver_transport import MockServerTransport
+
+
+class RecordingTransport(MockServerTransport):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: List[Tuple[str, Any]] = []
+
+    def put(
+        self,
+        url: str,
+        *,
+        data: Any = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        self.calls.append((url, json.loads(data) if data else None))
+        response = Response()
+        response.status_code = 201
+        response._content = b""
+        return response
+
+
+def test_expectation_snapshot(tmp_path: Path) -> None:
+    folder = tmp_path.joinpath("expectations")
+    shutil.copytree(
+        Path(__file__).parent.parent.joinpath(
+            "from_file_content_type_form_urlencoded", "expectations"
+        ),
+        folder,
+    )
+    snapshot_path = tmp_path.joinpath("snapshots", "expectations.json")
+    loader_calls: List[str] = []
+
+    def load(client: MockServerFriendlyClient) -> List[str]:
+        loader_calls.append(client.base_url)
+        return load_mock_source_api_json_responses(
+            folder=folder, mock_client=client, url_prefix="api"
+        )
+
+    # load the folder without a snapshot to compare with
+    transport = RecordingTransport()
+    mock_client = MockServerFriendlyClient(
+        base_url="http://mock-server:1080", transport=transport
+    )
+    files = load(mock_client)
+    expected_payloads = [e for _, batch in transport.calls for e in batch]
+    expected_expectations = [
+        (e.request.request, e.response, e.timing.count, e.request.file_path)
+        for e in mock_client.expectations
+    ]
+    assert len(expected_payloads) == len(files) > 1
+
+    for run in range(2):
+        loader_calls.clear()
+        transport = RecordingTransport()
+        mock_client = MockServerFriendlyClient(
+            base_url="http://mock-server:1080", transport=transport
+        )
+        assert (
+            load_expectations_with_snapshot(
+                folder=folder,
+                mock_client=mock_client,
+                load=load,
+                key="load_mock_source_api_json_responses:api",
+                snapshot_path=snapshot_path,
+            )
+            == files
+        )
+        # the snapshot is only compiled on the first run
+        assert len(loader_calls) == (1 if run == 0 else 0)
+        # all the expectations are sent with one call
+        assert transport.calls == [
+            ("http://mock-server:1080/expectation", expected_payloads)
+        ]
+        assert [
+            (e.request.request, e.response, e.timing.count, e.request.file_path)
+            for e in mock_client.expectations
+        ] == expected_expectations
+
+    # a change to the folder compiles the snapshot again
+    folder.joinpath("new.json").write_text(
+        json.dumps({"request_parameters": {"method": "GET"}, "request_result": {}})
+    )
+    loader_calls.clear()
+    mock_client = MockServerFriendlyClient(
+        base_url="http://mock-server:1080", transport=RecordingTransport()
+    )
+    load_expectations_with_snapshot(
+        folder=folder,
+        mock_client=mock_client,
+        load=load,
+        key="load_mock_source_api_json_responses:api",
+        snapshot_path=snapshot_path,
+    )
+    assert len(loader_calls) == 1
+    snapshot = ExpectationSnapshot.read(snapshot_path)
+    assert snapshot is not None
+    assert len(snapshot.expectations) == len(expected_payloads) + 1
+
+
+def test_expectation_snapshot_recording(tmp_path: Path) -> None:
+    folder = tmp_path.joinpath("expectations")
+    shutil.copytree(
+        Path(__file__).parent.parent.joinpath(
+            "from_file_content_type_form_urlencoded", "expectations"
+        ),
+        folder,
+    )
+    snapshot_path = tmp_path.joinpath("snapshots", "expectations.json")
+
+    def load_with_default(client: MockServerFriendlyClient) -> List[str]:
+        files = load_mock_source_api_json_responses(
+            folder=folder, mock_client=client, url_prefix="api"
+        )
+        client.expect_default()
+        return files
+
+    transport = RecordingTransport()
+    mock_client = MockServerFriendlyClient(
+        base_url="http://mock-server:1080", transport=transport
+    )
+    files = load_expectations_with_snapshot(
+        folder=folder,
+        mock_client=mock_client,
+        load=load_with_default,
+        key="load_with_default",
+        snapshot_path=snapshot_path,
+    )
+    # the catch all expectation is kept with its own (missing) file path
+    snapshot = ExpectationSnapshot.read(snapshot_path)
+    assert snapshot is not None
+    assert len(snapshot.expectations) == len(snapshot.file_paths) == len(files) + 1
+    assert snapshot.file_paths[-1] is None
+    assert snapshot.expectations[-1]["httpRequest"] == {}
+    assert len(mock_client.expectations) == len(files) + 1
+
+    # a loader that calls the mock server can't be compiled into a snapshot
+    def load_and_clear(client: MockServerFriendlyClient) -> List[str]:
+        client.clear("/api/*")
+        return []
+
+    with pytest.raises(RuntimeError):
+        load_expectations_with_snapshot(
+            folder=folder,
+            mock_client=mock_client,
+            load=load_and_clear,
+            key="load_and_clear",
+            snapshot_path=tmp_path.joinpath("snapshots", "cleared.json"),
+        )
+    assert not tmp_path.joinpath("snapshots", "cleared.json").exists()
@@ -0,0 +1,92 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, List
+
+from mockserver_client.fixture_cache import FixtureCache
+
+
+def test_fixture_cache(tmp_path: Path) -> None:
+    fixtures_folder = tmp_path.joinpath("fixtures")
+    fixtures_folder.mkdir()
+    files: List[str] = []
+    for i in range(5):
+        file_path = fixtures_folder.joinpath(f"{i}.json")
+        file_path.write_text(json.dumps({"resourceType": "Patient", "id": str(i)}))
+        files.append(str(file_path))
+
+    parsed_texts: List[str] = []
+
+    def parse(text: str) -> Any:
+        parsed_texts.append(text)
+        return json.loads(text)
+
+    cache_folder = tmp_path.joinpath("cache")
+    fixture_cache = FixtureCache(cache_folder=cache_folder, max_workers=3)
+    loaded = list(fixture_cache.load_files(files, parse=parse))
+    # results are in the order of the files
+    assert loaded == [
+        (f, {"resourceType": "Patient", "id": str(i)}) for i, f in enumerate(files)
+    ]
+    assert len(parsed_texts) == 5
+
+    # every load returns new objects so callers can change them
+    loaded[0][1]["id"] = "changed"
+    assert fixture_cache.load_file(files[0], parse=parse)["id"] == "0"
+    assert len(parsed_texts) == 5
+
+    # a new session reads the parsed files from the cache folder
+    parsed_texts.clear()
+    assert [
+        content
+        for _, content in FixtureCache(cache_folder=cache_folder).load_files(
+            files, parse=parse
+        )
+    ] == [{"resourceType": "Patient", "id": str(i)} for i in range(5)]
+    assert parsed_texts == []
+    # the cache folder only holds JSON text, never pickles
+    assert sorted({p.suffix for p in cache_folder.iterdir()}) == [".json"]
+
+    # a file in the cache folder that can't be read is ignored
+    for cache_file_path in cache_folder.iterdir():
+        cache_file_path.write_text("not json")
+    assert FixtureCache(cache_folder=cache_folder).load_file(files[2], parse=parse) == {
+        "resourceType": "Patient",
+        "id": "2",
+    }
+    assert len(parsed_texts) == 1
+    parsed_texts.clear()
+
+    # a changed file is parsed again
+    Path(files[1]).write_text(json.dumps({"resourceType": "Patient", "id": "new"}))
+    stat = os.stat(files[1])
+    os.utime(files[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert FixtureCache(cache_folder=cache_folder).load_file(files[1], parse=parse) == {
+        "resourceType": "Patient",
+        "id": "new",
+    }
+    assert len(parsed_texts) == 1
+
+    # without a cache folder, parsed files are only kept in memory
+    memory_cache = FixtureCache(cache_folder=None, max_entries=2)
+    memory_cache.cache_folder = None
+    list(memory_cache.load_files(files, parse=parse))
+    assert len(parsed_texts) == 6
+    assert memory_cache.load_file(files[4], parse=parse)["id"] == "4"
+    assert len(parsed_texts) == 6
+    assert memory_cache.load_file(files[0], parse=parse)["id"] == "0"
+    assert len(parsed_texts) == 7
+
+    # files parsed with json.loads are read again every time and never cached
+    json_cache_folder = tmp_path.joinpath("json_cache")
+    json_cache = FixtureCache(cache_folder=json_cache_folder)
+    assert [content["id"] for _, content in json_cache.load_files(files)] == [
+        "0",
+        "new",
+        "2",
+        "3",
+        "4",
+    ]
+    assert json_cache.load_file(files[0]) == {"resourceType": "Patient", "id": "0"}
+    assert not json_cache_folder.exists()
+    assert json_cache._entries == {}
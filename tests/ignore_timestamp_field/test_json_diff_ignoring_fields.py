@@ -0,0 +1,106 @@
+from typing import Any, Dict, List, Optional
+
+from mockserver_client.mockserver_client import MockServerFriendlyClient
+
+
+def get_differences(
+    expected: List[Dict[str, Any]],
+    actual: List[Dict[str, Any]],
+    ignored_field_names: Optional[List[str]] = None,
+) -> List[str]:
+    return MockServerFriendlyClient._deep_diff_diff_dict_to_string_list(
+        difference=MockServerFriendlyClient.compare_dicts(
+            dict_1=expected,
+            dict_2=actual,
+            ignore_timestamp_field=True,
+            ignored_field_names=ignored_field_names,
+        )
+    )
+
+
+def test_json_diff_ignores_timestamp_values_and_order() -> None:
+    expected = [
+        {
+            "grant_type": "client_credentials",
+            "notificationEvent": [
+                {"eventNumber": "1", "timestamp": "${json-unit.ignore}"},
+                {"eventNumber": "2", "timestamp": "${json-unit.ignore}"},
+            ],
+        }
+    ]
+    actual = [
+        {
+            "notificationEvent": [
+                {"eventNumber": "2", "timestamp": "2023-11-28T00:20:56+00:00"},
+                {"eventNumber": "1", "timestamp": "2023-11-29T00:20:56+00:00"},
+            ],
+            "grant_type": "client_credentials",
+        }
+    ]
+    assert get_differences(expected, actual) == []
+
+
+def test_json_diff_reports_missing_timestamp_after_value_changes() -> None:
+    expected = [
+        {
+            "grant_type": "client_credentials",
+            "notificationEvent": [
+                {"eventNumber": "1", "timestamp": "${json-unit.ignore}"},
+                {"eventNumber": "2", "timestamp": "${json-unit.ignore}"},
+            ],
+        }
+    ]
+    actual = [
+        {
+            "grant_type": "client",
+            "notificationEvent": [
+                {"eventNumber": "1", "timestamp": "2023-11-28T00:20:56+00:00"},
+                {"eventNumber": "2"},
+            ],
+        }
+    ]
+    assert get_differences(expected, actual) == [
+        "values_changed: root[0]['grant_type']={'new_value': 'client', 'old_value': 'client_credentials'}",
+        "dictionary_item_removed: root[0]['notificationEvent'][1]['timestamp']",
+    ]
+
+
+def test_json_diff_reports_missing_timestamp_without_value_changes() -> None:
+    expected = [{"id": "1", "meta": {"lastUpdated": "2023-11-28", "source": "a"}}]
+    actual = [{"id": "1", "meta": {"source": "a"}}]
+    assert get_differences(expected, actual) == [
+        "dictionary_item_removed: root[0]['meta']['lastUpdated']"
+    ]
+    assert get_differences(expected, actual, ignored_field_names=["lastUpdated"]) == [
+        "dictionary_item_removed: root[0]['meta']['lastUpdated']"
+    ]
+
+
+def test_json_diff_custom_ignored_field_names() -> None:
+    expected = [{"id": "1", "meta": {"lastUpdated": "2023-11-28", "versionId": "1"}}]
+    actual = [{"id": "1", "meta": {"lastUpdated": "2024-01-01", "versionId": "2"}}]
+    assert (
+        get_differences(
+            expected, actual, ignored_field_names=["lastUpdated", "versionId"]
+        )
+        == []
+    )
+    assert get_differences(expected, actual) == [
+        "values_changed: root[0]['meta']['lastUpdated']={'new_value': '2024-01-01', 'old_value': '2023-11-28'}",
+        "values_changed: root[0]['meta']['versionId']={'new_value': '2', 'old_value': '1'}",
+    ]
+
+
+def test_json_diff_reports_removed_list_item() -> None:
+    expected = [
+        {
+            "notificationEvent": [
+                {"eventNumber": "1", "timestamp": "${json-unit.ignore-element}"},
+                {"eventNumber": "2", "timestamp": "${json-unit.ignore-element}"},
+            ]
+        }
+    ]
+    actual = [{"notificationEvent": [{"eventNumber": "1", "timestamp": "2023-11-28"}]}]
+    assert get_differences(expected, actual) == [
+        "iterable_item_removed: root[0]['notificationEvent'][1]"
+    ]
@@ -0,0 +1,145 @@
+import json
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+import pytest
+import requests
+
+from mockserver_client.instrumentation import (
+    BODY_COMPARISONS,
+    BYTES_RECEIVED,
+    BYTES_SENT,
+    CALL,
+    CALLS,
+    COMPARE_DICTS,
+    DEEP_DIFF_INVOCATIONS,
+    EXPECTATIONS,
+    FINGERPRINT_HITS,
+    MATCH,
+    RETRIEVE_PARSE,
+    RETRIEVED_REQUESTS,
+    VERIFY,
+    ClientInstrumentation,
+)
+from mockserver_client.local_mock_server import LocalMockServer
+from mockserver_client.mockserver_client import (
+    MockServerFriendlyClient,
+    mock_request,
+    mock_response,
+    times,
+)
+from mockserver_client.mockserver_verify_exception import MockServerVerifyException
+
+
+@pytest.fixture(scope="module")
+def local_mock_server() -> Iterator[LocalMockServer]:
+    with LocalMockServer() as mock_server:
+        yield mock_server
+
+
+def expect_and_send(
+    mock_client: MockServerFriendlyClient, *, expected: Any, sent: Any
+) -> None:
+    mock_client.reset()
+    mock_client.expect(
+        request=mock_request(
+            path="/test_instrumentation/1", method="POST", body={"json": expected}
+        ),
+        response=mock_response(body=json.dumps({"ok": True})),
+        timing=times(1),
+        file_path="test_instrumentation.json",
+    )
+    requests.post(f"{mock_client.base_url}/test_instrumentation/1", json=sent)
+
+
+def test_instrumentation_is_disabled_by_default(
+    local_mock_server: LocalMockServer,
+) -> None:
+    with MockServerFriendlyClient(base_url=local_mock_server.base_url) as mock_client:
+        expect_and_send(mock_client, expected={"id": "1"}, sent={"id": "1"})
+        mock_client.verify_expectations(test_name="test_instrumentation")
+
+        assert mock_client.stats.counters == {}
+        assert mock_client.stats.timings == {}
+
+
+def test_instrumentation_collects_stats(local_mock_server: LocalMockServer) -> None:
+    with MockServerFriendlyClient(
+        base_url=local_mock_server.base_url,
+        instrumentation=ClientInstrumentation(enabled=True),
+    ) as mock_client:
+        expect_and_send(mock_client, expected={"id": "1"}, sent={"id": "1"})
+        mock_client.verify_expectations(test_name="test_instrumentation")
+
+        stats = mock_client.stats
+        # reset, expectation and retrieve
+        assert stats.get_counter(CALLS) == 3
+        assert stats.get_counter(BYTES_SENT) > 0
+        assert stats.get_counter(BYTES_RECEIVED) > 0
+        assert stats.get_counter(EXPECTATIONS) == 1
+        assert stats.get_counter(RETRIEVED_REQUESTS) == 1
+        # identical bodies are matched from their fingerprints
+        assert stats.get_counter(FINGERPRINT_HITS) >= 1
+        assert stats.get_counter(BODY_COMPARISONS) == 0
+        assert stats.timings[CALL].count == 3
+        for phase in [RETRIEVE_PARSE, VERIFY, MATCH]:
+            assert stats.timings[phase].count == 1
+        assert stats.get_total_seconds(VERIFY) >= stats.get_total_seconds(MATCH)
+        assert "call: 3 in" in str(stats)
+
+        stats.reset()
+        assert stats.to_dict() == {"counters": {}, "timings": {}}
+
+
+def test_instrumentation_counts_body_comparisons(
+    local_mock_server: LocalMockServer,
+) -> None:
+    with MockServerFriendlyClient(
+        base_url=local_mock_server.base_url,
+        instrumentation=ClientInstrumentation(enabled=True),
+    ) as mock_client:
+        expect_and_send(
+            mock_client,
+            expected={"id": "1", "name": "a"},
+            sent={"id": "1", "name": "b"},
+        )
+        with pytest.raises(MockServerVerifyException):
+            mock_client.verify_expectations(test_name="test_instrumentation")
+
+        assert mock_client.stats.get_counter(BODY_COMPARISONS) >= 1
+        assert mock_client.stats.get_counter(DEEP_DIFF_INVOCATIONS) >= 1
+        assert mock_client.stats.timings[COMPARE_DICTS].count >= 1
+
+
+def test_instrumentation_hooks_and_tracer(local_mock_server: LocalMockServer) -> None:
+    phases: List[Tuple[str, float, Dict[str, Any]]] = []
+    spans: List[Tuple[str, Dict[str, Any]]] = []
+
+    class Tracer:
+        @contextmanager
+        def start_as_current_span(
+            self, name: str, *, attributes: Dict[str, Any]
+        ) -> Iterator[None]:
+            spans.append((name, attributes))
+            yield
+
+    with MockServerFriendlyClient(
+        base_url=local_mock_server.base_url,
+        instrumentation=ClientInstrumentation(
+            enabled=True,
+            hooks=[
+                lambda name, seconds, attributes: phases.append(
+                    (name, seconds, attributes)
+                )
+            ],
+            tracer=Tracer(),
+        ),
+    ) as mock_client:
+        mock_client.reset()
+
+    assert [name for name, _, _ in phases] == [CALL]
+    _, seconds, attributes = phases[0]
+    assert seconds >= 0
+    assert attributes["command"] == "reset"
+    assert attributes["status_code"] == 200
+    assert spans == [(CALL, attributes)]
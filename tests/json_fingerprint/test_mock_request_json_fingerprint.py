@@ -0,0 +1,42 @@
+import json
+from typing import Any
+
+from mockserver_client.mock_request import MockRequest
+
+
+def make_request(body: Any, index: int = 0) -> MockRequest:
+    return MockRequest(
+        request={
+            "method": "POST",
+            "path": "/test_json_fingerprint",
+            "body": {"type": "JSON", "json": json.dumps(body)},
+        },
+        index=index,
+        file_path=None,
+    )
+
+
+def test_json_fingerprint_ignores_key_and_item_order() -> None:
+    request1 = make_request(
+        {"resourceType": "Patient", "id": "1", "name": [{"given": "a"}, {"given": "b"}]}
+    )
+    request2 = make_request(
+        {"name": [{"given": "b"}, {"given": "a"}], "id": "1", "resourceType": "Patient"}
+    )
+    assert request1.has_same_json_fingerprint(request2)
+    assert request1.get_json_fingerprint() is request1.get_json_fingerprint()
+
+    request3 = make_request({"resourceType": "Patient", "id": "1", "name": 1})
+    request4 = make_request({"resourceType": "Patient", "id": "1", "name": 1.0})
+    assert not request3.has_same_json_fingerprint(request4)
+
+
+def test_json_fingerprint_ignore_timestamp_field() -> None:
+    request1 = make_request({"id": "1", "timestamp": "2023-11-28T00:20:56+00:00"})
+    request2 = make_request({"id": "1", "timestamp": "2024-01-01T00:00:00+00:00"})
+    request3 = make_request({"id": "1"})
+
+    assert not request1.has_same_json_fingerprint(request2)
+    assert request1.has_same_json_fingerprint(request2, ignore_timestamp_field=True)
+    # the timestamp field still has to be present
+    assert not request1.has_same_json_fingerprint(request3, ignore_timestamp_field=True)
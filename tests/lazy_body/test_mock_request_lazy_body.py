@@ -0,0 +1,77 @@
+import pytest
+
+from mockserver_client.mock_request import MockRequest
+from mockserver_client.mock_request_response import MockRequestResponse
+from mockserver_client.mockserver_client import MockServerFriendlyClient
+from mockserver_client.mockserver_verify_exception import MockServerVerifyException
+
+
+def test_mock_request_lazy_body() -> None:
+    request = MockRequest(
+        request={
+            "method": "POST",
+            "path": "/test_mock_request_lazy_body/1",
+            "body": '{"resourceType": "Patient", "id": "1"}',
+        },
+        index=0,
+        file_path=None,
+    )
+    assert request.json_list == [{"resourceType": "Patient", "id": "1"}]
+    assert request.body_list == [{"resourceType": "Patient", "id": "1"}]
+
+
+def test_mock_request_lazy_body_not_parsed_for_other_tests() -> None:
+    test_name = "test_mock_request_lazy_body_not_parsed_for_other_tests"
+    # the body of a request for another test is not valid json, so it would fail if it was parsed
+    other_request = MockRequest(
+        request={"method": "POST", "path": "/other_test/1", "body": "{not json"},
+        index=0,
+        file_path=None,
+    )
+    request = MockRequest(
+        request={"method": "GET", "path": f"/{test_name}/1"},
+        index=1,
+        file_path=None,
+    )
+    mock_client = MockServerFriendlyClient(base_url="http://mock-server:1080")
+    with pytest.raises(MockServerVerifyException):
+        mock_client.verify_recorded_requests(
+            recorded_requests=[other_request, request],
+            recorded_request_responses=[],
+            test_name=test_name,
+        )
+    assert other_request._is_body_parsed is False
+    with pytest.raises(ValueError):
+        _ = other_request.json_list
+
+
+def test_mock_response_lazy_body() -> None:
+    request_response = MockRequestResponse(
+        request={"method": "GET", "path": "/test_mock_response_lazy_body"},
+        response={"statusCode": 200, "body": '[{"id": "1"}]'},
+        index=0,
+    )
+    response = request_response.response
+    assert response is not None
+    assert response._parsed_body is None
+    assert response.status_code == 200
+
+    # the body is parsed once
+    json_body = response.json_body
+    assert json_body == [{"id": "1"}]
+    assert response._parsed_body is not None
+    assert response.json_body is json_body
+    assert response.raw_body == '[{"id": "1"}]'
+
+    # the attributes can still be assigned
+    response.json_body = {"id": "2"}
+    response.raw_body = '{"id": "2"}'
+    response.status_code = 201
+    assert (response.json_body, response.raw_body, response.status_code) == (
+        {"id": "2"},
+        '{"id": "2"}',
+        201,
+    )
+    request_response.raw_request = None
+    request_response.raw_response = {"statusCode": 404}
+    assert request_response.raw_response == {"statusCode": 404}
@@ -0,0 +1,220 @@
+import json
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+import requests
+
+from mockserver_client.local_mock_server import LocalMockServer
+from mockserver_client.mock_requests_loader import load_mock_fhir_requests_from_folder
+from mockserver_client.mockserver_client import (
+    MockServerFriendlyClient,
+    json_contains,
+    json_equals,
+    mock_request,
+    mock_response,
+    text_equals,
+    times,
+    times_any,
+)
+from mockserver_client.mockserver_verify_exception import MockServerVerifyException
+
+
+@pytest.fixture(scope="module")
+def local_mock_server() -> Iterator[LocalMockServer]:
+    with LocalMockServer() as mock_server:
+        yield mock_server
+
+
+@pytest.fixture
+def mock_client(
+    local_mock_server: LocalMockServer,
+) -> Iterator[MockServerFriendlyClient]:
+    with MockServerFriendlyClient(base_url=local_mock_server.base_url) as mock_client:
+        mock_client.reset()
+        yield mock_client
+
+
+def test_local_mock_server_verifies_expectations(
+    mock_client: MockServerFriendlyClient,
+) -> None:
+    test_name = "test_local_mock_server"
+    mock_client.expect(
+        request=mock_request(
+            path=f"/{test_name}",
+            method="POST",
+            body={"json": {"client_id": "unitypoint_bwell", "grant_type": "client"}},
+        ),
+        response=mock_response(body=json.dumps({"access_token": "fake"})),
+        timing=times(1),
+        file_path=None,
+    )
+
+    response = requests.post(
+        f"{mock_client.base_url}/{test_name}",
+        json={"grant_type": "client", "client_id": "unitypoint_bwell"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"access_token": "fake"}
+    mock_client.verify_expectations(test_name=test_name)
+
+
+def test_local_mock_server_reports_missing_requests(
+    mock_client: MockServerFriendlyClient,
+) -> None:
+    test_name = "test_local_mock_server_missing"
+    mock_client.expect(
+        request=mock_request(path=f"/{test_name}/1", method="GET"),
+        response=mock_response(),
+        timing=times(1),
+        file_path=None,
+    )
+
+    # unmatched requests get a 404 like in the MockServer
+    assert requests.get(f"{mock_client.base_url}/{test_name}/2").status_code == 404
+
+    with pytest.raises(MockServerVerifyException) as e:
+        mock_client.verify_expectations(test_name=test_name)
+    assert len(e.value.exceptions) == 2
+
+
+def test_local_mock_server_loads_fhir_folder(
+    mock_client: MockServerFriendlyClient, tmp_path: Path
+) -> None:
+    patients = [
+        {"resourceType": "Patient", "id": str(i), "name": [{"family": f"Doe{i}"}]}
+        for i in range(3)
+    ]
+    tmp_path.joinpath("Patient").mkdir()
+    for patient in patients:
+        tmp_path.joinpath("Patient", f"{patient['id']}.json").write_text(
+            json.dumps(patient)
+        )
+
+    load_mock_fhir_requests_from_folder(
+        folder=tmp_path, mock_client=mock_client, url_prefix="test_fhir"
+    )
+    for patient in patients:
+        response = requests.post(
+            f"{mock_client.base_url}/test_fhir/4_0_0/Patient/{patient['id']}/$merge",
+            headers={"Content-Type": "application/fhir+json"},
+            data=json.dumps(patient),
+        )
+        assert response.status_code == 200
+
+    mock_client.verify_expectations(test_name="test_fhir")
+
+
+def test_local_mock_server_json_match_types(
+    local_mock_server: LocalMockServer, mock_client: MockServerFriendlyClient
+) -> None:
+    payload = {"id": "1", "items": [{"a": 1}, {"b": 2}]}
+    mock_client.stub(
+        request=mock_request(path="/strict", body=json_equals(payload)),
+        response=mock_response(code=201),
+        timing=times_any(),
+    )
+    mock_client.stub(
+        request=mock_request(path="/contains", body=json_contains({"id": "1"})),
+        response=mock_response(code=202),
+        timing=times_any(),
+    )
+    url: str = local_mock_server.base_url
+
+    assert requests.post(f"{url}/strict", json=payload).status_code == 201
+    # STRICT needs the same fields and the same array order
+    assert (
+        requests.post(f"{url}/strict", json={**payload, "extra": True}).status_code
+        == 404
+    )
+    assert (
+        requests.post(
+            f"{url}/strict", json={"id": "1", "items": [{"b": 2}, {"a": 1}]}
+        ).status_code
+        == 404
+    )
+    # ONLY_MATCHING_FIELDS allows other fields
+    assert (
+        requests.post(f"{url}/contains", json={**payload, "extra": True}).status_code
+        == 202
+    )
+    assert requests.post(f"{url}/contains", json={"id": "2"}).status_code == 404
+
+
+def test_local_mock_server_times_and_string_bodies(
+    local_mock_server: LocalMockServer, mock_client: MockServerFriendlyClient
+) -> None:
+    mock_client.stub(
+        request=mock_request(path="/text", method="POST", body=text_equals("abc")),
+        response=mock_response(body="first"),
+        timing=times(2),
+    )
+    url: str = local_mock_server.base_url
+
+    assert requests.post(f"{url}/text", data="abcd").status_code == 404
+    assert requests.post(f"{url}/text", data="abc").text == "first"
+    assert local_mock_server.active_expectations[0]["times"] == {"remainingTimes": 1}
+    assert requests.post(f"{url}/text", data="abc").text == "first"
+    # the expectation is used up
+    assert requests.post(f"{url}/text", data="abc").status_code == 404
+    assert local_mock_server.active_expectations == []
+
+
+def test_local_mock_server_priority(
+    local_mock_server: LocalMockServer, mock_client: MockServerFriendlyClient
+) -> None:
+    local_mock_server.add_expectations(
+        [
+            {
+                "httpRequest": {"path": "/items/.*"},
+                "httpResponse": {"body": "any"},
+            },
+            {
+                "httpRequest": {"path": "/items/1"},
+                "httpResponse": {"body": "one"},
+                "priority": 10,
+            },
+        ]
+    )
+    url: str = local_mock_server.base_url
+
+    assert requests.get(f"{url}/items/1").text == "one"
+    assert requests.get(f"{url}/items/2").text == "any"
+
+
+def test_local_mock_server_clear_and_retrieve(
+    local_mock_server: LocalMockServer, mock_client: MockServerFriendlyClient
+) -> None:
+    for path in ["/keep/1", "/drop/1"]:
+        mock_client.stub(
+            request=mock_request(path=path),
+            response=mock_response(body=path),
+            timing=times_any(),
+        )
+        requests.get(f"{local_mock_server.base_url}{path}", params={"a": "1"})
+
+    mock_client.clear("/drop/.*")
+
+    assert [
+        e["httpRequest"]["path"] for e in local_mock_server.active_expectations
+    ] == ["/keep/1"]
+    recorded_requests, request_responses = (
+        mock_client.retrieve_requests_and_request_responses()
+    )
+    assert [r.path for r in recorded_requests] == ["/keep/1"]
+    assert recorded_requests[0].querystring_params == {"a": ["1"]}
+    assert request_responses[0].response is not None
+    assert request_responses[0].response.raw_body == "/keep/1"
+    assert mock_client.retrieve_requests(request_filter={"path": "/other/.*"}) == []
+
+
+def test_local_mock_server_rejects_unsupported_expectations(
+    local_mock_server: LocalMockServer,
+) -> None:
+    response = requests.put(
+        f"{local_mock_server.base_url}/mockserver/expectation",
+        json={"httpRequest": {"path": "/forward"}, "httpForward": {"host": "x"}},
+    )
+
+    assert response.status_code == 400
@@ -0,0 +1,159 @@
+import json
+from typing import Any, Dict, List
+
+from mockserver_client.exceptions.mock_server_expectation_not_found_exception import (
+    MockServerExpectationNotFoundException,
+)
+from mockserver_client.exceptions.mock_server_json_content_mismatch_exception import (
+    MockServerJsonContentMismatchException,
+)
+from mockserver_client.exceptions.mock_server_request_not_found_exception import (
+    MockServerRequestNotFoundException,
+)
+from mockserver_client.mock_expectation import MockExpectation
+from mockserver_client.mock_request import MockRequest
+from mockserver_client.mock_request_index import MockRequestIndex
+from mockserver_client.mockserver_client import (
+    MockServerFriendlyClient,
+    json_equals,
+    mock_request,
+    times,
+)
+
+
+def recorded_request(
+    index: int, path: str, body: Dict[str, Any], querystring: Dict[str, Any] | None
+) -> MockRequest:
+    request: Dict[str, Any] = {
+        "method": "POST",
+        "path": path,
+        "body": {"type": "JSON", "json": json.dumps(body)},
+    }
+    if querystring:
+        request["queryStringParameters"] = querystring
+    return MockRequest(request=request, index=index, file_path=None)
+
+
+def test_match_to_recorded_requests_uses_index() -> None:
+    test_name = "test_match_to_recorded_requests_uses_index"
+    # no calls are made to the mock server when matching
+    mock_client = MockServerFriendlyClient(base_url="http://mock-server:1080")
+
+    count = 200
+    for i in range(count):
+        mock_client.expectations.append(
+            MockExpectation(
+                request=mock_request(
+                    method="POST",
+                    path=f"/{test_name}/Patient/{i}/$merge",
+                    querystring={"smartMerge": "false"},
+                    body=json_equals({"resourceType": "Patient", "id": str(i)}),
+                ),
+                response={},
+                timing=times(1),
+                index=i,
+                file_path=f"{i}.json",
+            )
+        )
+
+    # requests arrive in reverse order, one has a different body and one was never expected
+    recorded_requests: List[MockRequest] = [
+        recorded_request(
+            index=index,
+            path=f"/{test_name}/Patient/{i}/$merge",
+            body={"resourceType": "Patient", "id": str(i)}
+            if i != 5
+            else {"resourceType": "Patient", "id": "5", "active": True},
+            querystring={"smartMerge": ["false"]},
+        )
+        for index, i in enumerate(reversed(range(count)))
+    ]
+    recorded_requests.append(
+        recorded_request(
+            index=count,
+            path=f"/{test_name}/Patient/unexpected/$merge",
+            body={"resourceType": "Patient", "id": "unexpected"},
+            querystring=None,
+        )
+    )
+
+    result = mock_client.match_to_recorded_requests(recorded_requests=recorded_requests)
+
+    assert len(result.found_expectations) == count - 1
+    assert [type(e) for e in result.exceptions] == [
+        MockServerJsonContentMismatchException,
+        MockServerExpectationNotFoundException,
+        MockServerRequestNotFoundException,
+    ]
+    mismatch = result.exceptions[0]
+    assert isinstance(mismatch, MockServerJsonContentMismatchException)
+    assert mismatch.url == f"/{test_name}/Patient/5/$merge"
+    assert mismatch.differences == ["dictionary_item_added: root[0]['active']"]
+
+
+def test_mock_request_index_candidates_are_ordered() -> None:
+    requests: List[MockRequest] = [
+        recorded_request(
+            index=i,
+            path="/test_mock_request_index/Patient/$merge",
+            body={"resourceType": "Patient", "id": str(i % 3)},
+            querystring={"smartMerge": ["false"]},
+        )
+        for i in range(9)
+    ]
+    index = MockRequestIndex(requests)
+    index.remove(requests[3])
+
+    candidates = list(index.candidates_matching_url(requests[0]))
+    assert [c.index for c in candidates] == [0, 6]
+    assert len(index) == 8
+    assert requests[3] not in index
+
+
+def test_querystring_key_is_normalized_once() -> None:
+    path = "/test_querystring_key/Patient"
+    expected = MockRequest(
+        request=mock_request(
+            method="POST", path=path, querystring={"id": ["1"], "_count": ["10"]}
+        ),
+        index=0,
+        file_path=None,
+    )
+    # the mock server returns the query string as a list of name/values in any order
+    recorded = MockRequest(
+        request={
+            "method": "POST",
+            "path": path,
+            "queryStringParameters": [
+                {"name": "_count", "values": ["10"]},
+                {"name": "id", "values": ["1"]},
+            ],
+        },
+        index=0,
+        file_path=None,
+    )
+    assert expected.querystring_key == (("_count", ("10",)), ("id", ("1",)))
+    assert expected.querystring_key == recorded.querystring_key
+    assert hash(expected.querystring_key) == hash(recorded.querystring_key)
+    assert expected.matches_without_body(recorded)
+    assert MockServerFriendlyClient.does_request_match(
+        request1=expected, request2=recorded, check_body=False
+    )
+    assert MockRequestIndex.get_url_key(expected) == MockRequestIndex.get_url_key(
+        recorded
+    )
+
+    other = MockRequest(
+        request=mock_request(method="POST", path=path, querystring={"id": ["2"]}),
+        index=1,
+        file_path=None,
+    )
+    assert not MockServerFriendlyClient.does_request_match(
+        request1=expected, request2=other, check_body=False
+    )
+    assert (
+        MockRequest(
+            request=mock_request(method="POST", path=path), index=2, file_path=None
+        ).querystring_key
+        is None
+    )
@@ -0,0 +1,83 @@
+import logging
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+import requests
+
+from mockserver_client.local_mock_server import LocalMockServer
+from mockserver_client.match_reporter import MatchReporter
+from mockserver_client.mockserver_client import (
+    MockServerFriendlyClient,
+    mock_request,
+    mock_response,
+    times,
+)
+
+
+class NotFormatted:
+    def __str__(self) -> str:
+        raise AssertionError("item was formatted")
+
+
+def test_match_reporter_does_not_format_when_disabled() -> None:
+    logger = logging.getLogger("test_match_reporter_disabled")
+    logger.setLevel(logging.INFO)
+    match_reporter = MatchReporter(logger=logger)
+
+    assert not match_reporter.is_enabled
+    match_reporter.dump(title="EXPECTATIONS", items=[NotFormatted()])
+
+
+def test_match_reporter_logs_each_item(caplog: pytest.LogCaptureFixture) -> None:
+    logger = logging.getLogger("test_match_reporter_logs")
+    match_reporter = MatchReporter(logger=logger)
+    with caplog.at_level(logging.DEBUG, logger=logger.name):
+        match_reporter.dump(title="REQUESTS", items=["a", "b"])
+
+    assert [record.getMessage() for record in caplog.records] == [
+        "-------- REQUESTS --------",
+        "a",
+        "b",
+        "-------- END REQUESTS --------",
+    ]
+
+
+def test_match_reporter_writes_to_report_file(tmp_path: Path) -> None:
+    report_file: Path = tmp_path.joinpath("reports", "match_report.txt")
+    items: List[Any] = ["a", 1]
+    MatchReporter(
+        logger=logging.getLogger("test_match_reporter_file"), report_file=report_file
+    ).dump(title="REQUESTS", items=items)
+
+    assert report_file.read_text() == (
+        "-------- REQUESTS --------\na\n1\n-------- END REQUESTS --------\n"
+    )
+
+
+def test_verify_expectations_writes_match_report(tmp_path: Path) -> None:
+    report_file: Path = tmp_path.joinpath("match_report.txt")
+    with (
+        LocalMockServer() as local_mock_server,
+        MockServerFriendlyClient(
+            base_url=local_mock_server.base_url, match_report_file=report_file
+        ) as mock_client,
+    ):
+        mock_client.expect(
+            request=mock_request(path="/test_match_reporter/1", method="GET"),
+            response=mock_response(body="ok"),
+            timing=times(1),
+        )
+        requests.get(f"{mock_client.base_url}/test_match_reporter/1")
+        mock_client.verify_expectations(test_name="test_match_reporter")
+
+    lines: List[str] = report_file.read_text().splitlines()
+    assert [line for line in lines if line.startswith("--------")] == [
+        "-------- ALL RETRIEVED REQUESTS --------",
+        "-------- END ALL RETRIEVED REQUESTS --------",
+        "-------- EXPECTATIONS --------",
+        "-------- END EXPECTATIONS --------",
+        "-------- REQUESTS --------",
+        "-------- END REQUESTS --------",
+    ]
+    assert sum("/test_match_reporter/1" in line for line in lines) == 3
@@ -0,0 +1,94 @@
+import gc
+import json
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from mockserver_client.mock_request_response import MockRequestResponse
+
+
+class Unslotted:
+    pass
+
+
+def copy_with_slots(model: Any) -> Any:
+    copied = object.__new__(type(model))
+    for name in type(model).__slots__:
+        if hasattr(model, name):
+            object.__setattr__(copied, name, getattr(model, name))
+    return copied
+
+
+def copy_without_slots(model: Any) -> Any:
+    copied = Unslotted()
+    for name in type(model).__slots__:
+        if hasattr(model, name):
+            setattr(copied, name, getattr(model, name))
+    return copied
+
+
+def get_memory_used(create: Callable[[], List[Any]]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        created = create()
+        used, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert created
+    return used
+
+
+def get_recorded_request_response(index: int) -> Dict[str, Any]:
+    return {
+        "httpRequest": {
+            "method": "POST",
+            "path": f"/test_memory_per_request/4_0_0/Patient/{index}/$merge",
+            "headers": {"Content-Type": ["application/fhir+json"]},
+            "queryStringParameters": {"smartMerge": ["false"]},
+            "body": {
+                "type": "JSON",
+                "json": {
+                    "resourceType": "Patient",
+                    "id": str(index),
+                    "name": [{"family": f"Family{index}", "given": ["Given"]}],
+                },
+            },
+        },
+        "httpResponse": {
+            "statusCode": 200,
+            "body": json.dumps([{"id": str(index), "created": True}]),
+        },
+    }
+
+
+def test_memory_per_request() -> None:
+    count = 10000
+    raw_request_responses: List[Dict[str, Any]] = [
+        get_recorded_request_response(i) for i in range(count)
+    ]
+    request_responses = [
+        MockRequestResponse(
+            request=r["httpRequest"], response=r["httpResponse"], index=i
+        )
+        for i, r in enumerate(raw_request_responses)
+    ]
+    # parse the bodies as matching does
+    for request_response in request_responses:
+        assert request_response.request is not None
+        assert request_response.request.json_list
+    models: List[Any] = [
+        model
+        for request_response in request_responses
+        for model in (
+            request_response,
+            request_response.request,
+            request_response.response,
+        )
+    ]
+
+    # the model objects hold the same values with and without slots so only their own memory is compared
+    used_with_slots = get_memory_used(lambda: [copy_with_slots(m) for m in models])
+    used_without_slots = get_memory_used(
+        lambda: [copy_without_slots(m) for m in models]
+    )
+    assert used_with_slots < used_without_slots
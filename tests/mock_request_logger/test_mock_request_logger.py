@@ -0,0 +1,113 @@
+import io
+import logging
+from pathlib import Path
+
+import pytest
+
+from mockserver_client.mock_request_logger import MockRequestLogger
+from mockserver_client.mockserver_client import (
+    MockServerFriendlyClient,
+    mock_request,
+    mock_response,
+    times,
+)
+
+REQUEST = {
+    "method": "POST",
+    "path": "/test/Patient",
+    "queryStringParameters": {"id": ["1", "2"]},
+    "body": {"json": {"resourceType": "Patient", "name": "x" * 100}},
+}
+RESPONSE = {"body": '{"ok": true}'}
+
+
+def test_mock_request_logger_is_lazy_when_level_is_disabled() -> None:
+    logger = logging.getLogger("test_mock_request_logger_is_lazy")
+    logger.setLevel(logging.INFO)
+
+    class NotFormatted:
+        def __str__(self) -> str:
+            raise AssertionError("body was formatted")
+
+    request_logger = MockRequestLogger(logger=logger)
+    assert not request_logger.is_enabled
+    request_logger.log_request(
+        file_path=None,
+        base_url="http://mock-server:1080",
+        request={"path": "/test", "body": NotFormatted()},
+    )
+
+
+def test_mock_request_logger_truncates_bodies(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    logger = logging.getLogger("test_mock_request_logger_truncates")
+    request_logger = MockRequestLogger(
+        logger=logger, level=logging.INFO, max_body_length=20
+    )
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        request_logger.log_request(
+            file_path="patient.json",
+            base_url="http://mock-server:1080",
+            request=REQUEST,
+            response=RESPONSE,
+        )
+
+    assert len(caplog.records) == 1
+    message: str = caplog.records[0].getMessage()
+    assert message == (
+        "Mocking: POST http://mock-server:1080/test/Patient?id=1,2, from: (patient.json)"
+        ", body: {'json': {'resourceT... (129 more characters)"
+        ', response: {"ok": true}'
+    )
+
+
+def test_mock_request_logger_writes_to_sink(tmp_path: Path) -> None:
+    sink_path: Path = tmp_path.joinpath("mocked_requests.log")
+    request_logger = MockRequestLogger(
+        logger=logging.getLogger("test_mock_request_logger_sink"),
+        max_body_length=None,
+        sink=sink_path,
+    )
+    assert request_logger.is_enabled
+    for index in range(100):
+        request_logger.log_request(
+            file_path=None,
+            base_url="http://mock-server:1080",
+            request={"path": f"/test/{index}", "body": {"id": index}},
+        )
+    request_logger.close()
+
+    lines = sink_path.read_text().splitlines()
+    assert len(lines) == 100
+    assert lines[0] == "Mocking: GET http://mock-server:1080/test/0, body: {'id': 0}"
+    assert lines[99] == "Mocking: GET http://mock-server:1080/test/99, body: {'id': 99}"
+
+    stream = io.StringIO()
+    request_logger = MockRequestLogger(sink=stream)
+    request_logger.log_request(
+        file_path=None, base_url="http://mock-server:1080", request={"path": "/test"}
+    )
+    request_logger.close()
+    assert stream.getvalue() == "Mocking: GET http://mock-server:1080/test\n"
+
+
+def test_mock_server_client_uses_request_logger() -> None:
+    stream = io.StringIO()
+    request_logger = MockRequestLogger(sink=stream)
+    mock_client = MockServerFriendlyClient(
+        base_url="http://mock-server:1080", request_logger=request_logger
+    )
+    # only record the expectation, there is no MockServer to send it to
+    mock_client._add_expectation(
+        request=mock_request(path="/test/1", method="GET"),
+        response=mock_response(body="ok"),
+        timing=times(1),
+        file_path="test.json",
+    )
+    request_logger.close()
+
+    assert (
+        stream.getvalue()
+        == "Mocking: GET http://mock-server:1080/test/1, from: (test.json), response: ok\n"
+    )
@@ -0,0 +1,88 @@
+import json
+from typing import Any, Dict, List, Optional
+
+from mockserver_client.match_request_result import MatchRequestResult
+from mockserver_client.mock_expectation import MockExpectation
+from mockserver_client.mock_request import MockRequest
+from mockserver_client.mockserver_client import (
+    MockServerFriendlyClient,
+    json_equals,
+    mock_request,
+    times,
+)
+
+
+def match(
+    *, verification_workers: Optional[int], ignore_timestamp_field: bool
+) -> MatchRequestResult:
+    test_name = "test_parallel_verification"
+    # no calls are made to the mock server when matching
+    mock_client = MockServerFriendlyClient(
+        base_url="http://mock-server:1080",
+        ignore_timestamp_field=ignore_timestamp_field,
+        verification_workers=verification_workers,
+        verification_chunk_size=4,
+    )
+
+    def observation(i: int, value: int) -> Dict[str, Any]:
+        return {
+            "resourceType": "Observation",
+            "id": str(i),
+            "timestamp": f"2023-11-28T00:20:{value:02}+00:00",
+            "valueQuantity": {"value": value, "unit": "mg"},
+        }
+
+    count = 30
+    for i in range(count):
+        mock_client.expectations.append(
+            MockExpectation(
+                request=mock_request(
+                    method="POST",
+                    path=f"/{test_name}/Observation/$merge",
+                    body=json_equals([observation(i, 1)]),
+                ),
+                response={},
+                timing=times(1),
+                index=i,
+                file_path=f"{i}.json",
+            )
+        )
+    # every third request has a different value
+    recorded_requests: List[MockRequest] = [
+        MockRequest(
+            request={
+                "method": "POST",
+                "path": f"/{test_name}/Observation/$merge",
+                "body": {
+                    "type": "JSON",
+                    "json": json.dumps([observation(i, 2 if i % 3 == 0 else 1)]),
+                },
+            },
+            index=index,
+            file_path=None,
+        )
+        for index, i in enumerate(reversed(range(count)))
+    ]
+    return mock_client.match_to_recorded_requests(recorded_requests=recorded_requests)
+
+
+def test_parallel_verification_matches_serial() -> None:
+    for ignore_timestamp_field in [False, True]:
+        serial_result = match(
+            verification_workers=None, ignore_timestamp_field=ignore_timestamp_field
+        )
+        parallel_result = match(
+            verification_workers=2, ignore_timestamp_field=ignore_timestamp_field
+        )
+
+        assert len(serial_result.exceptions) > 0
+        assert [
+            (type(e), str(e), getattr(e, "differences", None))
+            for e in parallel_result.exceptions
+        ] == [
+            (type(e), str(e), getattr(e, "differences", None))
+            for e in serial_result.exceptions
+        ]
+        assert [r.index for r in parallel_result.found_expectations] == [
+            r.index for r in serial_result.found_expectations
+        ]
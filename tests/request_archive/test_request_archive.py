@@ -0,0 +1,102 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+import requests
+
+from mockserver_client.local_mock_server import LocalMockServer
+from mockserver_client.mock_request_response import MockRequestResponse
+from mockserver_client.mock_requests_loader import (
+    load_mock_source_api_json_responses,
+)
+from mockserver_client.mockserver_client import MockServerFriendlyClient
+from mockserver_client.request_archive import (
+    RequestLogFormat,
+    is_request_archive,
+    read_request_archive,
+)
+
+
+def get_request_responses() -> List[MockRequestResponse]:
+    return [
+        MockRequestResponse(
+            request={
+                "method": "POST",
+                "path": f"/test_request_archive/Patient/{i}/$merge",
+                "body": {"type": "JSON", "json": [{"id": str(i)}]},
+            },
+            response={"statusCode": 200, "body": json.dumps({"id": str(i)})},
+            index=i,
+        )
+        for i in range(3)
+    ]
+
+
+def test_write_all_requests_to_folder_as_files(tmp_path: Path) -> None:
+    mock_client = MockServerFriendlyClient(
+        base_url="http://mock-server:1080", log_all_requests_to_folder=tmp_path
+    )
+    mock_client.write_all_requests_to_folder(request_responses=get_request_responses())
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "0-+test_request_archive+patient+0+merge.json",
+        "1-+test_request_archive+patient+1+merge.json",
+        "2-+test_request_archive+patient+2+merge.json",
+    ]
+    content: str = tmp_path.joinpath(
+        "1-+test_request_archive+patient+1+merge.json"
+    ).read_text()
+    assert content == json.dumps(
+        {
+            "request_parameters": {
+                "method": "POST",
+                "path": "/test_request_archive/Patient/1/$merge",
+            },
+            "request_body": [{"id": "1"}],
+            "request_result": {"id": "1"},
+        },
+        indent=4,
+    )
+
+
+@pytest.mark.parametrize(
+    "log_all_requests_format", [RequestLogFormat.NDJSON, RequestLogFormat.NDJSON_GZIP]
+)
+def test_write_all_requests_to_archive_and_replay(
+    tmp_path: Path, log_all_requests_format: RequestLogFormat
+) -> None:
+    mock_client = MockServerFriendlyClient(
+        base_url="http://mock-server:1080",
+        log_all_requests_to_folder=tmp_path,
+        log_all_requests_format=log_all_requests_format,
+    )
+    mock_client.write_all_requests_to_folder(request_responses=get_request_responses())
+
+    archive_path: Path = tmp_path.joinpath(log_all_requests_format.archive_file_name)
+    assert [p.name for p in tmp_path.iterdir()] == [archive_path.name]
+    assert is_request_archive(archive_path)
+    entries: List[Any] = list(read_request_archive(archive_path))
+    assert [file_name for file_name, _ in entries] == [
+        "0-+test_request_archive+patient+0+merge.json",
+        "1-+test_request_archive+patient+1+merge.json",
+        "2-+test_request_archive+patient+2+merge.json",
+    ]
+
+    with (
+        LocalMockServer() as local_mock_server,
+        MockServerFriendlyClient(base_url=local_mock_server.base_url) as replay_client,
+    ):
+        files: List[str] = load_mock_source_api_json_responses(
+            folder=archive_path, mock_client=replay_client, url_prefix=None
+        )
+        assert files == [
+            str(archive_path.joinpath(file_name)) for file_name, _ in entries
+        ]
+        response = requests.post(
+            f"{replay_client.base_url}/test_request_archive/Patient/2/$merge",
+            json=[{"id": "2"}],
+        )
+        assert response.status_code == 200
+        result: Dict[str, Any] = response.json()
+        assert result == {"id": "2"}
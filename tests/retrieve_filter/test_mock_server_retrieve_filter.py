@@ -0,0 +1,125 @@
+import json
+import re
+from typing import Any, List, Optional, cast
+
+import pytest
+from requests import Response
+
+from mockserver_client.exceptions.mock_server_request_not_found_exception import (
+    MockServerRequestNotFoundException,
+)
+from mockserver_client.mockserver_client import MockServerFriendlyClient
+from mockserver_client.mockserver_transport import MockServerTransport
+from mockserver_client.mockserver_verify_exception import MockServerVerifyException
+from mockserver_client.path_match_strategy import PathMatchStrategy
+
+
+class RecordingTransport(MockServerTransport):
+    """
+    Returns the recorded requests that match the path regex sent to /retrieve, like the MockServer does
+    """
+
+    def __init__(self, *, recorded_requests: List[Any]) -> None:
+        super().__init__()
+        self.recorded_requests: List[Any] = recorded_requests
+        self.bodies: List[Any] = []
+
+    def put(
+        self,
+        url: str,
+        *,
+        data: Any = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        request_filter = json.loads(data) if data else {}
+        self.bodies.append(request_filter)
+        matching = [
+            r
+            for r in self.recorded_requests
+            if re.fullmatch(request_filter.get("path", ".*"), r["path"])
+            and request_filter.get("method", r["method"]) == r["method"]
+        ]
+        response = Response()
+        response.status_code = 200
+        response._content = json.dumps(
+            [{"httpRequest": r, "httpResponse": {"statusCode": 200}} for r in matching]
+        ).encode("utf-8")
+        return response
+
+
+def test_path_match_strategy() -> None:
+    assert PathMatchStrategy.SUBSTRING.matches(path="/a/my_test/1", test_name="my_test")
+    assert not PathMatchStrategy.PREFIX.matches(
+        path="/a/my_test/1", test_name="my_test"
+    )
+    assert PathMatchStrategy.PREFIX.matches(path="/my_test/1", test_name="my_test")
+    assert PathMatchStrategy.PREFIX.matches(path="/my_test/1", test_name="/my_test")
+    assert PathMatchStrategy.REGEX.matches(path="/my_test/12", test_name=r"/\d+$")
+    assert not PathMatchStrategy.REGEX.matches(path="/my_test/a", test_name=r"/\d+$")
+    assert not PathMatchStrategy.SUBSTRING.matches(path=None, test_name="my_test")
+
+    # the regular expression sent to the MockServer selects the same paths
+    paths = ["/my_test/1", "/a/my_test/1", "/my.test/1", "/myxtest/1", "/other/12"]
+    for strategy, test_name in [
+        (PathMatchStrategy.SUBSTRING, "my.test"),
+        (PathMatchStrategy.PREFIX, "my_test"),
+        (PathMatchStrategy.REGEX, r"/\d+"),
+    ]:
+        path_regex = strategy.to_path_regex(test_name=test_name)
+        assert [p for p in paths if re.fullmatch(path_regex, p)] == [
+            p for p in paths if strategy.matches(path=p, test_name=test_name)
+        ]
+
+
+def test_mock_server_retrieve_filter() -> None:
+    test_name = "test_mock_server_retrieve_filter"
+
+    transport = RecordingTransport(
+        recorded_requests=[
+            {"method": "GET", "path": f"/{test_name}/1"},
+            {"method": "POST", "path": f"/{test_name}/2"},
+            {"method": "GET", "path": "/other_test/1"},
+        ]
+    )
+    mock_client: MockServerFriendlyClient = MockServerFriendlyClient(
+        base_url="http://mock-server:1080",
+        transport=transport,
+        path_match_strategy=PathMatchStrategy.PREFIX,
+        filter_retrieved_requests_on_server=True,
+    )
+
+    # no expectations so the only request for the test with this method is unexpected
+    with pytest.raises(MockServerVerifyException) as e:
+        mock_client.verify_expectations(test_name=test_name, method="GET")
+    assert [
+        cast(MockServerRequestNotFoundException, exception).request.path
+        for exception in e.value.exceptions
+    ] == [f"/{test_name}/1"]
+
+    # only the requests for the test are retrieved
+    assert transport.bodies == [{"path": f"/{test_name}.*", "method": "GET"}]
+
+    # the filter can be turned off
+    mock_client.filter_retrieved_requests_on_server = False
+    transport.bodies.clear()
+    mock_client.verify_expectations(test_name="no_such_test")
+    assert transport.bodies == [{}]
+
+    # all the requests are retrieved when they are written to a folder
+    assert (
+        MockServerFriendlyClient(
+            base_url="http://mock-server:1080",
+            transport=transport,
+            filter_retrieved_requests_on_server=True,
+            log_all_requests_to_folder="requests",
+        ).get_retrieve_request_filter(test_name=test_name)
+        is None
+    )
+    # and by default
+    assert (
+        MockServerFriendlyClient(
+            base_url="http://mock-server:1080", transport=transport
+        ).get_retrieve_request_filter(test_name=test_name)
+        is None
+    )
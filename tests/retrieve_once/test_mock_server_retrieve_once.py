@@ -0,0 +1,113 @@
+import json
+from typing import Any, List, Optional
+
+import requests
+from requests import Response
+
+from mockserver_client.mockserver_client import (
+    MockServerFriendlyClient,
+    mock_request,
+    mock_response,
+    times,
+)
+from mockserver_client.mockserver_transport import MockServerTransport
+
+
+class CountingTransport(MockServerTransport):
+    def __init__(self) -> None:
+        super().__init__()
+        self.urls: List[str] = []
+
+    def put(
+        self,
+        url: str,
+        *,
+        data: Any = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        self.urls.append(url)
+        return super().put(url, data=data, timeout=timeout, stream=stream)
+
+
+class OldServerTransport(MockServerTransport):
+    """
+    Simulates a mock server that does not support retrieving request/responses
+    """
+
+    def __init__(self, *, recorded_requests: List[Any]) -> None:
+        super().__init__()
+        self.recorded_requests: List[Any] = recorded_requests
+        self.urls: List[str] = []
+
+    def put(
+        self,
+        url: str,
+        *,
+        data: Any = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        self.urls.append(url)
+        response = Response()
+        if "type=request_responses" in url:
+            response.status_code = 400
+            response._content = b"incorrect type parameter"
+        else:
+            response.status_code = 200
+            response._content = json.dumps(self.recorded_requests).encode("utf-8")
+        return response
+
+
+def test_mock_server_retrieve_once() -> None:
+    test_name = "test_mock_server_retrieve_once"
+
+    mock_server_url = "http://mock-server:1080"
+    transport = CountingTransport()
+    mock_client: MockServerFriendlyClient = MockServerFriendlyClient(
+        base_url=mock_server_url, transport=transport
+    )
+
+    mock_client.clear(f"/{test_name}/*.*")
+    mock_client.reset()
+    for i in range(3):
+        mock_client.expect(
+            request=mock_request(path=f"/{test_name}/{i}", method="GET"),
+            response=mock_response(body=json.dumps({"id": i})),
+            timing=times(1),
+            file_path=None,
+        )
+
+    http = requests.Session()
+    for i in range(3):
+        http.get(f"{mock_server_url}/{test_name}/{i}")
+
+    transport.urls.clear()
+    mock_client.verify_expectations(test_name=test_name)
+
+    # the requests are taken from the request/responses so /retrieve is only called once
+    assert transport.urls == [
+        f"{mock_server_url}/retrieve?type=request_responses",
+    ]
+
+
+def test_mock_server_retrieve_once_falls_back_to_requests() -> None:
+    test_name = "test_mock_server_retrieve_once_falls_back_to_requests"
+
+    transport = OldServerTransport(
+        recorded_requests=[{"method": "GET", "path": f"/{test_name}/1"}]
+    )
+    mock_client: MockServerFriendlyClient = MockServerFriendlyClient(
+        base_url="http://mock-server:1080", transport=transport
+    )
+
+    recorded_requests, recorded_request_responses = (
+        mock_client.retrieve_requests_and_request_responses()
+    )
+
+    assert [r.path for r in recorded_requests] == [f"/{test_name}/1"]
+    assert recorded_request_responses == []
+    assert transport.urls == [
+        "http://mock-server:1080/retrieve?type=request_responses",
+        "http://mock-server:1080/retrieve",
+    ]
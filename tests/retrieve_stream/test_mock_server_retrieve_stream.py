@@ -0,0 +1,85 @@
+import json
+from typing import Any, List
+
+import pytest
+import requests
+
+from mockserver_client.json_stream import iter_json_array
+from mockserver_client.mock_request import MockRequest
+from mockserver_client.mock_request_response import MockRequestResponse
+from mockserver_client.mockserver_client import (
+    MockServerFriendlyClient,
+    mock_request,
+    mock_response,
+    times,
+)
+
+
+def test_mock_server_retrieve_stream() -> None:
+    test_name = "test_mock_server_retrieve_stream"
+
+    mock_server_url = "http://mock-server:1080"
+    mock_client: MockServerFriendlyClient = MockServerFriendlyClient(
+        base_url=mock_server_url
+    )
+
+    mock_client.clear(f"/{test_name}/*.*")
+    mock_client.reset()
+    for i in range(5):
+        mock_client.expect(
+            request=mock_request(
+                path=f"/{test_name}/{i}",
+                method="POST",
+                body={"json": {"id": str(i), "name": "é" * i}},
+            ),
+            response=mock_response(body=json.dumps({"id": i})),
+            timing=times(1),
+            file_path=None,
+        )
+
+    http = requests.Session()
+    for i in range(5):
+        http.post(
+            f"{mock_server_url}/{test_name}/{i}", json={"id": str(i), "name": "é" * i}
+        )
+
+    # use a tiny chunk size so items and characters are split across chunks
+    streamed_requests: List[MockRequest] = list(
+        mock_client.iter_retrieved_requests(chunk_size=7)
+    )
+    assert [r.request for r in streamed_requests] == [
+        r.request for r in mock_client.retrieve_requests()
+    ]
+    assert [r.json_list for r in streamed_requests] == [
+        [{"id": str(i), "name": "é" * i}] for i in range(5)
+    ]
+
+    streamed_request_responses: List[MockRequestResponse] = list(
+        mock_client.iter_retrieved_request_responses(chunk_size=7)
+    )
+    assert [
+        r.request.path if r.request else None for r in streamed_request_responses
+    ] == [f"/{test_name}/{i}" for i in range(5)]
+
+
+def test_iter_json_array() -> None:
+    items: List[Any] = [
+        {"path": "/a", "body": {"json": [1, 2.5, -3e2]}},
+        'é ✓ ] " ,',
+        12345,
+        True,
+        None,
+        [],
+    ]
+    text: bytes = json.dumps(items, ensure_ascii=False, indent=2).encode("utf-8")
+    for chunk_size in [1, 2, 3, 7, 64, len(text)]:
+        chunks: List[bytes] = [
+            text[i : i + chunk_size] for i in range(0, len(text), chunk_size)
+        ]
+        assert list(iter_json_array(chunks)) == items
+
+    assert list(iter_json_array([b"[]"])) == []
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'[{"a": 1}, {"b"']))
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"a": 1}']))
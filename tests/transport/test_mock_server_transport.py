@@ -0,0 +1,110 @@
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+import requests
+
+from mockserver_client.mockserver_client import (
+    MockServerFriendlyClient,
+    mock_request,
+    mock_response,
+    times,
+)
+from mockserver_client.mockserver_transport import MockServerTransport
+from mockserver_client.mockserver_verify_exception import MockServerVerifyException
+
+
+def test_mock_server_pooled_transport() -> None:
+    test_name = "test_mock_server_pooled_transport"
+
+    mock_server_url = "http://mock-server:1080"
+    with MockServerFriendlyClient(
+        base_url=mock_server_url, pool_size=2, retries=1, timeout=30
+    ) as mock_client:
+        mock_client.clear(f"/{test_name}/*.*")
+
+        for i in range(5):
+            mock_client.expect(
+                request=mock_request(path=f"/{test_name}/{i}", method="GET"),
+                response=mock_response(body=json.dumps({"id": i})),
+                timing=times(1),
+                file_path=None,
+            )
+
+        http = requests.Session()
+        for i in range(5):
+            response = http.get(f"{mock_server_url}/{test_name}/{i}")
+            assert response.json() == {"id": i}
+
+        try:
+            mock_client.verify_expectations(test_name=test_name)
+        except MockServerVerifyException as e:
+            print(str(e))
+            raise
+
+
+def test_mock_server_shared_transport_is_not_closed_by_client() -> None:
+    test_name = "test_mock_server_shared_transport"
+
+    mock_server_url = "http://mock-server:1080"
+    with MockServerTransport(pool_size=2) as transport:
+        with MockServerFriendlyClient(
+            base_url=mock_server_url, transport=transport
+        ) as mock_client:
+            mock_client.clear(f"/{test_name}/*.*")
+
+        # the transport is still usable after the client that borrowed it is closed
+        mock_client2 = MockServerFriendlyClient(
+            base_url=mock_server_url, transport=transport
+        )
+        mock_client2.clear(f"/{test_name}/*.*")
+        assert mock_client2.transport is transport
+
+
+@pytest.fixture
+def unavailable_server() -> Iterator[tuple[str, Counter[str]]]:
+    calls: Counter[str] = Counter()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_PUT(self) -> None:
+            calls[self.path.split("?")[0]] += 1
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", calls
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_mock_server_transport_only_retries_idempotent_commands(
+    unavailable_server: tuple[str, Counter[str]],
+) -> None:
+    url, calls = unavailable_server
+    with MockServerTransport(retries=2, backoff_factor=0) as transport:
+        assert (
+            transport.put(f"{url}/mockserver/expectation", data="{}").status_code == 503
+        )
+        assert (
+            transport.put(f"{url}/mockserver/retrieve?type=REQUESTS").status_code == 503
+        )
+        assert transport.put(f"{url}/mockserver/reset").status_code == 503
+
+    # a 503 for /expectation could come after the expectation was registered so it is not retried
+    assert calls == {
+        "/mockserver/expectation": 1,
+        "/mockserver/retrieve": 3,
+        "/mockserver/reset": 3,
+    }
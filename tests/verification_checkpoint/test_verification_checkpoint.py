@@ -0,0 +1,151 @@
+import json
+from typing import Any, Dict, Iterator, List
+
+import pytest
+import requests
+
+from mockserver_client.exceptions.mock_server_expectation_not_found_exception import (
+    MockServerExpectationNotFoundException,
+)
+from mockserver_client.exceptions.mock_server_request_not_found_exception import (
+    MockServerRequestNotFoundException,
+)
+from mockserver_client.instrumentation import MATCH, ClientInstrumentation
+from mockserver_client.local_mock_server import LocalMockServer
+from mockserver_client.mockserver_client import (
+    MockServerFriendlyClient,
+    mock_request,
+    mock_response,
+    times,
+)
+from mockserver_client.mockserver_verify_exception import MockServerVerifyException
+from mockserver_client.verification_checkpoint import VerificationCheckpoint
+
+TEST_NAME = "test_verification_checkpoint"
+
+
+@pytest.fixture(scope="module")
+def local_mock_server() -> Iterator[LocalMockServer]:
+    with LocalMockServer() as mock_server:
+        yield mock_server
+
+
+def expect_patients(mock_client: MockServerFriendlyClient, count: int) -> None:
+    mock_client.reset()
+    for i in range(count):
+        mock_client.expect(
+            request=mock_request(
+                path=f"/{TEST_NAME}/Patient/{i}",
+                method="POST",
+                body={"json": {"resourceType": "Patient", "id": str(i)}},
+            ),
+            response=mock_response(body=json.dumps({"updated": True})),
+            timing=times(1),
+            file_path=f"{i}.json",
+        )
+
+
+def post_patient(mock_client: MockServerFriendlyClient, i: int) -> None:
+    requests.post(
+        f"{mock_client.base_url}/{TEST_NAME}/Patient/{i}",
+        json={"resourceType": "Patient", "id": str(i)},
+    )
+
+
+def test_verify_expectations_since_checkpoint(
+    local_mock_server: LocalMockServer,
+) -> None:
+    matches: List[Dict[str, Any]] = []
+    with MockServerFriendlyClient(
+        base_url=local_mock_server.base_url,
+        instrumentation=ClientInstrumentation(
+            enabled=True,
+            hooks=[
+                lambda name, seconds, attributes: (
+                    matches.append(attributes) if name == MATCH else None
+                )
+            ],
+        ),
+    ) as mock_client:
+        expect_patients(mock_client, 3)
+        checkpoint = VerificationCheckpoint(test_name=TEST_NAME)
+
+        post_patient(mock_client, 0)
+        # expectations that have not been matched yet are not missing
+        mock_client.verify_expectations_since_checkpoint(checkpoint=checkpoint)
+        assert checkpoint.request_count == 1
+        assert checkpoint.matched_expectation_indexes == {0}
+
+        post_patient(mock_client, 1)
+        post_patient(mock_client, 2)
+        mock_client.verify_expectations_since_checkpoint(
+            checkpoint=checkpoint, verify_all_expectations=True
+        )
+        assert checkpoint.request_count == 3
+        assert checkpoint.matched_expectation_indexes == {0, 1, 2}
+        assert len(checkpoint.found_expectations) == 3
+        assert checkpoint.verification_count == 2
+
+        # only the new requests are matched against the expectations not matched yet
+        assert [(m["expectations"], m["recorded_requests"]) for m in matches] == [
+            (3, 1),
+            (2, 2),
+        ]
+
+        # nothing new
+        mock_client.verify_expectations_since_checkpoint(
+            checkpoint=checkpoint, verify_all_expectations=True
+        )
+        assert matches[-1]["recorded_requests"] == 0
+
+
+def test_verify_expectations_since_checkpoint_reports_each_problem_once(
+    local_mock_server: LocalMockServer,
+) -> None:
+    with MockServerFriendlyClient(base_url=local_mock_server.base_url) as mock_client:
+        expect_patients(mock_client, 2)
+        checkpoint = VerificationCheckpoint(test_name=TEST_NAME)
+
+        post_patient(mock_client, 0)
+        requests.get(f"{mock_client.base_url}/{TEST_NAME}/unexpected")
+        with pytest.raises(MockServerVerifyException) as e:
+            mock_client.verify_expectations_since_checkpoint(checkpoint=checkpoint)
+        assert len(e.value.exceptions) == 1
+        request_not_found = e.value.exceptions[0]
+        assert isinstance(request_not_found, MockServerRequestNotFoundException)
+        assert request_not_found.url == f"/{TEST_NAME}/unexpected"
+
+        # the unexpected request was already reported
+        mock_client.verify_expectations_since_checkpoint(checkpoint=checkpoint)
+
+        with pytest.raises(MockServerVerifyException) as e:
+            mock_client.verify_expectations_since_checkpoint(
+                checkpoint=checkpoint, verify_all_expectations=True
+            )
+        assert len(e.value.exceptions) == 1
+        expectation_not_found = e.value.exceptions[0]
+        assert isinstance(expectation_not_found, MockServerExpectationNotFoundException)
+        assert expectation_not_found.url == f"/{TEST_NAME}/Patient/1"
+
+
+def test_verify_expectations_since_checkpoint_after_clear(
+    local_mock_server: LocalMockServer,
+) -> None:
+    with MockServerFriendlyClient(base_url=local_mock_server.base_url) as mock_client:
+        expect_patients(mock_client, 2)
+        checkpoint = VerificationCheckpoint(test_name=TEST_NAME)
+        post_patient(mock_client, 0)
+        post_patient(mock_client, 1)
+        mock_client.verify_expectations_since_checkpoint(checkpoint=checkpoint)
+        assert checkpoint.request_count == 2
+
+        # fewer requests than already verified so the log was cleared and they are all new
+        local_mock_server.clear(
+            request_matcher={"path": f"/{TEST_NAME}/Patient/1"}, clear_type="log"
+        )
+        with pytest.raises(MockServerVerifyException) as e:
+            mock_client.verify_expectations_since_checkpoint(checkpoint=checkpoint)
+        assert [type(exception) for exception in e.value.exceptions] == [
+            MockServerRequestNotFoundException
+        ]
+        assert checkpoint.request_count == 1
@@ -0,0 +1,138 @@
+import json
+from typing import Iterator, List
+
+import pytest
+import requests
+
+from mockserver_client.exceptions.mock_server_expectation_not_found_exception import (
+    MockServerExpectationNotFoundException,
+)
+from mockserver_client.exceptions.mock_server_json_content_mismatch_exception import (
+    MockServerJsonContentMismatchException,
+)
+from mockserver_client.exceptions.mock_server_request_not_found_exception import (
+    MockServerRequestNotFoundException,
+)
+from mockserver_client.local_mock_server import LocalMockServer
+from mockserver_client.mockserver_client import (
+    MockServerFriendlyClient,
+    mock_request,
+    mock_response,
+    times,
+)
+from mockserver_client.mockserver_verify_exception import MockServerVerifyException
+from mockserver_client.verification_watcher import VerificationWatcher
+
+TEST_NAME = "test_verification_watcher"
+
+
+@pytest.fixture(scope="module")
+def local_mock_server() -> Iterator[LocalMockServer]:
+    with LocalMockServer() as mock_server:
+        yield mock_server
+
+
+@pytest.fixture
+def mock_client(
+    local_mock_server: LocalMockServer,
+) -> Iterator[MockServerFriendlyClient]:
+    with MockServerFriendlyClient(base_url=local_mock_server.base_url) as client:
+        client.reset()
+        for i in range(2):
+            client.expect(
+                request=mock_request(
+                    path=f"/{TEST_NAME}/Patient/{i}",
+                    method="POST",
+                    body={"json": {"resourceType": "Patient", "id": str(i)}},
+                ),
+                response=mock_response(body=json.dumps({"updated": True})),
+                timing=times(1),
+                file_path=f"{i}.json",
+            )
+        yield client
+
+
+def post_patient(
+    mock_client: MockServerFriendlyClient, i: int, name: str | None = None
+) -> None:
+    requests.post(
+        f"{mock_client.base_url}/{TEST_NAME}/Patient/{i}",
+        json={
+            "resourceType": "Patient",
+            "id": str(i),
+            **({"name": name} if name else {}),
+        },
+    )
+
+
+def test_verification_watcher_passes(mock_client: MockServerFriendlyClient) -> None:
+    with VerificationWatcher(
+        mock_client=mock_client, test_name=TEST_NAME, interval=0.01
+    ) as watcher:
+        post_patient(mock_client, 0)
+        post_patient(mock_client, 1)
+
+    assert not watcher.failed.is_set()
+    assert len(watcher.found_expectations) == 2
+
+
+def test_verification_watcher_fails_fast(mock_client: MockServerFriendlyClient) -> None:
+    mismatches: List[MockServerVerifyException] = []
+    watcher = VerificationWatcher(
+        mock_client=mock_client,
+        test_name=TEST_NAME,
+        interval=0.01,
+        on_mismatch=mismatches.append,
+    ).start()
+
+    post_patient(mock_client, 0, name="changed")
+    requests.get(f"{mock_client.base_url}/{TEST_NAME}/unexpected")
+    # the mismatch is found while the test is still running
+    assert watcher.failed.wait(timeout=10)
+    with pytest.raises(MockServerVerifyException):
+        watcher.raise_if_failed()
+    assert len(mismatches) == 1
+    verification_count: int = watcher.checkpoint.verification_count
+
+    with pytest.raises(MockServerVerifyException) as e:
+        watcher.stop()
+    assert MockServerJsonContentMismatchException in {
+        type(exception) for exception in e.value.exceptions
+    }
+    # the watcher stopped at the first failed check
+    assert watcher.checkpoint.verification_count == verification_count
+
+
+def test_verification_watcher_reports_missing_expectations_on_stop(
+    mock_client: MockServerFriendlyClient,
+) -> None:
+    watcher = VerificationWatcher(
+        mock_client=mock_client, test_name=TEST_NAME, interval=0.01
+    ).start()
+    post_patient(mock_client, 0)
+
+    with pytest.raises(MockServerVerifyException) as e:
+        watcher.stop()
+    assert [type(exception) for exception in e.value.exceptions] == [
+        MockServerExpectationNotFoundException
+    ]
+
+
+def test_verification_watcher_keeps_checking_after_mismatch(
+    mock_client: MockServerFriendlyClient,
+) -> None:
+    watcher = VerificationWatcher(
+        mock_client=mock_client, test_name=TEST_NAME, stop_on_mismatch=False
+    )
+    requests.get(f"{mock_client.base_url}/{TEST_NAME}/unexpected")
+    assert not watcher.check()
+    post_patient(mock_client, 0)
+    post_patient(mock_client, 1)
+    assert watcher.check()
+
+    with pytest.raises(MockServerVerifyException) as e:
+        watcher.stop()
+    assert [type(exception) for exception in e.value.exceptions] == [
+        MockServerRequestNotFoundException
+    ]
+    assert len(watcher.found_expectations) == 2
@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from mockserver_client.exceptions.mock_server_json_content_mismatch_exception import (
+    MockServerJsonContentMismatchException,
+)
+from mockserver_client.fixture_cache import FixtureCache
+from mockserver_client.mock_request import MockRequest
+from mockserver_client.mockserver_verify_exception import (
+    MockServerVerifyException,
+    get_resource_files,
+)
+
+
+def get_mismatch_exception(
+    actual: Dict[str, Any], expected_file_path: Path
+) -> MockServerJsonContentMismatchException:
+    return MockServerJsonContentMismatchException(
+        request=MockRequest(
+            request={"method": "POST", "path": "/test/1", "body": actual},
+            index=0,
+            file_path=None,
+        ),
+        actual_json=[actual],
+        expected_json=[{**actual, "name": "expected"}],
+        differences=["name"],
+        expected_file_path=expected_file_path,
+    )
+
+
+def test_get_resource_files(tmp_path: Path) -> None:
+    files: List[str] = []
+    for name, content in [
+        ("patient.json", {"resourceType": "Patient", "id": "1"}),
+        (
+            "bundle.json",
+            [
+                {"resourceType": "Patient", "id": "2"},
+                {"resourceType": "Practitioner", "id": "1"},
+            ],
+        ),
+        ("not_a_resource.json", {"foo": "bar"}),
+        ("patient_again.json", {"resourceType": "Patient", "id": "2"}),
+    ]:
+        file_path = tmp_path.joinpath(name)
+        file_path.write_text(json.dumps(content))
+        files.append(str(file_path))
+    invalid_file = tmp_path.joinpath("invalid.json")
+    invalid_file.write_text("{")
+    files.append(str(invalid_file))
+    files.append(str(tmp_path.joinpath("missing.json")))
+
+    assert get_resource_files(files, fixture_cache=FixtureCache()) == {
+        ("Patient", "1"): str(tmp_path.joinpath("patient.json")),
+        # the last file wins
+        ("Patient", "2"): str(tmp_path.joinpath("patient_again.json")),
+        ("Practitioner", "1"): str(tmp_path.joinpath("bundle.json")),
+    }
+
+
+def test_set_files_in_exceptions(tmp_path: Path) -> None:
+    files: List[str] = []
+    for i in range(3):
+        file_path = tmp_path.joinpath(f"{i}.json")
+        file_path.write_text(json.dumps({"resourceType": "Patient", "id": str(i)}))
+        files.append(str(file_path))
+    placeholder: Path = Path("placeholder.json")
+    exceptions: List[MockServerJsonContentMismatchException] = [
+        get_mismatch_exception({"resourceType": "Patient", "id": "2"}, placeholder),
+        get_mismatch_exception({"resourceType": "Patient", "id": "9"}, placeholder),
+        get_mismatch_exception({"id": "1"}, placeholder),
+    ]
+
+    verify_exception = MockServerVerifyException(
+        exceptions=list(exceptions), found_expectations=[], files=files
+    )
+
+    assert [e.expected_file_path for e in exceptions] == [
+        tmp_path.joinpath("2.json"),
+        placeholder,
+        placeholder,
+    ]
+    assert str(verify_exception).startswith(str(tmp_path.joinpath("2.json")))